@@ -0,0 +1,103 @@
+"""
+Achievement engine backed by user_achievements
+
+Rules are checked when something that can unlock them happens (a quiz is
+submitted, a schedule item is completed, a streak advances) rather than on every
+profile view. Only rules the user has not unlocked yet are evaluated, and each
+unlock is stored once with its timestamp, so the profile page reads a single
+primary-key range from user_achievements.
+"""
+from datetime import datetime
+import streaks
+
+EARLY_BIRD_HOUR = 8     # activity before 08:00 local time
+NIGHT_OWL_HOUR = 22     # activity from 22:00 local time
+MIN_ACCURACY_QUESTIONS = 20   # accuracy badges need this many answered questions
+
+# (id, name, description, rule); rules receive the facts dict built by evaluate()
+ACHIEVEMENTS = [
+    ('3day', '🔥 3-Day Streak', 'Study 3 days in a row', lambda f: f['streak'] >= 3),
+    ('7day', '⭐ Week Warrior', 'Study 7 days in a row', lambda f: f['streak'] >= 7),
+    ('30day', '🏆 Month Master', 'Study 30 days in a row', lambda f: f['streak'] >= 30),
+    ('quiz10', '📝 Quiz Novice', 'Complete 10 quizzes', lambda f: f['total_quizzes'] >= 10),
+    ('quiz50', '🎓 Quiz Expert', 'Complete 50 quizzes', lambda f: f['total_quizzes'] >= 50),
+    ('quiz100', '👑 Quiz Legend', 'Complete 100 quizzes', lambda f: f['total_quizzes'] >= 100),
+    ('accuracy70', '🎯 Good Aim', 'Achieve 70%+ accuracy',
+     lambda f: f['total_questions'] >= MIN_ACCURACY_QUESTIONS and f['accuracy'] >= 70),
+    ('accuracy80', '🎯 Sharp Shooter', 'Achieve 80%+ accuracy',
+     lambda f: f['total_questions'] >= MIN_ACCURACY_QUESTIONS and f['accuracy'] >= 80),
+    ('accuracy90', '🎯 Sniper', 'Achieve 90%+ accuracy',
+     lambda f: f['total_questions'] >= MIN_ACCURACY_QUESTIONS and f['accuracy'] >= 90),
+    ('perfect', '💯 Perfectionist', 'Score 100% on a quiz', lambda f: f['perfect']),
+    ('early_bird', '🌅 Early Bird', 'Study before 8 AM',
+     lambda f: f['hour'] is not None and f['hour'] < EARLY_BIRD_HOUR),
+    ('night_owl', '🦉 Night Owl', 'Study after 10 PM',
+     lambda f: f['hour'] is not None and f['hour'] >= NIGHT_OWL_HOUR),
+]
+
+
+def unlocked(conn, user_id):
+    """achievement_id -> unlocked_at for everything the user has earned"""
+    rows = conn.execute('SELECT achievement_id, unlocked_at FROM user_achievements WHERE user_id = ?',
+                        (user_id,)).fetchall()
+    return {row['achievement_id']: row['unlocked_at'] for row in rows}
+
+
+def profile_achievements(conn, user_id):
+    """Every achievement with its unlock state, in display order"""
+    earned = unlocked(conn, user_id)
+    return [{'id': achievement_id, 'name': name, 'desc': desc,
+             'unlocked': achievement_id in earned, 'unlocked_at': earned.get(achievement_id)}
+            for achievement_id, name, desc, _ in ACHIEVEMENTS]
+
+
+def stats_facts(conn, user_id):
+    row = conn.execute('''
+        SELECT streak, total_quizzes, correct_answers, total_questions
+        FROM user_stats WHERE user_id = ?
+    ''', (user_id,)).fetchone()
+    if not row:
+        return {'streak': 0, 'total_quizzes': 0, 'total_questions': 0, 'accuracy': 0}
+    total_questions = row['total_questions'] or 0
+    accuracy = round((row['correct_answers'] or 0) / total_questions * 100, 1) if total_questions > 0 else 0
+    return {'streak': row['streak'] or 0, 'total_quizzes': row['total_quizzes'] or 0,
+            'total_questions': total_questions, 'accuracy': accuracy}
+
+
+def evaluate(conn, user_id, at=None, perfect=False, **facts):
+    """Unlock every rule the user now satisfies; returns the new ones (caller commits).
+
+    `at` is when the triggering activity happened (local time) and drives the
+    hour-of-day rules; `perfect` is whether the triggering quiz scored 100%.
+    Any of streak / total_quizzes / total_questions / accuracy / hour passed in
+    override the stored stats and `at`.
+    """
+    earned = unlocked(conn, user_id)
+    pending = [achievement for achievement in ACHIEVEMENTS if achievement[0] not in earned]
+    if not pending:
+        return []
+
+    facts = {**stats_facts(conn, user_id), 'hour': at.hour if at else None, **facts}
+    facts['perfect'] = perfect
+
+    new = [achievement for achievement in pending if achievement[3](facts)]
+    if not new:
+        return []
+
+    unlocked_at = (at or datetime.now()).strftime('%Y-%m-%d %H:%M:%S')
+    conn.executemany('''
+        INSERT OR IGNORE INTO user_achievements (user_id, achievement_id, unlocked_at)
+        VALUES (?, ?, ?)
+    ''', [(user_id, achievement_id, unlocked_at) for achievement_id, _, _, _ in new])
+    return [{'id': achievement_id, 'name': name, 'desc': desc} for achievement_id, name, desc, _ in new]
+
+
+def on_streak_changed(conn, user_id, streak):
+    return evaluate(conn, user_id, streak=streak)
+
+
+def register():
+    """Evaluate the streak rules whenever a streak moves (create_app calls this)"""
+    if on_streak_changed not in streaks.on_streak_changed:
+        streaks.on_streak_changed.append(on_streak_changed)
+
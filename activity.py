@@ -0,0 +1,105 @@
+"""
+Per-day activity rollup (daily_activity)
+
+One row per (user, local date) with running totals of quizzes, questions,
+correct answers and study minutes. submit_quiz and api_complete_schedule add to
+the row for today inside their own transactions, so the profile calendar and
+the heatmap read a date range from the primary key instead of scanning
+study_history.
+
+Run `python activity.py [db_path]` to rebuild the table from study_history and
+completed schedules.
+"""
+import sys
+from datetime import date, timedelta
+import database
+import migrations
+
+HEATMAP_DAYS = 365
+CALENDAR_DAYS = 30
+
+# study_history.score is stored as 'correct/total'
+SCORE_CORRECT = "CAST(substr(score, 1, instr(score, '/') - 1) AS INTEGER)"
+SCORE_TOTAL = "CAST(substr(score, instr(score, '/') + 1) AS INTEGER)"
+
+
+def record_activity(conn, user_id, day=None, quizzes=0, questions=0, correct=0, minutes=0):
+    """Add to a user's totals for one day (caller commits)"""
+    day = (day or date.today()).isoformat()
+    conn.execute('''
+        INSERT INTO daily_activity (user_id, day, quizzes, questions, correct, minutes)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(user_id, day) DO UPDATE SET
+            quizzes = quizzes + excluded.quizzes,
+            questions = questions + excluded.questions,
+            correct = correct + excluded.correct,
+            minutes = minutes + excluded.minutes
+    ''', (user_id, day, quizzes, questions, correct, minutes))
+
+
+def activity_range(conn, user_id, start, end):
+    """Rows for start..end inclusive, keyed by ISO date"""
+    rows = conn.execute('''
+        SELECT day, quizzes, questions, correct, minutes FROM daily_activity
+        WHERE user_id = ? AND day BETWEEN ? AND ?
+    ''', (user_id, start.isoformat(), end.isoformat())).fetchall()
+    return {row['day']: dict(row) for row in rows}
+
+
+def activity_days(conn, user_id, days, today=None):
+    """One entry per day for the last `days` days, oldest first, gaps filled with zeros"""
+    today = today or date.today()
+    start = today - timedelta(days=days - 1)
+    found = activity_range(conn, user_id, start, today)
+
+    result = []
+    for offset in range(days):
+        day = (start + timedelta(days=offset)).isoformat()
+        row = found.get(day) or {'day': day, 'quizzes': 0, 'questions': 0, 'correct': 0, 'minutes': 0}
+        result.append({
+            'date': day,
+            'quizzes': row['quizzes'],
+            'questions': row['questions'],
+            'correct': row['correct'],
+            'minutes': row['minutes'],
+            'has_activity': day in found
+        })
+    return result
+
+
+def rebuild(conn):
+    """Recompute every row from study_history and completed schedules (caller commits)"""
+    conn.execute('DELETE FROM daily_activity')
+    conn.execute(f'''
+        INSERT INTO daily_activity (user_id, day, quizzes, questions, correct, minutes)
+        SELECT user_id, day, SUM(quizzes), SUM(questions), SUM(correct), SUM(minutes)
+        FROM (
+            SELECT user_id,
+                   date(timestamp, 'localtime') AS day,
+                   1 AS quizzes,
+                   CASE WHEN instr(score, '/') > 0 THEN {SCORE_TOTAL} ELSE 0 END AS questions,
+                   CASE WHEN instr(score, '/') > 0 THEN {SCORE_CORRECT} ELSE 0 END AS correct,
+                   COALESCE(study_duration, 0) AS minutes
+            FROM study_history
+            WHERE user_id IS NOT NULL AND timestamp IS NOT NULL
+            UNION ALL
+            SELECT user_id, date(completed_at), 0, 0, 0, COALESCE(estimated_hours, 0) * 60
+            FROM schedules
+            WHERE status = 'completed' AND user_id IS NOT NULL AND completed_at IS NOT NULL
+        )
+        WHERE day IS NOT NULL
+        GROUP BY user_id, day
+    ''')
+    return conn.execute('SELECT COUNT(*) FROM daily_activity').fetchone()[0]
+
+
+if __name__ == '__main__':
+    db_path = sys.argv[1] if len(sys.argv) > 1 else database.DATABASE
+    conn = database.connect(db_path)
+    migrations.migrate(conn)
+
+    print(f"📅 Rebuilding daily_activity in {db_path}...")
+    with conn:
+        rows = rebuild(conn)
+    print(f"✅ {rows} user-days written")
+    conn.close()
@@ -1,143 +1,134 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for, Response
-import numpy as np
-import joblib
-import requests
-from bs4 import BeautifulSoup
-import wikipediaapi
-import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
+from flask import Flask, Blueprint, current_app, render_template, request, jsonify, session, redirect, url_for, Response, g, has_app_context, stream_with_context
 import re
 import os
 from werkzeug.utils import secure_filename
 from werkzeug.security import generate_password_hash, check_password_hash
-import PyPDF2
-from pptx import Presentation
 import random
 from datetime import datetime, timedelta
-import json
-import sqlite3
 from functools import wraps
+import threading
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import hashlib
+import database
+import migrations
+import maintenance
+import backup
+import download_nltk_data
+import http_session
+import quiz_sessions
+import streaks
+import schedule_store
+import schedule_export
+import activity
+import achievements
+import codec
+import content_cache
+import quiz_answers
+import rate_limit
+import source_health
+import wiki_titles
+import offline_corpus
+import comparison
 
 # ==========================================
 # FLASK APP INITIALIZATION
 # ==========================================
-app = Flask(__name__)
-app.secret_key = 'change-this-to-a-random-secret-key-in-production'
+# Routes, the database teardown and CLI commands live on this blueprint;
+# build_app() and create_app() attach it to a new Flask instance
+bp = Blueprint('studypal', __name__, cli_group=None)
 
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf', 'ppt', 'pptx', 'txt'}
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-os.makedirs('models', exist_ok=True)
+def build_app(config=None):
+    """A new Flask app with StudyPal's routes and default config; no side effects"""
+    app = Flask(__name__)
+    app.secret_key = 'change-this-to-a-random-secret-key-in-production'
+    app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+    app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
+    app.config['DATABASE'] = database.DATABASE
+    app.config['MAINTENANCE_ENABLED'] = os.environ.get('STUDYPAL_MAINTENANCE', '1') == '1'
+    app.config['BACKUP_INTERVAL'] = int(os.environ.get('STUDYPAL_BACKUP_INTERVAL', '0'))  # seconds; 0 = off
+    app.config['BACKUP_DIR'] = backup.BACKUP_DIR
+    app.config['OFFLINE_CORPUS_DIR'] = offline_corpus.CORPUS_DIR   # built with offline_corpus.py; optional
+    if config:
+        app.config.update(config)
+    app.register_blueprint(bp)
+    app.teardown_appcontext(release_db_connection)
+    return app
 
 # ==========================================
 # DATABASE SETUP
 # ==========================================
-def init_db():
-    """Initialize SQLite database"""
-    conn = sqlite3.connect('studypal.db')
-    c = conn.cursor()
+def init_db(db_path=None):
+    """Initialize SQLite database (applies any pending schema migrations)"""
+    conn = database.connect(db_path or current_app.config['DATABASE'])
+    migrations.migrate(conn)
     
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            email TEXT UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            full_name TEXT NOT NULL,
-            bio TEXT,
-            avatar_url TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            last_login TIMESTAMP
-        )
-    ''')
-    
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS user_stats (
-            user_id INTEGER PRIMARY KEY,
-            streak INTEGER DEFAULT 0,
-            last_activity DATE,
-            total_quizzes INTEGER DEFAULT 0,
-            correct_answers INTEGER DEFAULT 0,
-            total_questions INTEGER DEFAULT 0,
-            total_study_time INTEGER DEFAULT 0,
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    ''')
-    
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS study_history (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER,
-            topic TEXT,
-            score TEXT,
-            difficulty TEXT,
-            study_duration INTEGER DEFAULT 0,
-            quiz_data TEXT,
-            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    ''')
+    # Clean up old quiz sessions (older than 24 hours)
+    maintenance.reap_expired_sessions(conn)
     
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS user_achievements (
-            user_id INTEGER,
-            achievement_id TEXT,
-            unlocked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            PRIMARY KEY (user_id, achievement_id),
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    ''')
+    conn.close()
+    print("✓ Database initialized")
+
+# Background threads are per process, so they start at most once however many
+# apps the factory builds
+_background_started = False
+_background_lock = threading.Lock()
+
+def create_app(config=None):
+    """Build a configured app, migrate its database and start background threads.
+
+    Importing this module only defines routes and the bare module-level `app`;
+    all side effects happen here so tests, CLI commands and worker restarts do
+    not pay for them. Run with `python app.py`, `flask --app "app:create_app()" run`
+    or `gunicorn "app:create_app()"`.
+    """
+    global _background_started
+    app = build_app(config)
     
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS schedules (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER,
-            subject TEXT NOT NULL,
-            unit_name TEXT,
-            topic_name TEXT NOT NULL,
-            difficulty TEXT DEFAULT 'medium',
-            estimated_hours INTEGER DEFAULT 2,
-            scheduled_date DATE NOT NULL,
-            start_time TEXT,
-            end_time TEXT,
-            status TEXT DEFAULT 'pending',
-            completion_percentage INTEGER DEFAULT 0,
-            notes TEXT,
-            is_auto_generated INTEGER DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            completed_at TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    ''')
+    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+    os.makedirs('models', exist_ok=True)
+    init_db(app.config['DATABASE'])
+    achievements.register()
     
-    # Temporary table to store quiz sessions (avoids session cookie size limits)
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS temp_quiz_sessions (
-            session_id TEXT PRIMARY KEY,
-            user_id INTEGER,
-            quiz_data TEXT NOT NULL,
-            topic TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    ''')
+    missing = download_nltk_data.missing_datasets()
+    if missing:
+        print(f"⚠️ NLTK data missing: {', '.join(missing)} - run: flask --app app fetch-nltk")
     
-    # Clean up old quiz sessions (older than 24 hours)
-    c.execute('''
-        DELETE FROM temp_quiz_sessions 
-        WHERE created_at < datetime('now', '-1 day')
-    ''')
+    # Only the one worker process that claims them for this database runs them
+    with _background_lock:
+        start_background = not _background_started
+        _background_started = True
+    if start_background:
+        wanted = app.config['MAINTENANCE_ENABLED'] or app.config['BACKUP_INTERVAL'] > 0
+        if wanted and maintenance.claim_background(app.config['DATABASE']):
+            # Expire and evict temp_quiz_sessions for as long as the server runs
+            if app.config['MAINTENANCE_ENABLED']:
+                maintenance.start(app.config['DATABASE'])
+            
+            # Optional scheduled online backups (see backup.py)
+            if app.config['BACKUP_INTERVAL'] > 0:
+                backup.start(app.config['DATABASE'], app.config['BACKUP_DIR'], app.config['BACKUP_INTERVAL'])
     
-    conn.commit()
-    conn.close()
-    print("✓ Database initialized")
+    return app
 
-init_db()
+@bp.cli.command('init-db')
+def init_db_command():
+    """Create studypal.db or apply pending migrations"""
+    init_db()
+
+@bp.cli.command('fetch-nltk')
+def fetch_nltk_command():
+    """Download the NLTK datasets used for tokenizing and tagging"""
+    missing = download_nltk_data.missing_datasets()
+    if not missing:
+        print("✓ NLTK data already present")
+        return
+    failed = download_nltk_data.download(missing)
+    print("✓ NLTK ready" if not failed else f"❌ Could not download: {', '.join(failed)}")
 
 # ==========================================
 # AI SCHEDULER ENGINE
@@ -435,85 +426,39 @@ def login_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         if 'user_id' not in session:
-            return redirect(url_for('login'))
+            return redirect(url_for('studypal.login'))
         return f(*args, **kwargs)
     return decorated_function
 
 def get_db_connection():
-    conn = sqlite3.connect('studypal.db')
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Return the request-scoped connection (one per request, pooled per thread)"""
+    if not has_app_context():
+        return database.pool.acquire(app.config['DATABASE'])
+    if 'db' not in g:
+        g.db = database.pool.acquire(current_app.config['DATABASE'])
+    return g.db
+
+def release_db_connection(exception):
+    conn = g.pop('db', None)
+    if conn is not None:
+        database.pool.release(conn)
 
 def get_user_by_id(user_id):
     conn = get_db_connection()
     user = conn.execute('SELECT * FROM users WHERE id = ?', (user_id,)).fetchone()
-    conn.close()
     return dict(user) if user else None
 
 def get_user_stats(user_id):
     conn = get_db_connection()
     stats = conn.execute('SELECT * FROM user_stats WHERE user_id = ?', (user_id,)).fetchone()
-    conn.close()
     return dict(stats) if stats else None
 
-def update_streak(user_id):
-    """Update user streak with proper date handling"""
-    conn = get_db_connection()
-    stats = conn.execute('SELECT * FROM user_stats WHERE user_id = ?', (user_id,)).fetchone()
-    
-    today = datetime.now().date().isoformat()
-    
-    if stats:
-        last_activity = stats['last_activity']
-        current_streak = stats['streak']
-        
-        if last_activity:
-            try:
-                last_date = datetime.strptime(last_activity, '%Y-%m-%d').date()
-                today_date = datetime.now().date()
-                days_diff = (today_date - last_date).days
-                
-                if days_diff == 0:
-                    # Same day, don't change streak
-                    pass
-                elif days_diff == 1:
-                    # Consecutive day, increment
-                    current_streak += 1
-                    conn.execute('UPDATE user_stats SET streak = ?, last_activity = ? WHERE user_id = ?',
-                                (current_streak, today, user_id))
-                elif days_diff > 1:
-                    # Streak broken, reset to 1
-                    current_streak = 1
-                    conn.execute('UPDATE user_stats SET streak = ?, last_activity = ? WHERE user_id = ?',
-                                (current_streak, today, user_id))
-            except:
-                current_streak = 1
-                conn.execute('UPDATE user_stats SET streak = ?, last_activity = ? WHERE user_id = ?',
-                            (current_streak, today, user_id))
-        else:
-            current_streak = 1
-            conn.execute('UPDATE user_stats SET streak = ?, last_activity = ? WHERE user_id = ?',
-                        (current_streak, today, user_id))
-    else:
-        conn.execute('INSERT INTO user_stats (user_id, streak, last_activity) VALUES (?, 1, ?)',
-                    (user_id, today))
-        current_streak = 1
-    
-    conn.commit()
-    conn.close()
-    return current_streak
+def update_streak(user_id, unlocks=None):
+    """Update user streak; same-day checks are answered from cache without a write.
 
-# ==========================================
-# NLTK SETUP
-# ==========================================
-print("📦 Setting up NLTK...")
-required_nltk = ['punkt', 'punkt_tab', 'stopwords', 'averaged_perceptron_tagger', 'averaged_perceptron_tagger_eng']
-for dataset in required_nltk:
-    try:
-        nltk.download(dataset, quiet=True)
-    except:
-        pass
-print("✓ NLTK ready")
+    Achievements unlocked by the streak moving are appended to `unlocks`.
+    """
+    return streaks.touch_streak(get_db_connection(), user_id, unlocks=unlocks)
 
 # ==========================================
 # MULTI-SOURCE CONTENT FETCHER
@@ -521,12 +466,134 @@ print("✓ NLTK ready")
 class MultiSourceLearner:
     """Enhanced content fetcher with multiple sources including web search"""
     
-    def __init__(self):
-        self.wiki = wikipediaapi.Wikipedia(
-            language='en',
-            extract_format=wikipediaapi.ExtractFormat.WIKI,
-            user_agent="AI_Study_Pal_Multi/1.0"
-        )
+    SEARCH_DEADLINE_SECONDS = 12     # overall budget for one search_and_learn fan-out
+    MIN_CHARS = 100                  # shorter results are discarded
+    SUBSTANTIAL_CHARS = 500          # first result over this wins and the rest are dropped
+    MAX_FETCHES_PER_SEARCH = 4       # comparison sides kept in flight at once by one search
+    
+    # Shared by every learner, sized for ~8 concurrent searches of 4 sources each.
+    # A fetch is only submitted once it holds one of fetch_slots (one per worker),
+    # so work never sits in the executor queue; waiting for a slot counts against
+    # the search deadline. A fetch abandoned at the deadline keeps its slot until
+    # it returns, which http_session bounds by that same deadline.
+    FETCH_WORKERS = 32
+    executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix='source-fetch')
+    fetch_slots = threading.BoundedSemaphore(FETCH_WORKERS)
+
+    def __init__(self, cache=None, deadline=None, limiter=None, health=None, titles=None, offline=None):
+        self.wiki = http_session.wikipedia('en')
+        self.offline = offline
+        self.titles = wiki_titles.resolver if titles is None else titles
+        self.cache = cache
+        self.limiter = limiter
+        self.health = source_health.SourceHealth() if health is None else health
+        self.deadline = self.SEARCH_DEADLINE_SECONDS if deadline is None else deadline
+    
+    def throttle(self, source):
+        """
+        Wait for source's shared rate-limit budget (no-op without a limiter); raises
+        RateLimited rather than waiting past the thread's deadline
+        """
+        if self.limiter is not None:
+            waited = self.limiter.acquire(source, max_wait=http_session.time_left())
+            if waited:
+                print(f"  ⏳ [{source}] Rate limited for {waited * 1000:.0f} ms")
+    
+    def fetch_cached(self, source, fetch_method, query):
+        """Run fetch_method through the content cache; returns (text, label, cached)"""
+        if self.cache is not None:
+            hit = self.cache.get(query, source)
+            if hit is not None:
+                print(f"  ⚡ [{source}] Cache hit: {hit[1]}")
+                return hit[0], hit[1], True
+        
+        self.throttle(source)
+        started = time.perf_counter()
+        try:
+            text, label = fetch_method(query)
+        except Exception:
+            self.health.record(source, 0, time.perf_counter() - started, error=True)
+            raise
+        self.health.record(source, len(text or ""), time.perf_counter() - started)
+        if self.cache is not None and text and len(text) > 100:
+            self.cache.set(query, source, text, label)
+        return text, label, False
+    
+    def submit_fetch(self, deadline, fn, *args):
+        """
+        Run fn(*args) on the shared executor once a slot frees up before the monotonic
+        deadline; returns the future, or None when no slot came free in time.
+        """
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not self.fetch_slots.acquire(timeout=remaining):
+            return None
+        try:
+            return self.executor.submit(self._run_in_slot, fn, *args)
+        except Exception:
+            self.fetch_slots.release()
+            raise
+
+    def _run_in_slot(self, fn, *args):
+        try:
+            return fn(*args)
+        finally:
+            self.fetch_slots.release()
+
+    def _timed_fetch(self, name, fetch_method, query, deadline=None):
+        started = time.perf_counter()
+        try:
+            with http_session.deadline_scope(deadline):
+                text, label, cached = self.fetch_cached(name, fetch_method, query)
+        except Exception as e:
+            print(f"  ⚠️ [{name}] Error: {e}")
+            text, label, cached = "", "", False
+        return text, label, cached, time.perf_counter() - started
+    
+    def fetch_concurrently(self, query, fetch_methods, deadline=None):
+        """
+        Run all sources at once until deadline (monotonic; default self.deadline from now).
+        Returns ([(name, text, label, cached)] in priority order, {name: seconds or None}).
+        Stops at the first result over SUBSTANTIAL_CHARS, returning only that one;
+        sources still running then (or at the deadline) are ignored, and sources that
+        got no fetch slot before the deadline are dropped without running.
+        """
+        if deadline is None:
+            deadline = time.monotonic() + self.deadline
+        futures = {}
+        for name, method in fetch_methods:
+            future = self.submit_fetch(deadline, self._timed_fetch, name, method, query, deadline)
+            if future is not None:
+                futures[future] = name
+        order = [name for name, _ in fetch_methods]
+        timings = dict.fromkeys(order)
+        results = {}
+        winner = None
+        pending = set(futures)
+
+        while pending and winner is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures[future]
+                text, label, cached, elapsed = future.result()
+                timings[name] = elapsed
+                if text and len(text) > self.MIN_CHARS:
+                    results[name] = (name, text, label, cached)
+                    if len(text) > self.SUBSTANTIAL_CHARS and winner is None:
+                        winner = name
+
+        for name in order:
+            took = timings[name]
+            if took is None:
+                print(f"  ⏱️ [{name}] dropped ({'deadline' if winner is None else 'superseded'})")
+            else:
+                print(f"  ⏱️ [{name}] {took * 1000:.0f} ms{' ✔' if name == winner else ''}")
+        
+        if winner is not None:
+            return [results[winner]], timings
+        return [results[name] for name in order if name in results], timings
     
     def clean_text(self, text):
         if not text:
@@ -542,123 +609,157 @@ class MultiSourceLearner:
         text = re.sub(r'[^\x20-\x7E\n\r\t]', '', text)
         return text.strip()
     
-    def fetch_from_wikipedia(self, query):
-        """Source 1: Wikipedia"""
+    def fetch_from_offline(self, query):
+        """Source 0: local Wikipedia extract corpus (no network)"""
+        if self.offline is None:
+            return "", ""
         try:
-            print(f"  📖 [Wikipedia] Searching: {query}")
-            search_terms = [query, query.title(), f"{query} (concept)", f"{query} (technology)"]
-            
-            for term in search_terms:
-                page = self.wiki.page(term)
-                if page.exists():
-                    text = page.text if hasattr(page, 'text') else page.summary
-                    if len(text) > 100:
-                        print(f"  ✅ [Wikipedia] Found: {page.title}")
-                        return self.clean_text(text[:5000]), f"Wikipedia: {page.title}"
+            found = self.offline.lookup(query)
+            if found:
+                title, text = found
+                print(f"  💾 [Offline] Found: {title}")
+                return self.clean_text(text[:5000]), f"Offline Wikipedia: {title}"
         except Exception as e:
-            print(f"  ⚠️ [Wikipedia] Error: {e}")
+            print(f"  ⚠️ [Offline] Error: {e}")
         return "", ""
     
-    def fetch_from_simple_wikipedia(self, query):
-        """Source 2: Simple English Wikipedia"""
+    def fetch_topic(self, topic):
+        """
+        Offline corpus first, then Wikipedia through the content cache (unless its circuit
+        is open); returns (text, label, cached)
+        """
+        text, source = self.fetch_from_offline(topic)
+        if text:
+            return text, source, False
+        if not self.health.allow('wikipedia'):
+            print(f"  ⛔ [Wikipedia] Circuit open, skipping: {topic}")
+            return "", "", False
+        return self.fetch_cached('wikipedia', self.fetch_from_wikipedia, topic)
+    
+    def _fetch_side(self, topic, deadline=None):
+        """One side of a comparison: (text, label, term counts), counted on the worker thread"""
         try:
-            print(f"  📖 [Simple Wiki] Searching: {query}")
-            simple_wiki = wikipediaapi.Wikipedia(
-                language='simple',
-                extract_format=wikipediaapi.ExtractFormat.WIKI,
-                user_agent="AI_Study_Pal_Multi/1.0"
-            )
-            
-            page = simple_wiki.page(query)
-            if page.exists():
-                text = page.text if hasattr(page, 'text') else page.summary
-                if len(text) > 100:
-                    print(f"  ✅ [Simple Wiki] Found: {page.title}")
-                    return self.clean_text(text[:3000]), f"Simple Wikipedia: {page.title}"
+            with http_session.deadline_scope(deadline):
+                text, source, cached = self.fetch_topic(topic)
         except Exception as e:
-            print(f"  ⚠️ [Simple Wiki] Error: {e}")
+            print(f"  ⚠️ [Comparison] {topic}: {e}")
+            return "", "", None
+        if not text:
+            return "", "", None
+        return text, f"{source} (cached)" if cached else source, comparison.term_counts(text, topic)
+    
+    # The network fetchers return ("", "") when the source has nothing on the query
+    # and let transport and HTTP errors raise, so source health can tell them apart.
+    
+    def fetch_from_wikipedia(self, query):
+        """Source 1: Wikipedia"""
+        print(f"  📖 [Wikipedia] Searching: {query}")
+        # One batched lookup covers query, Query, "query (concept)", ... plus redirects
+        title = self.titles.resolve(query)
+        if title:
+            page = self.wiki.page(title)
+            text = page.text if hasattr(page, 'text') else page.summary
+            if len(text) > 100:
+                print(f"  ✅ [Wikipedia] Found: {page.title}")
+                return self.clean_text(text[:5000]), f"Wikipedia: {page.title}"
+        return "", ""
+    
+    def fetch_from_simple_wikipedia(self, query):
+        """Source 2: Simple English Wikipedia"""
+        print(f"  📖 [Simple Wiki] Searching: {query}")
+        title = self.titles.resolve(query, language='simple')
+        if title:
+            page = http_session.wikipedia('simple').page(title)
+            text = page.text if hasattr(page, 'text') else page.summary
+            if len(text) > 100:
+                print(f"  ✅ [Simple Wiki] Found: {page.title}")
+                return self.clean_text(text[:3000]), f"Simple Wikipedia: {page.title}"
         return "", ""
     
     def fetch_from_duckduckgo(self, query):
         """Source 3: DuckDuckGo Instant Answer"""
-        try:
-            print(f"  🔍 [DuckDuckGo] Searching: {query}")
-            api_url = f"https://api.duckduckgo.com/?q={query}&format=json"
-            
-            response = requests.get(api_url, timeout=10)
-            data = response.json()
-            
-            text = ""
-            if data.get('AbstractText'):
-                text = data['AbstractText']
-            elif data.get('RelatedTopics'):
-                for topic in data['RelatedTopics'][:5]:
-                    if isinstance(topic, dict) and topic.get('Text'):
-                        text += topic['Text'] + "\n\n"
-            
-            if len(text) > 100:
-                print(f"  ✅ [DuckDuckGo] Found instant answer")
-                return self.clean_text(text[:3000]), "DuckDuckGo Instant Answer"
-        except Exception as e:
-            print(f"  ⚠️ [DuckDuckGo] Error: {e}")
+        print(f"  🔍 [DuckDuckGo] Searching: {query}")
+        api_url = f"https://api.duckduckgo.com/?q={query}&format=json"
+        
+        response = http_session.get(api_url)
+        response.raise_for_status()
+        data = response.json()
+        
+        text = ""
+        if data.get('AbstractText'):
+            text = data['AbstractText']
+        elif data.get('RelatedTopics'):
+            for topic in data['RelatedTopics'][:5]:
+                if isinstance(topic, dict) and topic.get('Text'):
+                    text += topic['Text'] + "\n\n"
+        
+        if len(text) > 100:
+            print(f"  ✅ [DuckDuckGo] Found instant answer")
+            return self.clean_text(text[:3000]), "DuckDuckGo Instant Answer"
         return "", ""
     
     def fetch_from_web_search(self, query):
         """Source 4: Web scraping from search results"""
-        try:
-            print(f"  🌐 [Web Search] Searching: {query}")
-            
-            # Try to get content from educational sites
-            search_query = query.replace(' ', '+')
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            # Try Britannica
-            try:
-                britannica_url = f"https://www.britannica.com/search?query={search_query}"
-                response = requests.get(britannica_url, headers=headers, timeout=10)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    # Look for article content
-                    content_divs = soup.find_all(['p', 'div'], class_=re.compile('content|article|text'))
-                    text = ' '.join([div.get_text() for div in content_divs[:10]])
-                    if len(text) > 200:
-                        print(f"  ✅ [Britannica] Found content")
-                        return self.clean_text(text[:4000]), "Encyclopedia Britannica"
-            except:
-                pass
-            
-        except Exception as e:
-            print(f"  ⚠️ [Web Search] Error: {e}")
+        print(f"  🌐 [Web Search] Searching: {query}")
+        from bs4 import BeautifulSoup
+        
+        # Try to get content from educational sites
+        search_query = query.replace(' ', '+')
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+        
+        # Try Britannica; a blocked or failed page is an error, not a miss
+        britannica_url = f"https://www.britannica.com/search?query={search_query}"
+        response = http_session.get(britannica_url, headers=headers)
+        response.raise_for_status()
+        soup = BeautifulSoup(response.content, 'html.parser')
+        # Look for article content
+        content_divs = soup.find_all(['p', 'div'], class_=re.compile('content|article|text'))
+        text = ' '.join([div.get_text() for div in content_divs[:10]])
+        if len(text) > 200:
+            print(f"  ✅ [Britannica] Found content")
+            return self.clean_text(text[:4000]), "Encyclopedia Britannica"
         return "", ""
     
-    def fetch_comparison_content(self, query):
-        """Source 5: Handle comparison queries (X vs Y)"""
+    def fetch_comparison_content(self, query, deadline=None):
+        """
+        Source 5: Handle comparison queries (A vs B [vs C ...]), fetching up to
+        MAX_FETCHES_PER_SEARCH sides at once until deadline (monotonic; default
+        self.deadline from now)
+        """
         try:
-            if ' vs ' in query.lower() or ' versus ' in query.lower():
-                print(f"  🔄 [Comparison] Detected comparison query")
+            topics = comparison.split_topics(query)
+            if len(topics) >= 2:
+                print(f"  🔄 [Comparison] Detected {len(topics)}-way comparison")
                 
-                # Split the query
-                parts = re.split(r'\s+vs\.?\s+|\s+versus\s+', query, flags=re.IGNORECASE)
-                if len(parts) == 2:
-                    topic1, topic2 = parts[0].strip(), parts[1].strip()
-                    
-                    # Fetch both topics
-                    content1, source1 = self.fetch_from_wikipedia(topic1)
-                    time.sleep(0.5)
-                    content2, source2 = self.fetch_from_wikipedia(topic2)
-                    
-                    if content1 and content2:
-                        combined = f"COMPARISON: {topic1} vs {topic2}\n\n"
-                        combined += f"=== {topic1.upper()} ===\n{content1[:2000]}\n\n"
-                        combined += f"=== {topic2.upper()} ===\n{content2[:2000]}\n\n"
-                        combined += f"KEY DIFFERENCES:\n"
-                        combined += f"While {topic1} and {topic2} are related concepts, they have distinct characteristics. "
-                        combined += f"{topic1} focuses on specific aspects, while {topic2} encompasses broader principles."
-                        
-                        print(f"  ✅ [Comparison] Generated comparison content")
-                        return combined, f"Comparison: {source1} & {source2}"
+                if deadline is None:
+                    deadline = time.monotonic() + self.deadline
+                waiting = list(enumerate(topics))
+                futures = {}
+                sides = [None] * len(topics)
+                while waiting or futures:
+                    while waiting and len(futures) < self.MAX_FETCHES_PER_SEARCH:
+                        i, topic = waiting.pop(0)
+                        future = self.submit_fetch(deadline, self._fetch_side, topic, deadline)
+                        if future is None:       # no slot before the deadline
+                            waiting = []
+                            break
+                        futures[future] = i
+                    remaining = deadline - time.monotonic()
+                    if not futures or remaining <= 0:
+                        break
+                    done, _ = wait(futures, timeout=remaining, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        sides[futures.pop(future)] = future.result()
+                
+                found = [(topic, side) for topic, side in zip(topics, sides) if side and side[0]]
+                if len(found) >= 2:
+                    combined = comparison.build_comparison([topic for topic, _ in found],
+                                                           [side[0] for _, side in found],
+                                                           [side[2] for _, side in found])
+                    print(f"  ✅ [Comparison] Generated comparison of {len(found)} topics")
+                    return combined, f"Comparison: {' & '.join(side[1] for _, side in found)}"
         except Exception as e:
             print(f"  ⚠️ [Comparison] Error: {e}")
         return "", ""
@@ -689,6 +790,24 @@ class MultiSourceLearner:
             print(f"  ⚠️ [Fallback] Error: {e}")
         return "", ""
     
+    def network_sources(self):
+        """
+        (name, fetch method) pairs for the concurrent fan-out. List order is the priority for
+        partial results; sources with an open circuit are skipped and the rest ranked by past
+        yield and latency.
+        """
+        fetch_methods = [
+            ('wikipedia', self.fetch_from_wikipedia),
+            ('simple_wikipedia', self.fetch_from_simple_wikipedia),
+            ('duckduckgo', self.fetch_from_duckduckgo),
+            ('web_search', self.fetch_from_web_search)
+        ]
+        ordered = self.health.order(fetch_methods)
+        skipped = [name for name, _ in fetch_methods if name not in dict(ordered)]
+        if skipped:
+            print(f"  🚫 Circuit open, skipping: {', '.join(skipped)}")
+        return ordered
+    
     def search_and_learn(self, query):
         """Main search with automatic fallback and multiple sources"""
         print(f"\n{'='*60}")
@@ -697,10 +816,13 @@ class MultiSourceLearner:
         
         all_content = []
         sources_used = []
+        # One budget for the whole search: time spent on a comparison is not given back to the fan-out
+        deadline = time.monotonic() + self.deadline
         
-        # Try comparison first if it's a vs query
-        if ' vs ' in query.lower() or ' versus ' in query.lower():
-            text, source = self.fetch_comparison_content(query)
+        # Try comparison first if it's a vs query. Only its sides go through the content
+        # cache: a comparison cut short by the deadline must not be stored as complete.
+        if comparison.is_comparison(query):
+            text, source = self.fetch_comparison_content(query, deadline)
             if text and len(text) > 200:
                 all_content.append(text)
                 sources_used.append(source)
@@ -710,29 +832,17 @@ class MultiSourceLearner:
                 print(f"{'='*60}\n")
                 return segments, sources_used
         
-        # Try sources in priority order
-        fetch_methods = [
-            self.fetch_from_wikipedia,
-            self.fetch_from_simple_wikipedia,
-            self.fetch_from_duckduckgo,
-            self.fetch_from_web_search
-        ]
+        # The local corpus costs no network time; a substantial hit skips the fan-out
+        text, source = self.fetch_from_offline(query)
+        if len(text) > self.MIN_CHARS:
+            all_content.append(text)
+            sources_used.append(source)
         
-        for fetch_method in fetch_methods:
-            try:
-                text, source = fetch_method(query)
-                if text and len(text) > 100:
-                    all_content.append(text)
-                    sources_used.append(source)
-                    
-                    # Stop if we have substantial content
-                    if len(text) > 500:
-                        break
-                
-                time.sleep(0.5)  # Rate limiting
-            except Exception as e:
-                print(f"  ⚠️ Error: {e}")
-                continue
+        if len(text) <= self.SUBSTANTIAL_CHARS:
+            results, _ = self.fetch_concurrently(query, self.network_sources(), deadline)
+            for name, text, source, cached in results:
+                all_content.append(text)
+                sources_used.append(f"{source} (cached)" if cached else source)
         
         # If no content found, use fallback
         if not all_content:
@@ -754,8 +864,23 @@ class MultiSourceLearner:
         
         return segments, sources_used
 
-# Initialize multi-source learner
-multi_learner = MultiSourceLearner()
+_multi_learner = None
+_multi_learner_lock = threading.Lock()
+
+def get_multi_learner(config=None):
+    """
+    Shared MultiSourceLearner, built once on first use by whichever caller gets the lock.
+    config defaults to current_app.config; scripts without an app context pass one.
+    """
+    global _multi_learner
+    if _multi_learner is None:
+        with _multi_learner_lock:
+            if _multi_learner is None:
+                config = current_app.config if config is None else config
+                _multi_learner = MultiSourceLearner(cache=content_cache.ContentCache(config['DATABASE']),
+                                                    limiter=rate_limit.RateLimiter(config['DATABASE']),
+                                                    offline=offline_corpus.open_corpus(config['OFFLINE_CORPUS_DIR']))
+    return _multi_learner
 
 # ==========================================
 # FILE PROCESSING
@@ -766,6 +891,7 @@ def allowed_file(filename):
 def extract_text_from_pdf(filepath):
     text = ""
     try:
+        import PyPDF2
         with open(filepath, 'rb') as f:
             reader = PyPDF2.PdfReader(f)
             for page in reader.pages:
@@ -779,6 +905,7 @@ def extract_text_from_pdf(filepath):
 def extract_text_from_ppt(filepath):
     text = ""
     try:
+        from pptx import Presentation
         prs = Presentation(filepath)
         for slide in prs.slides:
             for shape in slide.shapes:
@@ -818,6 +945,7 @@ def extract_complete_sentences(text):
         return []
     
     try:
+        from nltk.tokenize import sent_tokenize
         sentences = sent_tokenize(text)
     except:
         sentences = [s.strip() + '.' for s in text.split('.') if s.strip()]
@@ -996,7 +1124,7 @@ def suggest_related_topics(main_topic):
 # ==========================================
 # AUTHENTICATION ROUTES
 # ==========================================
-@app.route('/login', methods=['GET', 'POST'])
+@bp.route('/login', methods=['GET', 'POST'])
 def login():
     if request.method == 'POST':
         data = request.get_json()
@@ -1008,7 +1136,6 @@ def login():
         
         conn = get_db_connection()
         user = conn.execute('SELECT * FROM users WHERE username = ?', (username,)).fetchone()
-        conn.close()
         
         if user and check_password_hash(user['password_hash'], password):
             session['user_id'] = user['id']
@@ -1018,15 +1145,14 @@ def login():
             conn.execute('UPDATE users SET last_login = ? WHERE id = ?', 
                         (datetime.now(), user['id']))
             conn.commit()
-            conn.close()
             
-            return jsonify({'success': True, 'redirect': url_for('index')})
+            return jsonify({'success': True, 'redirect': url_for('studypal.index')})
         else:
             return jsonify({'error': 'Invalid username or password'}), 401
     
     return render_template('login.html')
 
-@app.route('/signup', methods=['GET', 'POST'])
+@bp.route('/signup', methods=['GET', 'POST'])
 def signup():
     if request.method == 'POST':
         data = request.get_json()
@@ -1048,12 +1174,10 @@ def signup():
         
         existing = conn.execute('SELECT id FROM users WHERE username = ?', (username,)).fetchone()
         if existing:
-            conn.close()
             return jsonify({'error': 'Username already taken'}), 400
         
         existing = conn.execute('SELECT id FROM users WHERE email = ?', (email,)).fetchone()
         if existing:
-            conn.close()
             return jsonify({'error': 'Email already registered'}), 400
         
         password_hash = generate_password_hash(password)
@@ -1072,23 +1196,21 @@ def signup():
             ''', (user_id,))
             
             conn.commit()
-            conn.close()
             
             session['user_id'] = user_id
             session['username'] = username
             
-            return jsonify({'success': True, 'redirect': url_for('index')})
+            return jsonify({'success': True, 'redirect': url_for('studypal.index')})
         
         except Exception as e:
-            conn.close()
             return jsonify({'error': 'Registration failed'}), 500
     
     return render_template('signup.html')
 
-@app.route('/logout')
+@bp.route('/logout')
 def logout():
     session.clear()
-    return redirect(url_for('login'))
+    return redirect(url_for('studypal.login'))
 
 # ==========================================
 # MOTIVATIONAL QUOTES
@@ -1203,7 +1325,7 @@ def get_random_quote():
 # ==========================================
 # MAIN APP ROUTES
 # ==========================================
-@app.route('/')
+@bp.route('/')
 @login_required
 def index():
     user_id = session.get('user_id')
@@ -1223,7 +1345,7 @@ def index():
     
     return render_template('index_modern.html', user=user_data, quote=daily_quote)
 
-@app.route('/generate', methods=['POST'])
+@bp.route('/generate', methods=['POST'])
 @login_required
 def generate():
     try:
@@ -1258,7 +1380,7 @@ def generate():
                 if file and file.filename and allowed_file(file.filename):
                     try:
                         filename = secure_filename(file.filename)
-                        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+                        filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
                         file.save(filepath)
                         
                         ext = filename.rsplit('.', 1)[1].lower()
@@ -1293,12 +1415,12 @@ def generate():
             sources = ['Your notes']
         else:
             print("✅ Using multi-source search")
-            segments, sources = multi_learner.search_and_learn(query)
+            segments, sources = get_multi_learner().search_and_learn(query)
         
         if not segments:
             # Try fallback one more time
             print("⚠️ No segments from primary search, trying fallback...")
-            fallback_text, fallback_source = multi_learner.fetch_from_fallback_sources(query)
+            fallback_text, fallback_source = get_multi_learner().fetch_from_fallback_sources(query)
             if fallback_text:
                 segments = segment_into_topics(fallback_text, query)
                 sources = [fallback_source]
@@ -1320,18 +1442,9 @@ def generate():
         
         # Store quiz data in database instead of session (avoids cookie size limits)
         conn = get_db_connection()
-        quiz_data_json = json.dumps({
-            'segments': segments,
-            'topic': query,
-            'quiz_mode': quiz_mode,
-            'sources': sources
-        })
-        conn.execute('''
-            INSERT INTO temp_quiz_sessions (session_id, user_id, quiz_data, topic)
-            VALUES (?, ?, ?, ?)
-        ''', (quiz_session_id, user_id, quiz_data_json, query))
+        quiz_sessions.store_session(conn, quiz_session_id, user_id, query, quiz_mode, sources, segments)
         conn.commit()
-        conn.close()
+        quiz_sessions.cache_session(quiz_session_id, user_id, query, segments)
         
         # Store only the session ID in Flask session (small footprint)
         session['quiz_session_id'] = quiz_session_id
@@ -1358,7 +1471,7 @@ def generate():
         traceback.print_exc()
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
-@app.route('/submit_quiz', methods=['POST'])
+@bp.route('/submit_quiz', methods=['POST'])
 @login_required
 def submit_quiz():
     try:
@@ -1385,30 +1498,22 @@ def submit_quiz():
             print("  ❌ No quiz_session_id found")
             return jsonify({'error': 'No active study session. Please regenerate the content and try again.'}), 400
         
+        # Only this segment's questions are read, whatever the document size
         conn = get_db_connection()
-        quiz_session = conn.execute(
-            'SELECT quiz_data, topic FROM temp_quiz_sessions WHERE session_id = ? AND user_id = ?',
-            (quiz_session_id, user_id)
-        ).fetchone()
+        segment_quiz = quiz_sessions.get_segment_quiz(conn, quiz_session_id, user_id, segment_idx)
         
-        if not quiz_session:
-            conn.close()
+        if segment_quiz is None:
             print("  ❌ Quiz session not found in database")
             return jsonify({'error': 'Quiz session expired. Please regenerate the content and try again.'}), 400
         
-        study_data = json.loads(quiz_session['quiz_data'])
-        segments = study_data.get('segments', [])
+        topic, questions = segment_quiz
         
         print(f"  Retrieved quiz session: {quiz_session_id}")
-        print(f"  Segments count: {len(segments)}")
         
-        if segment_idx >= len(segments):
+        if questions is None:
             return jsonify({'error': 'Invalid segment'}), 400
         
-        questions = segments[segment_idx].get('quiz', [])
-        
         if not questions:
-            conn.close()
             return jsonify({'error': 'No quiz questions available'}), 400
         
         # Calculate score
@@ -1418,36 +1523,11 @@ def submit_quiz():
             if user_answer and user_answer == q.get('answer'):
                 score += 1
         
-        # Get or create user_stats
-        stats = conn.execute('SELECT * FROM user_stats WHERE user_id = ?', (user_id,)).fetchone()
-        
-        if not stats:
-            # Create user_stats if it doesn't exist
-            conn.execute('''
-                INSERT INTO user_stats (user_id, streak, last_activity, total_quizzes, correct_answers, total_questions, total_study_time)
-                VALUES (?, 0, NULL, 0, 0, 0, 0)
-            ''', (user_id,))
-            conn.commit()
-            stats = conn.execute('SELECT * FROM user_stats WHERE user_id = ?', (user_id,)).fetchone()
-        
-        new_total = stats['total_quizzes'] + 1
-        new_correct = stats['correct_answers'] + score
-        new_questions = stats['total_questions'] + len(questions)
-        
         # Add study time (convert seconds to minutes)
         study_minutes = int(study_duration / 60) if study_duration > 0 else 5  # Default 5 min if not tracked
-        current_study_time = stats['total_study_time'] if stats['total_study_time'] is not None else 0
-        new_study_time = current_study_time + study_minutes
         
         print(f"  Study Duration (seconds): {study_duration}")
         print(f"  Study Minutes: {study_minutes}")
-        print(f"  Old Total Time: {current_study_time}")
-        print(f"  New Total Time: {new_study_time}")
-        
-        conn.execute('''UPDATE user_stats 
-                       SET total_quizzes = ?, correct_answers = ?, total_questions = ?, total_study_time = ?
-                       WHERE user_id = ?''',
-                    (new_total, new_correct, new_questions, new_study_time, user_id))
         
         # Store quiz data with questions and answers
         quiz_data = {
@@ -1467,16 +1547,33 @@ def submit_quiz():
             quiz_data['correct_answers'].append(correct_answer)
             quiz_data['results'].append(is_correct)
         
-        quiz_data_json = json.dumps(quiz_data)
+        quiz_data_blob = codec.encode(quiz_data)
         
-        conn.execute('INSERT INTO study_history (user_id, topic, score, difficulty, study_duration, quiz_data) VALUES (?, ?, ?, ?, ?, ?)',
-                    (user_id, study_data.get('topic', 'Unknown'), f"{score}/{len(questions)}", 'medium', study_minutes, quiz_data_json))
-        
-        conn.commit()
-        conn.close()
+        # History row and stats increments commit together; the increments are
+        # applied in SQL so concurrent submissions from other workers are never lost
+        with conn:
+            cursor = conn.execute('INSERT INTO study_history (user_id, topic, score, difficulty, study_duration, quiz_data) VALUES (?, ?, ?, ?, ?, ?)',
+                        (user_id, topic or 'Unknown', f"{score}/{len(questions)}", 'medium', study_minutes, quiz_data_blob))
+            quiz_answers.record_answers(conn, cursor.lastrowid, user_id, topic or 'Unknown', quiz_data)
+            
+            conn.execute('''
+                INSERT INTO user_stats (user_id, streak, last_activity, total_quizzes, correct_answers, total_questions, total_study_time)
+                VALUES (?, 0, NULL, 1, ?, ?, ?)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    total_quizzes = COALESCE(total_quizzes, 0) + 1,
+                    correct_answers = COALESCE(correct_answers, 0) + excluded.correct_answers,
+                    total_questions = COALESCE(total_questions, 0) + excluded.total_questions,
+                    total_study_time = COALESCE(total_study_time, 0) + excluded.total_study_time
+            ''', (user_id, score, len(questions), study_minutes))
+            
+            activity.record_activity(conn, user_id, quizzes=1, questions=len(questions),
+                                     correct=score, minutes=study_minutes)
+            
+            new_achievements = achievements.evaluate(conn, user_id, at=datetime.now(),
+                                                     perfect=bool(questions) and score == len(questions))
         
-        # Update streak
-        update_streak(user_id)
+        # Update streak; streak badges go in the same popup
+        update_streak(user_id, unlocks=new_achievements)
         
         percentage = round((score / len(questions)) * 100, 1) if questions else 0
         
@@ -1504,7 +1601,8 @@ def submit_quiz():
             'total': len(questions),
             'percentage': percentage,
             'study_time_added': study_minutes,
-            'detailed_results': detailed_results
+            'detailed_results': detailed_results,
+            'new_achievements': new_achievements
         })
         
     except Exception as e:
@@ -1513,7 +1611,7 @@ def submit_quiz():
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
-@app.route('/profile')
+@bp.route('/profile')
 @login_required
 def profile():
     user_id = session.get('user_id')
@@ -1531,32 +1629,18 @@ def profile():
     # Get study history
     conn = get_db_connection()
     history = conn.execute('''
-        SELECT * FROM study_history 
+        SELECT id, topic, score, difficulty, study_duration, timestamp FROM study_history 
         WHERE user_id = ? 
         ORDER BY timestamp DESC 
         LIMIT 10
     ''', (user_id,)).fetchall()
-    conn.close()
     
     history_list = [dict(row) for row in history]
     
-    # 12 Achievements
-    achievements = [
-        {'id': '3day', 'name': '🔥 3-Day Streak', 'desc': 'Study 3 days in a row', 'unlocked': current_streak >= 3},
-        {'id': '7day', 'name': '⭐ Week Warrior', 'desc': 'Study 7 days in a row', 'unlocked': current_streak >= 7},
-        {'id': '30day', 'name': '🏆 Month Master', 'desc': 'Study 30 days in a row', 'unlocked': current_streak >= 30},
-        {'id': 'quiz10', 'name': '📝 Quiz Novice', 'desc': 'Complete 10 quizzes', 'unlocked': stats['total_quizzes'] >= 10 if stats else False},
-        {'id': 'quiz50', 'name': '🎓 Quiz Expert', 'desc': 'Complete 50 quizzes', 'unlocked': stats['total_quizzes'] >= 50 if stats else False},
-        {'id': 'quiz100', 'name': '👑 Quiz Legend', 'desc': 'Complete 100 quizzes', 'unlocked': stats['total_quizzes'] >= 100 if stats else False},
-        {'id': 'accuracy70', 'name': '🎯 Good Aim', 'desc': 'Achieve 70%+ accuracy', 'unlocked': overall_score >= 70},
-        {'id': 'accuracy80', 'name': '🎯 Sharp Shooter', 'desc': 'Achieve 80%+ accuracy', 'unlocked': overall_score >= 80},
-        {'id': 'accuracy90', 'name': '🎯 Sniper', 'desc': 'Achieve 90%+ accuracy', 'unlocked': overall_score >= 90},
-        {'id': 'perfect', 'name': '💯 Perfectionist', 'desc': 'Score 100% on a quiz', 'unlocked': overall_score == 100},
-        {'id': 'early_bird', 'name': '🌅 Early Bird', 'desc': 'Study before 8 AM', 'unlocked': False},
-        {'id': 'night_owl', 'name': '🦉 Night Owl', 'desc': 'Study after 10 PM', 'unlocked': False}
-    ]
+    # Unlocks are written as activity happens; this is a single read
+    achievement_list = achievements.profile_achievements(conn, user_id)
 
-    calendar = [{'date': (datetime.now() - timedelta(days=29-i)).date().isoformat(), 'has_activity': False} for i in range(30)]
+    calendar = activity.activity_days(conn, user_id, activity.CALENDAR_DAYS)
 
     user_data = {
         'username': user['username'],
@@ -1572,9 +1656,9 @@ def profile():
         'overall_score': overall_score
     }
 
-    return render_template('profile.html', user=user_data, achievements=achievements, calendar=calendar, history=history_list)
+    return render_template('profile.html', user=user_data, achievements=achievement_list, calendar=calendar, history=history_list)
 
-@app.route('/scheduler')
+@bp.route('/scheduler')
 @login_required
 def scheduler():
     user_id = session.get('user_id')
@@ -1595,7 +1679,7 @@ def scheduler():
 # AI SCHEDULER API ROUTES
 # ==========================================
 
-@app.route('/api/generate_schedule', methods=['POST'])
+@bp.route('/api/generate_schedule', methods=['POST'])
 @login_required
 def api_generate_schedule():
     """AI-powered schedule generation"""
@@ -1637,7 +1721,7 @@ def api_generate_schedule():
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/save_bulk_schedule', methods=['POST'])
+@bp.route('/api/save_bulk_schedule', methods=['POST'])
 @login_required
 def api_save_bulk_schedule():
     """Save AI-generated schedule to database"""
@@ -1650,36 +1734,21 @@ def api_save_bulk_schedule():
             return jsonify({'error': 'No schedule data provided'}), 400
         
         conn = get_db_connection()
+        ids = schedule_store.insert_bulk(conn, user_id, schedule, dedupe=bool(data.get('dedupe', False)))
+        saved_count = sum(1 for schedule_id in ids if schedule_id is not None)
         
-        for item in schedule:
-            conn.execute('''
-                INSERT INTO schedules 
-                (user_id, subject, unit_name, topic_name, difficulty, estimated_hours, 
-                 scheduled_date, start_time, end_time, is_auto_generated, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'pending')
-            ''', (
-                user_id,
-                item.get('subject', ''),
-                item.get('unit_name', ''),
-                item.get('topic_name', ''),
-                item.get('difficulty', 'medium'),
-                item.get('estimated_hours', 2),
-                item.get('scheduled_date', ''),
-                item.get('start_time', '09:00'),
-                item.get('end_time', '11:00'),
-                item.get('is_auto_generated', 1)
-            ))
-        
-        conn.commit()
-        conn.close()
-        
-        return jsonify({'success': True, 'saved_count': len(schedule)})
+        return jsonify({
+            'success': True,
+            'saved_count': saved_count,
+            'skipped_count': len(ids) - saved_count,
+            'ids': ids
+        })
         
     except Exception as e:
         print(f"Error saving schedule: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/add_schedule_item', methods=['POST'])
+@bp.route('/api/add_schedule_item', methods=['POST'])
 @login_required
 def api_add_schedule_item():
     """Add a single manual schedule item"""
@@ -1714,7 +1783,6 @@ def api_add_schedule_item():
         ))
         
         conn.commit()
-        conn.close()
         
         return jsonify({'success': True})
         
@@ -1722,33 +1790,66 @@ def api_add_schedule_item():
         print(f"Error adding schedule item: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/get_schedule')
+@bp.route('/api/get_schedule')
 @login_required
 def api_get_schedule():
-    """Get all schedules for current user"""
+    """Get schedules for current user.
+    
+    Optional query parameters: from, to (YYYY-MM-DD), status, subject,
+    fields (comma-separated columns), limit and after (cursor from next_cursor).
+    Responses carry an ETag derived from the user's schedule version, so an
+    unchanged calendar revalidates with a 304.
+    """
     try:
         user_id = session.get('user_id')
+        args = request.args
         
         conn = get_db_connection()
-        schedules = conn.execute('''
-            SELECT * FROM schedules 
-            WHERE user_id = ? 
-            ORDER BY scheduled_date, start_time
-        ''', (user_id,)).fetchall()
-        conn.close()
+        version = schedule_store.schedule_version(conn, user_id)
+        params_digest = hashlib.sha1(repr(sorted(args.items(multi=True))).encode()).hexdigest()[:12]
+        etag = f"{user_id}-{version}-{params_digest}"
         
-        schedule_list = [dict(row) for row in schedules]
+        if etag in request.if_none_match:
+            response = Response(status=304)
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
         
-        return jsonify({
+        limit = args.get('limit')
+        if limit is not None and (not limit.isdigit() or int(limit) < 1):
+            return jsonify({'error': 'limit must be a positive integer'}), 400
+        
+        try:
+            limit = min(int(limit), schedule_store.MAX_PAGE_SIZE) if limit else None
+            fields = [f.strip() for f in args['fields'].split(',') if f.strip()] if args.get('fields') else None
+            schedule_list, next_cursor = schedule_store.query_schedule(
+                conn, user_id,
+                date_from=args.get('from'),
+                date_to=args.get('to'),
+                status=args.get('status'),
+                subject=args.get('subject'),
+                fields=fields,
+                limit=limit,
+                after=args.get('after')
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        response = jsonify({
             'success': True,
-            'schedule': schedule_list
+            'schedule': schedule_list,
+            'next_cursor': next_cursor,
+            'version': version
         })
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
         
     except Exception as e:
         print(f"Error getting schedule: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/complete_schedule/<int:schedule_id>', methods=['POST'])
+@bp.route('/api/complete_schedule/<int:schedule_id>', methods=['POST'])
 @login_required
 def api_complete_schedule(schedule_id):
     """Mark a schedule item as completed"""
@@ -1756,26 +1857,33 @@ def api_complete_schedule(schedule_id):
         user_id = session.get('user_id')
         
         conn = get_db_connection()
-        conn.execute('''
-            UPDATE schedules 
-            SET status = 'completed', 
-                completion_percentage = 100,
-                completed_at = ?
-            WHERE id = ? AND user_id = ?
-        ''', (datetime.now(), schedule_id, user_id))
-        conn.commit()
-        conn.close()
+        with conn:
+            # The status check is part of the UPDATE, so of two concurrent completions
+            # only one changes the row and counts towards the day's study time
+            completed = conn.execute('''
+                UPDATE schedules 
+                SET status = 'completed', 
+                    completion_percentage = 100,
+                    completed_at = ?
+                WHERE id = ? AND user_id = ? AND IFNULL(status, '') != 'completed'
+            ''', (datetime.now(), schedule_id, user_id)).rowcount
+            
+            new_achievements = []
+            if completed:
+                hours = conn.execute('SELECT estimated_hours FROM schedules WHERE id = ?', (schedule_id,)).fetchone()[0]
+                activity.record_activity(conn, user_id, minutes=(hours or 0) * 60)
+                new_achievements = achievements.evaluate(conn, user_id, at=datetime.now())
         
-        # Update streak
-        update_streak(user_id)
+        # Update streak; streak badges go in the same popup
+        update_streak(user_id, unlocks=new_achievements)
         
-        return jsonify({'success': True})
+        return jsonify({'success': True, 'new_achievements': new_achievements})
         
     except Exception as e:
         print(f"Error completing schedule: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/delete_schedule/<int:schedule_id>', methods=['DELETE'])
+@bp.route('/api/delete_schedule/<int:schedule_id>', methods=['DELETE'])
 @login_required
 def api_delete_schedule(schedule_id):
     """Delete a schedule item"""
@@ -1786,7 +1894,6 @@ def api_delete_schedule(schedule_id):
         conn.execute('DELETE FROM schedules WHERE id = ? AND user_id = ?', 
                     (schedule_id, user_id))
         conn.commit()
-        conn.close()
         
         return jsonify({'success': True})
         
@@ -1794,78 +1901,33 @@ def api_delete_schedule(schedule_id):
         print(f"Error deleting schedule: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/export_schedule')
+@bp.route('/api/export_schedule')
 @login_required
 def api_export_schedule():
-    """Export schedule as text file"""
+    """Export schedule as a streamed download (?format=txt, csv or ics)"""
     try:
         user_id = session.get('user_id')
+        export_format = request.args.get('format', 'txt').lower()
         
-        conn = get_db_connection()
-        schedules = conn.execute('''
-            SELECT * FROM schedules 
-            WHERE user_id = ? 
-            ORDER BY scheduled_date, start_time
-        ''', (user_id,)).fetchall()
-        conn.close()
-        
-        # Create text export
-        export_text = "MY AI-GENERATED STUDY SCHEDULE\n"
-        export_text += "=" * 60 + "\n\n"
-        
-        # Group by date
-        from collections import defaultdict
-        by_date = defaultdict(list)
-        
-        for schedule in schedules:
-            by_date[schedule['scheduled_date']].append(schedule)
-        
-        for date in sorted(by_date.keys()):
-            date_obj = datetime.strptime(date, '%Y-%m-%d')
-            formatted_date = date_obj.strftime('%A, %B %d, %Y')
-            
-            export_text += f"\n{formatted_date}\n"
-            export_text += "-" * 60 + "\n"
-            
-            for schedule in by_date[date]:
-                status_icon = "✓" if schedule['status'] == 'completed' else "○"
-                export_text += f"{status_icon} {schedule['start_time']} - {schedule['end_time']}: "
-                export_text += f"{schedule['topic_name']} ({schedule['difficulty'].upper()})\n"
-                
-                if schedule['unit_name']:
-                    export_text += f"   Unit: {schedule['unit_name']}\n"
-                
-                if schedule['notes']:
-                    export_text += f"   Notes: {schedule['notes']}\n"
-                
-                export_text += f"   Estimated Time: {schedule['estimated_hours']} hours\n"
-                export_text += "\n"
-        
-        # Add statistics
-        total = len(schedules)
-        completed = sum(1 for s in schedules if s['status'] == 'completed')
-        total_hours = sum(s['estimated_hours'] for s in schedules)
+        if export_format not in schedule_export.EXPORTERS:
+            return jsonify({'error': f'Unsupported format: {export_format}'}), 400
         
-        export_text += "\n" + "=" * 60 + "\n"
-        export_text += "STATISTICS\n"
-        export_text += "=" * 60 + "\n"
-        export_text += f"Total Topics: {total}\n"
-        export_text += f"Completed: {completed}\n"
-        export_text += f"Remaining: {total - completed}\n"
-        export_text += f"Total Study Hours: {total_hours}\n"
-        export_text += f"Progress: {round((completed/total)*100, 1) if total > 0 else 0}%\n"
+        mimetype, filename = schedule_export.EXPORT_FORMATS[export_format]
+        rows = schedule_store.iter_schedule(get_db_connection(), user_id)
         
+        # stream_with_context keeps the request (and its pooled connection) alive
+        # while the generator walks the cursor
         return Response(
-            export_text,
-            mimetype="text/plain",
-            headers={"Content-disposition": "attachment; filename=study_schedule.txt"}
+            stream_with_context(schedule_export.EXPORTERS[export_format](rows)),
+            mimetype=mimetype,
+            headers={"Content-disposition": f"attachment; filename={filename}"}
         )
         
     except Exception as e:
         print(f"Error exporting schedule: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/download_summary', methods=['POST'])
+@bp.route('/api/download_summary', methods=['POST'])
 @login_required
 def api_download_summary():
     """Download summary as text file"""
@@ -1931,7 +1993,7 @@ def api_download_summary():
         print(f"Error downloading summary: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/get_streak')
+@bp.route('/api/get_streak')
 @login_required
 def api_get_streak():
     """Get current user streak"""
@@ -1947,7 +2009,40 @@ def api_get_streak():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/get_quiz_history/<int:history_id>')
+@bp.route('/api/activity_heatmap')
+@login_required
+def api_activity_heatmap():
+    """Per-day activity for the last ?days= days (default 365)"""
+    try:
+        user_id = session.get('user_id')
+        days = request.args.get('days', str(activity.HEATMAP_DAYS))
+        if not days.isdigit() or not 1 <= int(days) <= activity.HEATMAP_DAYS:
+            return jsonify({'error': f'days must be between 1 and {activity.HEATMAP_DAYS}'}), 400
+        
+        return jsonify({
+            'success': True,
+            'days': activity.activity_days(get_db_connection(), user_id, int(days))
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/topic_accuracy')
+@login_required
+def api_topic_accuracy():
+    """Answered / correct counts per topic from quiz_answers"""
+    try:
+        user_id = session.get('user_id')
+        
+        return jsonify({
+            'success': True,
+            'topics': quiz_answers.topic_accuracy(get_db_connection(), user_id)
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/get_quiz_history/<int:history_id>')
 @login_required
 def api_get_quiz_history(history_id):
     """Get detailed quiz history including questions and answers"""
@@ -1959,7 +2054,6 @@ def api_get_quiz_history(history_id):
             SELECT * FROM study_history 
             WHERE id = ? AND user_id = ?
         ''', (history_id, user_id)).fetchone()
-        conn.close()
         
         if not history:
             return jsonify({'error': 'Quiz history not found'}), 404
@@ -1967,7 +2061,7 @@ def api_get_quiz_history(history_id):
         quiz_data = None
         if history['quiz_data']:
             try:
-                quiz_data = json.loads(history['quiz_data'])
+                quiz_data = codec.decode(history['quiz_data'])
             except:
                 quiz_data = None
         
@@ -1983,6 +2077,37 @@ def api_get_quiz_history(history_id):
     except Exception as e:
         print(f"Error getting quiz history: {e}")
         return jsonify({'error': str(e)}), 500
+
+# ==========================================
+# METRICS
+# ==========================================
+@bp.route('/api/metrics')
+@login_required
+def api_metrics():
+    """Runtime counters for background maintenance, backups and in-process caches"""
+    with maintenance.stats_lock:
+        maintenance_stats = dict(maintenance.stats)
+    with backup.stats_lock:
+        backup_stats = dict(backup.stats)
+    with http_session.stats_lock:
+        http_stats = dict(http_session.stats, hosts=dict(http_session.stats['hosts']))
+    
+    return jsonify({
+        'success': True,
+        'maintenance': maintenance_stats,
+        'backup': backup_stats,
+        'http': http_stats,
+        'content_cache': _multi_learner.cache.stats() if _multi_learner else None,
+        'rate_limit': _multi_learner.limiter.stats() if _multi_learner else None,
+        'source_health': _multi_learner.health.stats() if _multi_learner else None,
+        'wiki_titles': wiki_titles.resolver.stats(),
+        'quiz_session_cache': quiz_sessions.session_cache.stats(),
+        'streak_cache': streaks.streak_cache.stats()
+    })
+
+# Unconfigured app for imports, tests and `flask --app app <command>`
+app = build_app()
+
 # ==========================================
 # RUN APP
 # ==========================================
@@ -1994,4 +2119,4 @@ if __name__ == '__main__':
     print("🌍 Sources: Wikipedia, Simple Wiki, DuckDuckGo")
     print("📅 Features: Scheduler, Achievements, Progressive Learning")
     print("="*60 + "\n")
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    create_app().run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Online backups of studypal.db
+
+Copies the live database with sqlite3's backup API a few pages at a time,
+sleeping between steps, while the app keeps serving requests. The source
+connection holds a read transaction for the whole copy: under WAL that pins one
+consistent snapshot without blocking writers, and it stops SQLite from
+restarting the backup every time another connection commits (which otherwise
+never finishes on a busy database).
+
+Each copy is written to a .partial file, checked with PRAGMA integrity_check and
+only then renamed into place; the newest KEEP_BACKUPS files are retained.
+create_app starts BackupThread only in the worker that wins
+maintenance.claim_background(), so several workers still take one backup per
+interval.
+
+Usage: python backup.py [db_path] [backup_dir]
+"""
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+import database
+
+BACKUP_DIR = os.environ.get('STUDYPAL_BACKUP_DIR', 'backups')
+PAGES_PER_STEP = 256         # pages copied per backup step
+STEP_SLEEP_SECONDS = 0.01    # pause between steps so the copy never hogs I/O
+KEEP_BACKUPS = 7
+INTERVAL_SECONDS = 24 * 60 * 60
+
+PREFIX = 'studypal-'
+SUFFIX = '.db'
+
+# Running totals since process start
+stats = {
+    'backups': 0,
+    'failures': 0,
+    'last_backup': None,
+    'last_path': None,
+    'last_seconds': None,
+    'last_pages': None,
+    'last_error': None,
+}
+stats_lock = threading.Lock()
+
+
+def verify(path):
+    """Return True if the file at path passes PRAGMA integrity_check"""
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute('PRAGMA integrity_check').fetchone()[0] == 'ok'
+    finally:
+        conn.close()
+
+
+def list_backups(backup_dir=BACKUP_DIR):
+    """Completed backups, newest first"""
+    if not os.path.isdir(backup_dir):
+        return []
+    names = [name for name in os.listdir(backup_dir) if name.startswith(PREFIX) and name.endswith(SUFFIX)]
+    return [os.path.join(backup_dir, name) for name in sorted(names, reverse=True)]
+
+
+def prune(backup_dir=BACKUP_DIR, keep=KEEP_BACKUPS):
+    """Delete all but the newest `keep` backups; returns the removed paths"""
+    removed = list_backups(backup_dir)[keep:]
+    for path in removed:
+        os.remove(path)
+    return removed
+
+
+def backup(db_path=None, backup_dir=BACKUP_DIR, pages=PAGES_PER_STEP, sleep=STEP_SLEEP_SECONDS, keep=KEEP_BACKUPS):
+    """Write a verified copy of the database into backup_dir; returns its path"""
+    os.makedirs(backup_dir, exist_ok=True)
+    name = f"{PREFIX}{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}{SUFFIX}"
+    path = os.path.join(backup_dir, name)
+    partial = path + '.partial'
+
+    started = time.time()
+    steps = {'pages': 0}
+
+    def progress(status, remaining, total):
+        steps['pages'] = total
+        time.sleep(sleep)
+
+    source = database.connect(db_path)
+    target = sqlite3.connect(partial)
+    try:
+        source.execute('BEGIN')
+        source.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()  # start the read snapshot
+        source.backup(target, pages=pages, progress=progress)
+        source.rollback()
+        target.close()
+
+        if not verify(partial):
+            raise sqlite3.DatabaseError(f'Backup failed integrity check: {partial}')
+        os.replace(partial, path)
+    except Exception as e:
+        target.close()
+        if os.path.exists(partial):
+            os.remove(partial)
+        with stats_lock:
+            stats['failures'] += 1
+            stats['last_error'] = str(e)
+        raise
+    finally:
+        source.close()
+
+    elapsed = time.time() - started
+    with stats_lock:
+        stats['backups'] += 1
+        stats['last_backup'] = time.time()
+        stats['last_path'] = path
+        stats['last_seconds'] = round(elapsed, 3)
+        stats['last_pages'] = steps['pages']
+
+    if keep:
+        prune(backup_dir, keep)
+    return path
+
+
+class BackupThread(threading.Thread):
+    """Daemon thread taking a backup every `interval` seconds"""
+
+    def __init__(self, db_path=None, backup_dir=BACKUP_DIR, interval=INTERVAL_SECONDS):
+        super().__init__(name='studypal-backup', daemon=True)
+        self.db_path = db_path
+        self.backup_dir = backup_dir
+        self.interval = interval
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                path = backup(self.db_path, self.backup_dir)
+                print(f"💾 Backup written: {path}")
+            except Exception as e:
+                print(f"⚠️ Backup error: {e}")
+
+    def stop(self):
+        self.stop_event.set()
+
+
+def start(db_path=None, backup_dir=BACKUP_DIR, interval=INTERVAL_SECONDS):
+    thread = BackupThread(db_path, backup_dir, interval)
+    thread.start()
+    return thread
+
+
+if __name__ == '__main__':
+    db_path = sys.argv[1] if len(sys.argv) > 1 else database.DATABASE
+    backup_dir = sys.argv[2] if len(sys.argv) > 2 else BACKUP_DIR
+
+    print(f"💾 Backing up {db_path} to {backup_dir}...")
+    path = backup(db_path, backup_dir)
+    print(f"✅ {path} ({stats['last_pages']} pages, {stats['last_seconds']}s, integrity ok)")
+    print(f"✅ Keeping {len(list_backups(backup_dir))} backups")
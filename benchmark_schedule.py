@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark: saving a 10k-item schedule row by row vs. schedule_store.insert_bulk
+Run: python benchmark_schedule.py [items]
+
+Each variant runs REPEATS times on a fresh database; the best time is reported.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import database
+import migrations
+import schedule_store
+
+REPEATS = 3
+
+def make_items(count):
+    start = date(2026, 1, 1)
+    return [{
+        'subject': 'Computer Science',
+        'unit_name': f'Unit {i // 50 + 1}',
+        'topic_name': f'Topic {i}',
+        'difficulty': ['easy', 'medium', 'hard'][i % 3],
+        'estimated_hours': 2 + i % 3,
+        'scheduled_date': (start + timedelta(days=i // 3)).isoformat(),
+        'start_time': '09:00',
+        'end_time': '11:00',
+        'is_auto_generated': 1
+    } for i in range(count)]
+
+def fresh_conn():
+    conn = database.connect(os.path.join(tempfile.mkdtemp(), 'bench.db'))
+    migrations.migrate(conn)
+    return conn
+
+def row_by_row(conn, items):
+    """The old api_save_bulk_schedule loop, plus the /api/get_schedule
+    round trip the client needed afterwards to learn the new ids"""
+    for item in items:
+        conn.execute(f'''
+            INSERT INTO schedules ({', '.join(schedule_store.INSERT_COLUMNS)})
+            VALUES ({', '.join('?' * len(schedule_store.INSERT_COLUMNS))})
+        ''', schedule_store.schedule_row(1, item))
+    conn.commit()
+    [dict(row) for row in conn.execute(
+        'SELECT * FROM schedules WHERE user_id = ? ORDER BY scheduled_date, start_time', (1,))]
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    items = make_items(count)
+    
+    print(f"📊 Saving {count} schedule items")
+    print("="*60)
+    
+    results = {}
+    for name, run in [
+        ('row by row + re-fetch', lambda conn: row_by_row(conn, items)),
+        ('insert_bulk', lambda conn: schedule_store.insert_bulk(conn, 1, items)),
+        ('insert_bulk + dedupe', lambda conn: schedule_store.insert_bulk(conn, 1, items, dedupe=True)),
+    ]:
+        timings = []
+        for _ in range(REPEATS):
+            conn = fresh_conn()
+            started = time.perf_counter()
+            run(conn)
+            timings.append(time.perf_counter() - started)
+            assert conn.execute('SELECT COUNT(*) FROM schedules').fetchone()[0] == count
+            conn.close()
+        results[name] = min(timings)
+        print(f"  {name:<22} {results[name] * 1000:8.1f} ms")
+    
+    print("="*60)
+    print(f"  Speedup: {results['row by row + re-fetch'] / results['insert_bulk']:.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Compact binary encoding for quiz_data blobs
+
+Values are stored as BLOBs whose first byte names the format:
+
+    0x00  UTF-8 JSON (used when compression would not save space)
+    0x01  zlib-compressed UTF-8 JSON
+
+Rows written before this module existed hold plain JSON TEXT; decode() reads
+those unchanged. New formats are added to FORMATS under a new version byte and
+old bytes keep decoding, so rows never need rewriting when the default changes.
+"""
+import json
+import zlib
+
+RAW_JSON = 0
+ZLIB_JSON = 1
+
+ZLIB_LEVEL = 6
+
+
+def dumps(value):
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+# version byte -> (encode, decode) over the JSON bytes
+FORMATS = {
+    RAW_JSON: (lambda data: data, lambda data: data),
+    ZLIB_JSON: (lambda data: zlib.compress(data, ZLIB_LEVEL), zlib.decompress),
+}
+
+
+def encode(value, version=ZLIB_JSON):
+    """Serialize value; falls back to RAW_JSON when compression does not help"""
+    data = dumps(value)
+    payload = FORMATS[version][0](data)
+    if version != RAW_JSON and len(payload) >= len(data):
+        version, payload = RAW_JSON, data
+    return bytes([version]) + payload
+
+
+def decode(stored):
+    """Inverse of encode(); also accepts legacy JSON text"""
+    if stored is None:
+        return None
+    if isinstance(stored, str):
+        return json.loads(stored)
+    stored = bytes(stored)
+    if not stored:
+        raise ValueError('Empty quiz_data blob')
+    if stored[0] not in FORMATS:
+        # JSON text that was bound as bytes ('{' / '[' are never version bytes)
+        return json.loads(stored.decode('utf-8'))
+    try:
+        return json.loads(FORMATS[stored[0]][1](stored[1:]).decode('utf-8'))
+    except zlib.error as e:
+        raise ValueError(f'Corrupt quiz_data blob: {e}') from e
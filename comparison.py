@@ -0,0 +1,109 @@
+"""
+Comparison content for "A vs B vs C" queries
+
+MultiSourceLearner fetches every side concurrently and counts each side's terms
+as it arrives (term_counts). compare_terms then puts all the counts into one
+sides x vocabulary matrix and finds shared and distinct terms with column-wise
+boolean reductions instead of pairwise set loops. build_comparison assembles
+the text from parts in query order.
+
+numpy is imported on first use so app start-up stays light.
+"""
+import re
+from collections import Counter
+
+MAX_ITEMS = 6                # sides fetched for one query
+TOTAL_CHARS = 4000           # article text budget shared by all sides
+MIN_SIDE_CHARS = 1000
+TOP_TERMS = 8
+
+SPLIT_PATTERN = re.compile(r'\s+(?:vs\.?|versus)\s+', re.IGNORECASE)
+WORD_PATTERN = re.compile(r"[a-z][a-z\-]{2,}")
+STOPWORDS = frozenset('''
+    a about above after again against all also although among an and another any are around as at be
+    became because become been before being below between both but by can could did do does during each
+    either etc even every first for from further had has have having he her here hers him his how however
+    into its itself just known later least less like made main many may more most much must near neither
+    new nor not now often one only onto other others our out over own part per rather same several she
+    should since some such than that the their them themselves then there these they this those though
+    through thus too two under until upon use used uses using very was way well were what when where
+    whether which while who whom whose why will with within without would yet you your
+'''.split())
+
+
+def is_comparison(query):
+    return len(split_topics(query)) >= 2
+
+
+def split_topics(query):
+    """Sides of an "A vs B vs C" query, deduplicated ignoring case (first spelling kept) and capped at MAX_ITEMS"""
+    unique = {}
+    for part in SPLIT_PATTERN.split(query.strip()):
+        topic = ' '.join(part.split())
+        if topic:
+            unique.setdefault(topic.casefold(), topic)
+    return list(unique.values())[:MAX_ITEMS]
+
+
+def term_counts(text, topic=''):
+    """Counter of content words in text, ignoring stopwords and the topic's own words"""
+    own = set(WORD_PATTERN.findall(topic.lower()))
+    return Counter(word for word in WORD_PATTERN.findall(text.lower())
+                   if word not in STOPWORDS and word not in own)
+
+
+def compare_terms(counts, top=TOP_TERMS):
+    """
+    (shared, distinct) for a list of per-side Counters.
+    shared: terms found on every side, ranked by their lowest count on any side.
+    distinct[i]: terms found only on side i, ranked by count.
+    """
+    import numpy as np
+
+    vocab = sorted(set().union(*counts))
+    if not vocab:
+        return [], [[] for _ in counts]
+    column = {term: j for j, term in enumerate(vocab)}
+    matrix = np.zeros((len(counts), len(vocab)), dtype=np.int32)
+    for i, side in enumerate(counts):
+        matrix[i, [column[term] for term in side]] = list(side.values())
+
+    present = matrix > 0
+    on_every_side = present.all(axis=0)
+    on_one_side = present.sum(axis=0) == 1
+    vocab = np.array(vocab)
+
+    def ranked(mask, weights):
+        indices = np.flatnonzero(mask)
+        order = np.argsort(-weights[indices], kind='stable')[:top]
+        return vocab[indices[order]].tolist()
+
+    shared = ranked(on_every_side, matrix.min(axis=0))
+    distinct = [ranked(present[i] & on_one_side, matrix[i]) for i in range(len(counts))]
+    return shared, distinct
+
+
+def _join(items):
+    return items[0] if len(items) == 1 else f"{', '.join(items[:-1])} and {items[-1]}"
+
+
+def build_comparison(topics, texts, counts):
+    """Comparison text for the fetched sides (topics, texts and counts aligned)"""
+    shared, distinct = compare_terms(counts)
+    side_chars = max(MIN_SIDE_CHARS, TOTAL_CHARS // len(topics))
+
+    parts = [f"COMPARISON: {' vs '.join(topics)}\n\n"]
+    for topic, text in zip(topics, texts):
+        parts.append(f"=== {topic.upper()} ===\n{text[:side_chars]}\n\n")
+
+    parts.append("KEY SIMILARITIES:\n")
+    if shared:
+        parts.append(f"{_join(topics)} {'both' if len(topics) == 2 else 'all'} involve {_join(shared)}.\n\n")
+    else:
+        parts.append(f"{_join(topics)} share few key terms and cover largely separate ground.\n\n")
+
+    parts.append("KEY DIFFERENCES:\n")
+    for topic, terms in zip(topics, distinct):
+        if terms:
+            parts.append(f"{topic} is distinguished by {_join(terms)}. ")
+    return ''.join(parts).strip()
@@ -0,0 +1,123 @@
+"""
+Persistent cache of text fetched by MultiSourceLearner (content_cache table)
+
+Entries are keyed by (normalized query, source name) and shared by every worker
+through studypal.db. Text is kept for TTL_SECONDS; when the stored payloads
+exceed MAX_BYTES, expired and then least recently used entries are evicted.
+Triggers keep the payload total in content_cache_size, so a write only scans
+for victims when the cache is actually over budget. Only fetches that found
+content are stored; misses and errors are fetched again next time.
+
+The cache uses its own autocommit connection (database.side_pool), never the
+request's, so it cannot commit or roll back a caller's pending work.
+"""
+import threading
+import time
+import codec
+import database
+
+TTL_SECONDS = 7 * 24 * 60 * 60
+MAX_BYTES = 64 * 1024 * 1024
+TOUCH_SECONDS = 60           # last_used is only rewritten when older than this
+
+
+def normalize_query(query):
+    return ' '.join(str(query).lower().split())
+
+
+class ContentCache:
+    """Read-through cache over content_cache on a per-thread autocommit connection"""
+
+    def __init__(self, db_path=None, ttl=TTL_SECONDS, max_bytes=MAX_BYTES):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _conn(self):
+        return database.side_pool.acquire(self.db_path)
+
+    def _count(self, **deltas):
+        with self._lock:
+            for key, value in deltas.items():
+                setattr(self, key, getattr(self, key) + value)
+
+    def get(self, query, source):
+        """Return (text, label) for a fresh entry, or None"""
+        conn = self._conn()
+        now = time.time()
+        row = conn.execute('''
+            SELECT payload, fetched_at, last_used FROM content_cache
+            WHERE query_key = ? AND source = ?
+        ''', (normalize_query(query), source)).fetchone()
+
+        if row is None or row['fetched_at'] + self.ttl < now:
+            self._count(misses=1)
+            return None
+
+        if row['last_used'] + TOUCH_SECONDS < now:
+            conn.execute('UPDATE content_cache SET last_used = ? WHERE query_key = ? AND source = ?',
+                         (now, normalize_query(query), source))
+        self._count(hits=1)
+        payload = codec.decode(row['payload'])
+        return payload['text'], payload['label']
+
+    def set(self, query, source, text, label):
+        """Store fetched text and evict if over budget"""
+        conn = self._conn()
+        now = time.time()
+        payload = codec.encode({'text': text, 'label': label})
+        conn.execute('''
+            INSERT INTO content_cache (query_key, source, payload, size, fetched_at, last_used)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(query_key, source) DO UPDATE SET
+                payload = excluded.payload,
+                size = excluded.size,
+                fetched_at = excluded.fetched_at,
+                last_used = excluded.last_used
+        ''', (normalize_query(query), source, payload, len(payload), now, now))
+        if self.total_bytes(conn) > self.max_bytes:
+            self.evict(conn)
+
+    def total_bytes(self, conn=None):
+        """Payload bytes currently stored, as maintained by the size triggers"""
+        row = (conn or self._conn()).execute('SELECT bytes FROM content_cache_size WHERE id = 0').fetchone()
+        return row[0] if row else 0
+
+    def evict(self, conn=None):
+        """Drop expired entries, then least recently used ones beyond max_bytes"""
+        conn = conn or self._conn()
+        now = time.time()
+        expired = conn.execute('DELETE FROM content_cache WHERE fetched_at < ?', (now - self.ttl,)).rowcount
+        evicted = 0
+        if self.total_bytes(conn) > self.max_bytes:
+            evicted = conn.execute('''
+                DELETE FROM content_cache WHERE rowid IN (
+                    SELECT rowid FROM (
+                        SELECT rowid, SUM(size) OVER (ORDER BY last_used DESC, rowid DESC) AS running
+                        FROM content_cache
+                    ) WHERE running > ?
+                )
+            ''', (self.max_bytes,)).rowcount
+        self._count(evictions=expired + evicted)
+        return expired + evicted
+
+    def clear(self):
+        self._conn().execute('DELETE FROM content_cache')
+
+    def stats(self):
+        stored = self.total_bytes()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'ttl': self.ttl,
+                'max_bytes': self.max_bytes,
+                'bytes': stored
+            }
@@ -0,0 +1,89 @@
+"""
+Database connection layer for StudyVerse
+Pooled, WAL-mode SQLite connections shared by app.py and the maintenance scripts
+"""
+import os
+import sqlite3
+import threading
+
+DATABASE = os.environ.get('STUDYPAL_DB', 'studypal.db')
+
+# Applied to every new connection. auto_vacuum only takes effect on a database
+# with no tables yet (migration 15 switches older files) and journal_mode=WAL is
+# persistent in the file; the rest are per-connection settings.
+PRAGMAS = [
+    ('auto_vacuum', 'INCREMENTAL'),
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('busy_timeout', 5000),           # ms to wait on a locked database
+    ('cache_size', -16000),           # negative = KiB, i.e. ~16 MB page cache
+    ('mmap_size', 64 * 1024 * 1024),  # 64 MB memory-mapped I/O
+    ('temp_store', 'MEMORY'),
+]
+
+
+def connect(db_path=None, autocommit=False):
+    """Open a new tuned connection (rows behave like dicts).
+
+    With autocommit every statement commits on its own unless the caller
+    issues an explicit BEGIN.
+    """
+    conn = sqlite3.connect(db_path or DATABASE, timeout=5)
+    conn.row_factory = sqlite3.Row
+    if autocommit:
+        conn.isolation_level = None
+    for name, value in PRAGMAS:
+        conn.execute(f'PRAGMA {name} = {value}')
+    return conn
+
+
+class ConnectionPool:
+    """Keeps one open connection per thread and database path.
+
+    sqlite3 connections must stay on the thread that created them, so the pool
+    is a thread-local cache rather than a shared queue. A connection is opened
+    the first time a thread asks for it and reused for every later request
+    served by that thread.
+    """
+
+    def __init__(self, autocommit=False):
+        self.autocommit = autocommit
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.opened = 0
+
+    def _connections(self):
+        conns = getattr(self._local, 'conns', None)
+        if conns is None:
+            conns = self._local.conns = {}
+        return conns
+
+    def acquire(self, db_path=None):
+        """Return this thread's connection for db_path, opening it if needed"""
+        db_path = db_path or DATABASE
+        conns = self._connections()
+        conn = conns.get(db_path)
+        if conn is None:
+            conn = conns[db_path] = connect(db_path, self.autocommit)
+            with self._lock:
+                self.opened += 1
+        return conn
+
+    def release(self, conn):
+        """Hand a connection back; any transaction left open is rolled back"""
+        if conn.in_transaction:
+            conn.rollback()
+
+    def close_all(self):
+        """Close the connections owned by the calling thread"""
+        conns = self._connections()
+        for conn in conns.values():
+            conn.close()
+        conns.clear()
+
+
+pool = ConnectionPool()
+
+# Autocommit connections for side tables (content cache, rate limits) that must
+# never commit, roll back or lock on behalf of a request's transaction in `pool`
+side_pool = ConnectionPool(autocommit=True)
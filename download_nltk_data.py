@@ -1,27 +1,60 @@
 """
 One-time NLTK data download script
-Run this once before starting the app
+Run this once before starting the app (or: flask --app app fetch-nltk)
 """
-import nltk
-
-print("📦 Downloading all required NLTK data...")
-print("This may take a minute...\n")
-
-datasets = [
-    'punkt',
-    'punkt_tab', 
-    'stopwords',
-    'averaged_perceptron_tagger',
-    'averaged_perceptron_tagger_eng'
-]
-
-for dataset in datasets:
-    try:
-        print(f"Downloading {dataset}...", end=' ')
-        nltk.download(dataset, quiet=True)
-        print("✓")
-    except Exception as e:
-        print(f"❌ Error: {e}")
-
-print("\n✅ NLTK setup complete!")
-print("You can now run: python app.py")
\ No newline at end of file
+import os
+import sys
+
+# dataset -> resource path checked by nltk.data.find
+DATASETS = {
+    'punkt': 'tokenizers/punkt',
+    'punkt_tab': 'tokenizers/punkt_tab',
+    'stopwords': 'corpora/stopwords',
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger',
+    'averaged_perceptron_tagger_eng': 'taggers/averaged_perceptron_tagger_eng',
+}
+
+
+def data_paths():
+    """The directories nltk.data searches by default, without importing nltk"""
+    paths = [path for path in os.environ.get('NLTK_DATA', '').split(os.pathsep) if path]
+    paths.append(os.path.expanduser('~/nltk_data'))
+    for prefix in (sys.prefix, getattr(sys, 'base_prefix', sys.prefix)):
+        paths += [os.path.join(prefix, 'nltk_data'), os.path.join(prefix, 'share', 'nltk_data'),
+                  os.path.join(prefix, 'lib', 'nltk_data')]
+    paths += ['/usr/share/nltk_data', '/usr/local/share/nltk_data', '/usr/lib/nltk_data', '/usr/local/lib/nltk_data']
+    return paths
+
+
+def missing_datasets(paths=None):
+    """Datasets not found in any local nltk_data directory (filesystem only, no network)"""
+    paths = data_paths() if paths is None else paths
+    return [dataset for dataset, resource in DATASETS.items()
+            if not any(os.path.exists(os.path.join(path, resource)) or
+                       os.path.exists(os.path.join(path, resource + '.zip')) for path in paths)]
+
+
+def download(datasets=None):
+    """Download datasets (default: all); returns the ones that failed"""
+    import nltk
+    failed = []
+    for dataset in datasets or DATASETS:
+        try:
+            print(f"Downloading {dataset}...", end=' ')
+            if not nltk.download(dataset, quiet=True):
+                raise RuntimeError('download failed')
+            print("✓")
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            failed.append(dataset)
+    return failed
+
+
+if __name__ == '__main__':
+    print("📦 Downloading all required NLTK data...")
+    print("This may take a minute...\n")
+
+    download()
+
+    print("\n✅ NLTK setup complete!")
+    print("You can now run: python app.py")
@@ -0,0 +1,286 @@
+"""
+Process-wide HTTP clients for the content fetchers
+
+Every fetcher goes through one requests.Session, so connections are kept alive
+and reused across searches instead of paying a TCP and TLS handshake per call.
+Responses are requested gzip-compressed. Idempotent GETs are retried on
+connection errors and 429/5xx, using exponential backoff with jitter and
+honouring Retry-After. At most PER_HOST_CONNECTIONS requests run against a host
+at once; a request finding them all busy waits for one until its deadline (or
+the connect timeout when it has none), then fails with a Timeout.
+
+A fetch can be bound to a deadline, either get(deadline=...) or deadline_scope()
+around the fetching code: each attempt's timeout is clipped to the time left,
+and a retry is only made when its backoff plus a full attempt still fits.
+
+wikipediaapi manages its own client, so wikipedia() keeps one client per language
+and, where the installed version allows it, shares a single pooled transport
+between them. That transport applies the same deadline rules and does the
+retrying itself; wikipediaapi's own retries (which honour Retry-After without
+limit) are switched off.
+
+requests and wikipediaapi are imported on first use to keep app start-up light.
+"""
+import random
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from urllib.parse import urlsplit
+
+USER_AGENT = 'AI_Study_Pal_Multi/1.0'
+CONNECT_TIMEOUT_SECONDS = 3.05
+READ_TIMEOUT_SECONDS = 5
+TIMEOUT_SECONDS = (CONNECT_TIMEOUT_SECONDS, READ_TIMEOUT_SECONDS)
+PER_HOST_CONNECTIONS = 4     # sockets kept and requests allowed at once per host
+MAX_HOSTS = 16               # per-host pools kept alive
+RETRIES = 2
+BACKOFF_SECONDS = 0.3        # 0.3, 0.6, 1.2 s ... plus jitter
+BACKOFF_JITTER = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Running totals since process start
+stats = {
+    'requests': 0,
+    'errors': 0,
+    'retries': 0,
+    'hosts': {},
+}
+stats_lock = threading.Lock()
+
+_session = None
+_wikis = {}
+_wiki_transport = None
+_lock = threading.Lock()
+_call = threading.local()        # deadline of the get() running on this thread
+
+
+@contextmanager
+def deadline_scope(at):
+    """Bound every get() on this thread to the monotonic time at (None for no bound)"""
+    previous = getattr(_call, 'deadline', None)
+    _call.deadline = at
+    try:
+        yield
+    finally:
+        _call.deadline = previous
+
+
+def time_left():
+    """Seconds until this thread's deadline, or None when unbounded"""
+    at = getattr(_call, 'deadline', None)
+    return None if at is None else at - time.monotonic()
+
+
+def _retry_policy():
+    from urllib3.exceptions import MaxRetryError, ResponseError
+    from urllib3.util.retry import Retry
+
+    class DeadlineRetry(Retry):
+        """Gives up once the backoff plus another attempt would overrun the deadline"""
+
+        def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+            retry = super().increment(method, url, response=response, error=error,
+                                      _pool=_pool, _stacktrace=_stacktrace)
+            left = time_left()
+            if left is not None:
+                wait = retry.get_backoff_time() + BACKOFF_JITTER
+                if response is not None and retry.respect_retry_after_header:
+                    wait = max(wait, retry.get_retry_after(response) or 0)
+                if wait + getattr(_call, 'attempt', 0) >= left:
+                    reason = error or ResponseError('deadline reached before retry')
+                    raise MaxRetryError(_pool, url, reason) from reason
+            return retry
+
+    options = dict(total=RETRIES, connect=RETRIES, read=RETRIES, status=RETRIES,
+                   backoff_factor=BACKOFF_SECONDS, status_forcelist=RETRY_STATUSES,
+                   allowed_methods=frozenset(['GET', 'HEAD']),
+                   respect_retry_after_header=True, raise_on_status=False)
+    try:
+        return DeadlineRetry(backoff_jitter=BACKOFF_JITTER, **options)
+    except TypeError:            # urllib3 < 2 has no jitter
+        return DeadlineRetry(**options)
+
+
+def _deadline_adapter(**options):
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    class DeadlineAdapter(HTTPAdapter):
+        """Clips each request's timeout to the calling thread's deadline and caps requests per host"""
+
+        def __init__(self, **options):
+            super().__init__(**options)
+            self._hosts = {}
+            self._hosts_lock = threading.Lock()
+
+        def _slots(self, url):
+            host = urlsplit(url).netloc
+            with self._hosts_lock:
+                if host not in self._hosts:
+                    self._hosts[host] = threading.BoundedSemaphore(PER_HOST_CONNECTIONS)
+                return self._hosts[host]
+
+        def send(self, request, timeout=None, stream=False, **kwargs):
+            left = time_left()
+            if left is not None and left <= 0:
+                raise requests.Timeout(f"deadline passed before {request.method} {request.url}")
+            slots = self._slots(request.url)
+            if not slots.acquire(timeout=CONNECT_TIMEOUT_SECONDS if left is None else left):
+                raise requests.ConnectTimeout(f"no free connection for {request.method} {request.url}")
+            try:
+                left = time_left()
+                if left is not None:
+                    if left <= 0:
+                        raise requests.Timeout(f"deadline passed before {request.method} {request.url}")
+                    timeout = _clip(TIMEOUT_SECONDS if timeout is None else timeout, left)
+                _call.attempt = _attempt_seconds(timeout)
+                response = super().send(request, timeout=timeout, stream=stream, **kwargs)
+                if not stream:
+                    response.content    # hand the connection back before freeing the slot
+                return response
+            finally:
+                _call.attempt = 0
+                slots.release()
+
+    return DeadlineAdapter(**options)
+
+
+def build_session():
+    """A requests.Session with the pooling and retry policy above"""
+    import requests
+
+    session = requests.Session()
+    adapter = _deadline_adapter(pool_connections=MAX_HOSTS, pool_maxsize=PER_HOST_CONNECTIONS,
+                                pool_block=False, max_retries=_retry_policy())
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'User-Agent': USER_AGENT, 'Accept-Encoding': 'gzip, deflate'})
+    return session
+
+
+def session():
+    """The shared session, built on first use"""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def get(url, deadline=None, **kwargs):
+    """
+    session().get with the default timeout, bounded by deadline (monotonic time,
+    defaulting to the thread's deadline_scope()); counts requests, retries and errors
+    """
+    kwargs.setdefault('timeout', TIMEOUT_SECONDS)
+    host = urlsplit(url).hostname
+    with (nullcontext() if deadline is None else deadline_scope(deadline)):
+        try:
+            response = session().get(url, **kwargs)
+        except Exception:
+            _count(host, errors=1)
+            raise
+    retries = getattr(response.raw, 'retries', None)
+    _count(host, retries=len(retries.history) if retries else 0)
+    return response
+
+
+def _clip(timeout, left):
+    if isinstance(timeout, tuple):
+        return tuple(left if part is None else min(part, left) for part in timeout)
+    return min(timeout or left, left)
+
+
+def _attempt_seconds(timeout):
+    """Longest one attempt can take under timeout (connect plus read)"""
+    if isinstance(timeout, tuple):
+        return sum(part or 0 for part in timeout)
+    return timeout or 0
+
+
+def _fits(wait):
+    """True when a retry after wait seconds, plus a full attempt, ends before the deadline"""
+    left = time_left()
+    return left is None or wait + getattr(_call, 'attempt', 0) < left
+
+
+def _count(host, errors=0, retries=0):
+    with stats_lock:
+        stats['requests'] += 1
+        stats['errors'] += errors
+        stats['retries'] += retries
+        stats['hosts'][host] = stats['hosts'].get(host, 0) + 1
+
+
+def build_wiki_transport():
+    import httpx
+
+    class DeadlineTransport(httpx.HTTPTransport):
+        """Pooled transport that clips timeouts to the thread's deadline and retries within it"""
+
+        def handle_request(self, request):
+            try:
+                for attempt in range(RETRIES + 1):
+                    response, error = self._attempt(request)
+                    if error is None and response.status_code not in RETRY_STATUSES:
+                        return response
+                    wait = BACKOFF_SECONDS * 2 ** attempt + BACKOFF_JITTER * random.random()
+                    if attempt == RETRIES or not _fits(wait):
+                        break
+                    if response is not None:
+                        response.close()
+                    time.sleep(wait)
+            finally:
+                _call.attempt = 0
+            if error is not None:
+                raise error
+            return response
+
+        def _attempt(self, request):
+            timeouts = request.extensions.get('timeout') or {}
+            left = time_left()
+            if left is not None:
+                if left <= 0:
+                    return None, httpx.ConnectTimeout('deadline passed', request=request)
+                timeouts = {key: left if value is None else min(value, left) for key, value in timeouts.items()}
+                request.extensions['timeout'] = timeouts
+            _call.attempt = (timeouts.get('connect') or 0) + (timeouts.get('read') or 0)
+            try:
+                return super().handle_request(request), None
+            except httpx.TransportError as e:
+                return None, e
+
+    return DeadlineTransport(limits=httpx.Limits(max_connections=MAX_HOSTS * PER_HOST_CONNECTIONS,
+                                                 max_keepalive_connections=MAX_HOSTS))
+
+
+def _wiki_timeout():
+    import httpx
+    return httpx.Timeout(READ_TIMEOUT_SECONDS, connect=CONNECT_TIMEOUT_SECONDS)
+
+
+def wikipedia(language='en'):
+    """Shared wikipediaapi client for language"""
+    global _wiki_transport
+    wiki = _wikis.get(language)
+    if wiki is not None:
+        return wiki
+    import wikipediaapi
+    with _lock:
+        if language not in _wikis:
+            options = dict(language=language, extract_format=wikipediaapi.ExtractFormat.WIKI,
+                           user_agent=USER_AGENT)
+            if hasattr(wikipediaapi, 'SyncHTTPClient'):
+                # httpx-based releases: one keep-alive pool for every language
+                if _wiki_transport is None:
+                    _wiki_transport = build_wiki_transport()
+                wiki = wikipediaapi.Wikipedia(transport=_wiki_transport, max_retries=0,
+                                              timeout=_wiki_timeout(), **options)
+            else:
+                wiki = wikipediaapi.Wikipedia(**options)
+                if hasattr(wiki, '_session'):
+                    # requests-based releases: reuse the shared session
+                    wiki._session = session()
+            _wikis[language] = wiki
+    return _wikis[language]
@@ -0,0 +1,195 @@
+"""
+Background maintenance for studypal.db
+Expires temp_quiz_sessions in bounded batches, caps live sessions per user and
+overall, and returns freed pages to the filesystem with incremental vacuum.
+
+Existing databases are switched to auto_vacuum=INCREMENTAL once, by a schema
+migration. Background threads run in a single process per database: the first
+process to call claim_background() holds a lock file for as long as it lives.
+"""
+import threading
+import time
+import database
+
+SESSION_TTL_HOURS = 24
+MAX_SESSIONS_PER_USER = 20
+MAX_SESSIONS_TOTAL = 5000
+BATCH_SIZE = 500             # rows deleted per transaction
+VACUUM_PAGES = 1000          # pages released per incremental_vacuum call
+INTERVAL_SECONDS = 300
+
+# Running totals since process start
+stats = {
+    'runs': 0,
+    'expired_rows': 0,
+    'evicted_rows': 0,
+    'bytes_reclaimed': 0,
+    'pages_vacuumed': 0,
+    'last_run': None,
+    'last_error': None,
+}
+stats_lock = threading.Lock()
+
+# Callbacks run with the list of session ids removed by each batch
+on_sessions_deleted = []
+
+
+def record(**deltas):
+    with stats_lock:
+        for key, value in deltas.items():
+            stats[key] += value
+
+
+def delete_batches(conn, select_sql, params=()):
+    """Delete rows picked by select_sql (rowid, session_id, bytes) one batch at a time.
+
+    Each batch commits on its own so the write lock is only held briefly;
+    segment rows go with their session through a delete trigger.
+    Returns (rows, bytes) removed.
+    """
+    total_rows = 0
+    total_bytes = 0
+    while True:
+        batch = conn.execute(f'{select_sql} LIMIT {BATCH_SIZE}', params).fetchall()
+        if not batch:
+            break
+        conn.executemany('DELETE FROM temp_quiz_sessions WHERE rowid = ?', [(row[0],) for row in batch])
+        conn.commit()
+
+        session_ids = [row[1] for row in batch]
+        for callback in on_sessions_deleted:
+            callback(session_ids)
+
+        total_rows += len(batch)
+        total_bytes += sum(row[2] or 0 for row in batch)
+        if len(batch) < BATCH_SIZE:
+            break
+    return total_rows, total_bytes
+
+
+# Bytes held by a session: its header plus all of its segment rows
+SESSION_SIZE = '''(length(quiz_data) + COALESCE(
+    (SELECT SUM(length(quiz)) FROM temp_quiz_segments WHERE temp_quiz_segments.session_id = temp_quiz_sessions.session_id), 0))'''
+
+
+def reap_expired_sessions(conn, ttl_hours=SESSION_TTL_HOURS):
+    """Delete quiz sessions older than ttl_hours"""
+    rows, freed = delete_batches(conn, f'''
+        SELECT rowid, session_id, {SESSION_SIZE} FROM temp_quiz_sessions
+        WHERE created_at < datetime('now', ?)
+    ''', (f'-{ttl_hours} hours',))
+    record(expired_rows=rows, bytes_reclaimed=freed)
+    return rows, freed
+
+
+def enforce_session_caps(conn, per_user=MAX_SESSIONS_PER_USER, total=MAX_SESSIONS_TOTAL):
+    """Evict the oldest sessions beyond the per-user and global limits"""
+    user_rows, user_bytes = delete_batches(conn, f'''
+        SELECT rowid, session_id, size FROM (
+            SELECT rowid, session_id, {SESSION_SIZE} AS size,
+                   ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY created_at DESC) AS rank
+            FROM temp_quiz_sessions
+        ) WHERE rank > ?
+    ''', (per_user,))
+
+    global_rows, global_bytes = delete_batches(conn, f'''
+        SELECT rowid, session_id, {SESSION_SIZE} FROM temp_quiz_sessions
+        WHERE rowid NOT IN (
+            SELECT rowid FROM temp_quiz_sessions ORDER BY created_at DESC LIMIT ?
+        )
+    ''', (total,))
+
+    rows = user_rows + global_rows
+    freed = user_bytes + global_bytes
+    record(evicted_rows=rows, bytes_reclaimed=freed)
+    return rows, freed
+
+
+def incremental_vacuum(conn, pages=VACUUM_PAGES):
+    """Release up to `pages` free pages; returns pages released"""
+    before = conn.execute('PRAGMA freelist_count').fetchone()[0]
+    if not before:
+        return 0
+    # executescript steps the pragma to completion; execute() frees one page
+    conn.executescript(f'PRAGMA incremental_vacuum({pages});')
+    released = before - conn.execute('PRAGMA freelist_count').fetchone()[0]
+    record(pages_vacuumed=released)
+    return released
+
+
+def run_once(conn):
+    """One maintenance pass: expire, evict, vacuum"""
+    expired, expired_bytes = reap_expired_sessions(conn)
+    evicted, evicted_bytes = enforce_session_caps(conn)
+    pages = incremental_vacuum(conn)
+    with stats_lock:
+        stats['runs'] += 1
+        stats['last_run'] = time.time()
+    if expired or evicted:
+        print(f"🧹 Maintenance: expired {expired}, evicted {evicted} quiz sessions, "
+              f"{expired_bytes + evicted_bytes} bytes, {pages} pages vacuumed")
+    return {'expired': expired, 'evicted': evicted,
+            'bytes': expired_bytes + evicted_bytes, 'pages': pages}
+
+
+class MaintenanceThread(threading.Thread):
+    """Daemon thread running run_once() every `interval` seconds"""
+
+    def __init__(self, db_path=None, interval=INTERVAL_SECONDS):
+        super().__init__(name='studypal-maintenance', daemon=True)
+        self.db_path = db_path
+        self.interval = interval
+        self.stop_event = threading.Event()
+
+    def run(self):
+        conn = database.connect(self.db_path)
+        while not self.stop_event.is_set():
+            try:
+                run_once(conn)
+            except Exception as e:
+                with stats_lock:
+                    stats['last_error'] = str(e)
+                print(f"⚠️ Maintenance error: {e}")
+                if conn.in_transaction:
+                    conn.rollback()
+            self.stop_event.wait(self.interval)
+        conn.close()
+
+    def stop(self):
+        self.stop_event.set()
+
+
+# Lock files held open by this process, by path, for as long as it runs
+_background_locks = {}
+
+
+def claim_background(db_path=None):
+    """Return True if this process should run background threads for db_path.
+
+    Takes a non-blocking exclusive lock on <db_path>.background.lock and keeps
+    it until the process exits, so among several workers sharing a database
+    only the first one to ask gets True. The OS drops the lock when that
+    process dies, and a restarted worker can claim it again.
+    """
+    path = f"{db_path or database.DATABASE}.background.lock"
+    if path in _background_locks:
+        return True
+    lock_file = open(path, 'a+b')
+    try:
+        try:
+            import fcntl
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except ImportError:
+            import msvcrt
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        lock_file.close()
+        return False
+    _background_locks[path] = lock_file
+    return True
+
+
+def start(db_path=None, interval=INTERVAL_SECONDS):
+    thread = MaintenanceThread(db_path, interval)
+    thread.start()
+    return thread
@@ -0,0 +1,578 @@
+#!/usr/bin/env python3
+"""
+Versioned schema migrations for studypal.db
+Replaces the old one-off scripts (database_migration.py, database_migration_scheduler.py,
+fix_scheduler_db.py, update_database.py, fix_user_stats.py).
+
+Each step is idempotent and set-based. Pending steps run together in a single
+transaction and are recorded in the schema_version table. Steps never call
+application modules, with one exception: codec. Its blob format is versioned and
+every version stays decodable, so the quiz_data steps (11 and 12) use it to
+write and read blobs. Any other data backfill is written out here as it stood
+when the step was added, so a later change to the app cannot change an old
+migration. Backfills over user tables read in batches of BATCH_ROWS.
+"""
+import hashlib
+import json
+import sys
+import codec
+import database
+
+BATCH_ROWS = 500             # rows read per batch by data backfills
+
+
+def column_names(c, table):
+    return [col[1] for col in c.execute(f"PRAGMA table_info({table})").fetchall()]
+
+
+def add_column(c, table, column, definition):
+    if column not in column_names(c, table):
+        c.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+# ==========================================
+# MIGRATION STEPS
+# ==========================================
+def create_base_schema(c):
+    """Create all tables used by app.py"""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            full_name TEXT NOT NULL,
+            bio TEXT,
+            avatar_url TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_login TIMESTAMP
+        )
+    ''')
+
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS user_stats (
+            user_id INTEGER PRIMARY KEY,
+            streak INTEGER DEFAULT 0,
+            last_activity DATE,
+            total_quizzes INTEGER DEFAULT 0,
+            correct_answers INTEGER DEFAULT 0,
+            total_questions INTEGER DEFAULT 0,
+            total_study_time INTEGER DEFAULT 0,
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+    ''')
+
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS study_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            topic TEXT,
+            score TEXT,
+            difficulty TEXT,
+            study_duration INTEGER DEFAULT 0,
+            quiz_data TEXT,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+    ''')
+
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS user_achievements (
+            user_id INTEGER,
+            achievement_id TEXT,
+            unlocked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, achievement_id),
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+    ''')
+
+    create_schedules_table(c)
+
+    # Temporary table to store quiz sessions (avoids session cookie size limits)
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS temp_quiz_sessions (
+            session_id TEXT PRIMARY KEY,
+            user_id INTEGER,
+            quiz_data TEXT NOT NULL,
+            topic TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+    ''')
+
+
+def create_schedules_table(c):
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS schedules (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            subject TEXT NOT NULL,
+            unit_name TEXT,
+            topic_name TEXT NOT NULL,
+            difficulty TEXT DEFAULT 'medium',
+            estimated_hours INTEGER DEFAULT 2,
+            scheduled_date DATE NOT NULL,
+            start_time TEXT,
+            end_time TEXT,
+            status TEXT DEFAULT 'pending',
+            completion_percentage INTEGER DEFAULT 0,
+            notes TEXT,
+            is_auto_generated INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            completed_at TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+    ''')
+
+
+def upgrade_legacy_schedules(c):
+    """Convert the old day_of_week schedules table to dated AI-scheduler rows"""
+    columns = column_names(c, 'schedules')
+    if 'day_of_week' not in columns or 'scheduled_date' in columns:
+        return
+
+    completed = "CASE WHEN completed = 1 THEN 'completed' ELSE 'pending' END" if 'completed' in columns else "'pending'"
+
+    c.execute("ALTER TABLE schedules RENAME TO schedules_old")
+    create_schedules_table(c)
+
+    # Map day_of_week to the next occurrence counted from today
+    c.execute(f'''
+        INSERT INTO schedules
+        (user_id, subject, topic_name, scheduled_date, start_time, end_time, notes, status)
+        SELECT
+            user_id,
+            subject,
+            subject,
+            date('now', '+' ||
+                CASE day_of_week
+                    WHEN 'Monday' THEN 0
+                    WHEN 'Tuesday' THEN 1
+                    WHEN 'Wednesday' THEN 2
+                    WHEN 'Thursday' THEN 3
+                    WHEN 'Friday' THEN 4
+                    WHEN 'Saturday' THEN 5
+                    WHEN 'Sunday' THEN 6
+                    ELSE 0
+                END || ' days'),
+            start_time,
+            end_time,
+            notes,
+            {completed}
+        FROM schedules_old
+    ''')
+    c.execute("DROP TABLE schedules_old")
+
+
+def add_missing_columns(c):
+    """Columns added after the first release of each table"""
+    add_column(c, 'user_stats', 'total_questions', 'INTEGER DEFAULT 0')
+    add_column(c, 'user_stats', 'total_study_time', 'INTEGER DEFAULT 0')
+    add_column(c, 'study_history', 'study_duration', 'INTEGER DEFAULT 0')
+    add_column(c, 'study_history', 'quiz_data', 'TEXT')
+
+
+def backfill_user_stats(c):
+    """Every user gets a complete user_stats row"""
+    c.execute('''
+        INSERT INTO user_stats (user_id, streak, last_activity, total_quizzes, correct_answers, total_questions, total_study_time)
+        SELECT id, 0, NULL, 0, 0, 0, 0 FROM users
+        WHERE id NOT IN (SELECT user_id FROM user_stats)
+    ''')
+    c.execute('''
+        UPDATE user_stats
+        SET total_questions = COALESCE(total_questions, 0),
+            total_study_time = COALESCE(total_study_time, 0)
+        WHERE total_questions IS NULL OR total_study_time IS NULL
+    ''')
+
+
+def add_query_indexes(c):
+    """Composite indexes matching the app's WHERE / ORDER BY clauses"""
+    c.execute('CREATE INDEX IF NOT EXISTS idx_study_history_user_time ON study_history (user_id, timestamp)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_schedules_user_date ON schedules (user_id, scheduled_date, start_time)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_temp_quiz_sessions_created ON temp_quiz_sessions (created_at)')
+
+
+def add_session_owner_index(c):
+    """Per-user session cap in maintenance.py ranks sessions by owner and age"""
+    c.execute('CREATE INDEX IF NOT EXISTS idx_temp_quiz_sessions_user ON temp_quiz_sessions (user_id, created_at)')
+
+
+def create_quiz_segments_table(c):
+    """Per-segment quiz rows so grading reads one segment, not the whole session"""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS temp_quiz_segments (
+            session_id TEXT NOT NULL,
+            segment_index INTEGER NOT NULL,
+            quiz TEXT NOT NULL,
+            PRIMARY KEY (session_id, segment_index)
+        ) WITHOUT ROWID
+    ''')
+    c.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_temp_quiz_sessions_delete
+        AFTER DELETE ON temp_quiz_sessions
+        BEGIN
+            DELETE FROM temp_quiz_segments WHERE session_id = OLD.session_id;
+        END
+    ''')
+
+
+def create_schedule_versions(c):
+    """Per-user counter bumped on every schedules write; used for ETags"""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS schedule_versions (
+            user_id INTEGER PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    for event, row in [('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')]:
+        c.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_schedules_version_{event.lower()}
+            AFTER {event} ON schedules
+            BEGIN
+                INSERT INTO schedule_versions (user_id, version) VALUES ({row}.user_id, 1)
+                ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+            END
+        ''')
+    c.execute('''
+        INSERT OR IGNORE INTO schedule_versions (user_id, version)
+        SELECT DISTINCT user_id, 1 FROM schedules WHERE user_id IS NOT NULL
+    ''')
+
+
+def create_daily_activity(c):
+    """Per-user, per-day totals for the profile calendar and heatmap"""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS daily_activity (
+            user_id INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            quizzes INTEGER NOT NULL DEFAULT 0,
+            questions INTEGER NOT NULL DEFAULT 0,
+            correct INTEGER NOT NULL DEFAULT 0,
+            minutes INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, day)
+        ) WITHOUT ROWID
+    ''')
+    # Totals from study_history ('correct/total' scores) and completed schedules
+    c.execute('''
+        INSERT OR IGNORE INTO daily_activity (user_id, day, quizzes, questions, correct, minutes)
+        SELECT user_id, day, SUM(quizzes), SUM(questions), SUM(correct), SUM(minutes)
+        FROM (
+            SELECT user_id,
+                   date(timestamp, 'localtime') AS day,
+                   1 AS quizzes,
+                   CASE WHEN instr(score, '/') > 0
+                        THEN CAST(substr(score, instr(score, '/') + 1) AS INTEGER) ELSE 0 END AS questions,
+                   CASE WHEN instr(score, '/') > 0
+                        THEN CAST(substr(score, 1, instr(score, '/') - 1) AS INTEGER) ELSE 0 END AS correct,
+                   COALESCE(study_duration, 0) AS minutes
+            FROM study_history
+            WHERE user_id IS NOT NULL AND timestamp IS NOT NULL
+            UNION ALL
+            SELECT user_id, date(completed_at), 0, 0, 0, COALESCE(estimated_hours, 0) * 60
+            FROM schedules
+            WHERE status = 'completed' AND user_id IS NOT NULL AND completed_at IS NOT NULL
+        )
+        WHERE day IS NOT NULL
+        GROUP BY user_id, day
+    ''')
+
+
+def backfill_achievements(c):
+    """user_achievements was never written before; unlock what users already earned.
+
+    The rules are frozen here as they stood when this step was added, so later
+    changes to achievements.ACHIEVEMENTS do not change what this step does.
+    Accuracy counts only after 20 answered questions.
+    """
+    c.execute('''
+        INSERT OR IGNORE INTO user_achievements (user_id, achievement_id, unlocked_at)
+        WITH history AS (
+            SELECT user_id,
+                   MAX(instr(score, '/') > 0
+                       AND CAST(substr(score, 1, instr(score, '/') - 1) AS INTEGER) > 0
+                       AND substr(score, 1, instr(score, '/') - 1) = substr(score, instr(score, '/') + 1)) AS perfect,
+                   MIN(CAST(strftime('%H', timestamp, 'localtime') AS INTEGER)) AS earliest_hour,
+                   MAX(CAST(strftime('%H', timestamp, 'localtime') AS INTEGER)) AS latest_hour
+            FROM study_history
+            WHERE user_id IS NOT NULL
+            GROUP BY user_id
+        ),
+        facts AS (
+            SELECT u.user_id,
+                   COALESCE(s.streak, 0) AS streak,
+                   COALESCE(s.total_quizzes, 0) AS total_quizzes,
+                   CASE WHEN s.total_questions >= 20
+                        THEN ROUND(COALESCE(s.correct_answers, 0) * 100.0 / s.total_questions, 1) ELSE 0 END AS accuracy,
+                   COALESCE(h.perfect, 0) AS perfect,
+                   h.earliest_hour,
+                   h.latest_hour
+            FROM (SELECT user_id FROM user_stats UNION SELECT user_id FROM study_history) u
+            LEFT JOIN user_stats s ON s.user_id = u.user_id
+            LEFT JOIN history h ON h.user_id = u.user_id
+            WHERE u.user_id IS NOT NULL
+        )
+        SELECT user_id, achievement_id, datetime('now', 'localtime')
+        FROM facts, (
+            SELECT '3day' AS achievement_id UNION ALL SELECT '7day' UNION ALL SELECT '30day'
+            UNION ALL SELECT 'quiz10' UNION ALL SELECT 'quiz50' UNION ALL SELECT 'quiz100'
+            UNION ALL SELECT 'accuracy70' UNION ALL SELECT 'accuracy80' UNION ALL SELECT 'accuracy90'
+            UNION ALL SELECT 'perfect' UNION ALL SELECT 'early_bird' UNION ALL SELECT 'night_owl'
+        )
+        WHERE CASE achievement_id
+            WHEN '3day' THEN streak >= 3
+            WHEN '7day' THEN streak >= 7
+            WHEN '30day' THEN streak >= 30
+            WHEN 'quiz10' THEN total_quizzes >= 10
+            WHEN 'quiz50' THEN total_quizzes >= 50
+            WHEN 'quiz100' THEN total_quizzes >= 100
+            WHEN 'accuracy70' THEN accuracy >= 70
+            WHEN 'accuracy80' THEN accuracy >= 80
+            WHEN 'accuracy90' THEN accuracy >= 90
+            WHEN 'perfect' THEN perfect
+            WHEN 'early_bird' THEN earliest_hour < 8
+            WHEN 'night_owl' THEN latest_hour >= 22
+        END
+    ''')
+
+
+def recompress_column(c, table, column, keys=('rowid',)):
+    """Re-encode legacy JSON text in table.column with codec.encode, BATCH_ROWS rows at a time"""
+    key_list = ', '.join(keys)
+    where = ' AND '.join(f'{key} = ?' for key in keys)
+    select = f"SELECT {key_list}, {column} FROM {table} WHERE typeof({column}) = 'text'"
+    # Keyset over the key columns, so rows left as text (unparseable) are not read again
+    after = None
+    while True:
+        if after is None:
+            rows = c.execute(f"{select} ORDER BY {key_list} LIMIT {BATCH_ROWS}").fetchall()
+        else:
+            rows = c.execute(f"{select} AND ({key_list}) > ({', '.join('?' * len(keys))}) "
+                             f"ORDER BY {key_list} LIMIT {BATCH_ROWS}", after).fetchall()
+        if not rows:
+            break
+        updates = []
+        for *row_keys, text in rows:
+            try:
+                updates.append((codec.encode(json.loads(text)), *row_keys))
+            except ValueError:
+                continue  # leave unparseable rows as they are
+        c.executemany(f"UPDATE {table} SET {column} = ? WHERE {where}", updates)
+        after = tuple(rows[-1][:len(keys)])
+
+
+def recompress_quiz_data(c):
+    """Existing quiz_data / quiz JSON text becomes versioned compressed blobs"""
+    recompress_column(c, 'study_history', 'quiz_data')
+    recompress_column(c, 'temp_quiz_sessions', 'quiz_data')
+    recompress_column(c, 'temp_quiz_segments', 'quiz', keys=('session_id', 'segment_index'))
+
+
+def create_quiz_answers(c):
+    """One row per answered question, for accuracy queries without decoding quiz_data"""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS quiz_answers (
+            history_id INTEGER NOT NULL,
+            question_index INTEGER NOT NULL,
+            user_id INTEGER,
+            topic TEXT,
+            question_hash TEXT NOT NULL,
+            is_correct INTEGER NOT NULL,
+            answered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (history_id, question_index)
+        ) WITHOUT ROWID
+    ''')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_quiz_answers_user_topic ON quiz_answers (user_id, topic, is_correct)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_quiz_answers_question ON quiz_answers (question_hash, is_correct)')
+
+    # Backfill from study_history; question_hash as defined when this step was added
+    def question_hash(question):
+        normalized = ' '.join(str(question).lower().split())
+        return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:16]
+
+    cursor = c.execute('SELECT id, user_id, topic, quiz_data, timestamp FROM study_history WHERE quiz_data IS NOT NULL')
+    while True:
+        batch = cursor.fetchmany(BATCH_ROWS)
+        if not batch:
+            break
+        rows = []
+        for history_id, user_id, topic, stored, timestamp in batch:
+            try:
+                quiz_data = codec.decode(stored)
+            except ValueError:
+                continue
+            if not isinstance(quiz_data, dict):
+                continue
+            questions = quiz_data.get('questions') or []
+            results = quiz_data.get('results') or []
+            rows.extend((history_id, index, user_id, topic, question_hash(question), int(bool(result)), timestamp)
+                        for index, (question, result) in enumerate(zip(questions, results)))
+        c.executemany('''
+            INSERT OR IGNORE INTO quiz_answers
+                (history_id, question_index, user_id, topic, question_hash, is_correct, answered_at)
+            VALUES (?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+        ''', rows)
+
+
+def create_content_cache(c):
+    """Fetched source text shared by all workers, keyed by query and source"""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS content_cache (
+            query_key TEXT NOT NULL,
+            source TEXT NOT NULL,
+            payload BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            fetched_at REAL NOT NULL,
+            last_used REAL NOT NULL,
+            PRIMARY KEY (query_key, source)
+        )
+    ''')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_content_cache_last_used ON content_cache (last_used)')
+
+
+def create_rate_limits(c):
+    """Token buckets for outbound content sources, shared by all workers"""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS rate_limits (
+            bucket TEXT PRIMARY KEY,
+            tokens REAL NOT NULL,
+            updated REAL NOT NULL
+        ) WITHOUT ROWID
+    ''')
+
+
+def enable_incremental_vacuum(c):
+    """Switch databases created before auto_vacuum=INCREMENTAL (see database.PRAGMAS).
+
+    The setting only takes effect through a full VACUUM, which cannot run in the
+    migration transaction, so it is returned as a follow-up for after COMMIT.
+    """
+    if c.execute('PRAGMA auto_vacuum').fetchone()[0] == 2:
+        return None
+
+    def vacuum(conn):
+        conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        conn.execute('VACUUM')
+    return vacuum
+
+
+def add_schedule_keyset_index(c):
+    """schedule_store pages by (scheduled_date, IFNULL(start_time, ''), id); index that exact order"""
+    c.execute('''
+        CREATE INDEX IF NOT EXISTS idx_schedules_user_keyset
+        ON schedules (user_id, scheduled_date, IFNULL(start_time, ''))
+    ''')
+
+
+def track_content_cache_size(c):
+    """Running total of content_cache payload bytes, kept by triggers so writers
+    only run the LRU eviction scan when the cache is actually over budget"""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS content_cache_size (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            bytes INTEGER NOT NULL
+        )
+    ''')
+    c.execute('INSERT OR REPLACE INTO content_cache_size (id, bytes) SELECT 0, COALESCE(SUM(size), 0) FROM content_cache')
+    c.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_content_cache_size_insert AFTER INSERT ON content_cache
+        BEGIN
+            UPDATE content_cache_size SET bytes = bytes + NEW.size WHERE id = 0;
+        END
+    ''')
+    c.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_content_cache_size_update AFTER UPDATE OF size ON content_cache
+        BEGIN
+            UPDATE content_cache_size SET bytes = bytes - OLD.size + NEW.size WHERE id = 0;
+        END
+    ''')
+    c.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_content_cache_size_delete AFTER DELETE ON content_cache
+        BEGIN
+            UPDATE content_cache_size SET bytes = bytes - OLD.size WHERE id = 0;
+        END
+    ''')
+
+
+# Ordered (version, name, step). Append new steps; never renumber applied ones.
+MIGRATIONS = [
+    (1, 'base schema', create_base_schema),
+    (2, 'upgrade legacy schedules', upgrade_legacy_schedules),
+    (3, 'add missing columns', add_missing_columns),
+    (4, 'backfill user_stats', backfill_user_stats),
+    (5, 'query indexes', add_query_indexes),
+    (6, 'session owner index', add_session_owner_index),
+    (7, 'quiz segments table', create_quiz_segments_table),
+    (8, 'schedule versions', create_schedule_versions),
+    (9, 'daily activity rollup', create_daily_activity),
+    (10, 'achievement backfill', backfill_achievements),
+    (11, 'compress quiz data', recompress_quiz_data),
+    (12, 'quiz answers table', create_quiz_answers),
+    (13, 'content cache', create_content_cache),
+    (14, 'rate limit buckets', create_rate_limits),
+    (15, 'incremental auto-vacuum', enable_incremental_vacuum),
+    (16, 'schedule keyset index', add_schedule_keyset_index),
+    (17, 'content cache size total', track_content_cache_size),
+]
+
+
+# ==========================================
+# RUNNER
+# ==========================================
+def current_version(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    return row[0] or 0
+
+
+def migrate(conn):
+    """Apply all pending migrations in one transaction; returns versions applied.
+
+    A step may return a callable to run on the connection after COMMIT.
+    """
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None  # explicit BEGIN/COMMIT so DDL stays in the transaction
+    applied = []
+    after_commit = []
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        version = current_version(conn)
+        for step_version, name, step in MIGRATIONS:
+            if step_version <= version:
+                continue
+            followup = step(conn)
+            if followup:
+                after_commit.append(followup)
+            conn.execute('INSERT INTO schema_version (version, name) VALUES (?, ?)', (step_version, name))
+            applied.append(step_version)
+        conn.execute('COMMIT')
+        # Steps that cannot run inside a transaction (VACUUM) go last
+        for followup in after_commit:
+            followup(conn)
+    except Exception:
+        if conn.in_transaction:
+            conn.execute('ROLLBACK')
+        raise
+    finally:
+        conn.isolation_level = isolation_level
+    return applied
+
+
+if __name__ == '__main__':
+    db_path = sys.argv[1] if len(sys.argv) > 1 else database.DATABASE
+    conn = database.connect(db_path)
+
+    print(f"🔧 Migrating {db_path}...")
+    applied = migrate(conn)
+    for version, name, _ in MIGRATIONS:
+        status = "✅ applied" if version in applied else "• up to date"
+        print(f"  {status}: {version:03d} {name}")
+    print(f"✅ Schema version: {current_version(conn)}")
+    conn.close()
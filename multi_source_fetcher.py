@@ -1,6 +1,6 @@
-import requests
 from bs4 import BeautifulSoup
-import wikipediaapi
+import http_session
+import wiki_titles
 import re
 import time
 from typing import List, Dict, Tuple
@@ -11,11 +11,7 @@ class MultiSourceLearner:
     """
     
     def __init__(self):
-        self.wiki = wikipediaapi.Wikipedia(
-            language='en',
-            extract_format=wikipediaapi.ExtractFormat.WIKI,
-            user_agent="AI_Study_Pal_Multi/1.0"
-        )
+        self.wiki = http_session.wikipedia('en')
         
     def clean_text(self, text):
         """Clean and normalize text"""
@@ -31,21 +27,14 @@ class MultiSourceLearner:
         """Source 1: Wikipedia"""
         try:
             print(f"  📖 [Wikipedia] Searching: {query}")
-            search_terms = [
-                query, 
-                query.title(), 
-                f"{query} (concept)",
-                f"{query} (technology)",
-                f"{query} (computing)"
-            ]
-            
-            for term in search_terms:
-                page = self.wiki.page(term)
-                if page.exists():
-                    text = page.text if hasattr(page, 'text') else page.summary
-                    if len(text) > 100:
-                        print(f"  ✅ [Wikipedia] Found: {page.title}")
-                        return self.clean_text(text[:3000]), f"Wikipedia: {page.title}"
+            # query, Query, "query (concept)", "(technology)" and "(computing)" in one request
+            title = wiki_titles.resolver.resolve(query)
+            if title:
+                page = self.wiki.page(title)
+                text = page.text if hasattr(page, 'text') else page.summary
+                if len(text) > 100:
+                    print(f"  ✅ [Wikipedia] Found: {page.title}")
+                    return self.clean_text(text[:3000]), f"Wikipedia: {page.title}"
         except Exception as e:
             print(f"  ⚠️ [Wikipedia] Error: {e}")
         return "", ""
@@ -57,7 +46,7 @@ class MultiSourceLearner:
             url = f"https://www.britannica.com/search?query={query.replace(' ', '+')}"
             headers = {'User-Agent': 'Mozilla/5.0'}
             
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_session.get(url, headers=headers)
             soup = BeautifulSoup(response.content, 'html.parser')
             
             # Find first search result
@@ -68,7 +57,7 @@ class MultiSourceLearner:
                     article_url = 'https://www.britannica.com' + article_url
                 
                 # Fetch article content
-                article_response = requests.get(article_url, headers=headers, timeout=10)
+                article_response = http_session.get(article_url, headers=headers)
                 article_soup = BeautifulSoup(article_response.content, 'html.parser')
                 
                 # Extract paragraphs
@@ -86,14 +75,9 @@ class MultiSourceLearner:
         """Source 3: Simple English Wikipedia (easier to understand)"""
         try:
             print(f"  📖 [Simple Wiki] Searching: {query}")
-            simple_wiki = wikipediaapi.Wikipedia(
-                language='simple',
-                extract_format=wikipediaapi.ExtractFormat.WIKI,
-                user_agent="AI_Study_Pal_Multi/1.0"
-            )
-            
-            page = simple_wiki.page(query)
-            if page.exists():
+            title = wiki_titles.resolver.resolve(query, language='simple')
+            if title:
+                page = http_session.wikipedia('simple').page(title)
                 text = page.text if hasattr(page, 'text') else page.summary
                 if len(text) > 100:
                     print(f"  ✅ [Simple Wiki] Found: {page.title}")
@@ -108,7 +92,7 @@ class MultiSourceLearner:
             print(f"  🔬 [arXiv] Searching: {query}")
             api_url = f"http://export.arxiv.org/api/query?search_query=all:{query}&start=0&max_results=3"
             
-            response = requests.get(api_url, timeout=10)
+            response = http_session.get(api_url)
             if response.status_code == 200:
                 soup = BeautifulSoup(response.content, 'xml')
                 entries = soup.find_all('entry')
@@ -133,7 +117,7 @@ class MultiSourceLearner:
             print(f"  🔍 [DuckDuckGo] Searching: {query}")
             api_url = f"https://api.duckduckgo.com/?q={query}&format=json"
             
-            response = requests.get(api_url, timeout=10)
+            response = http_session.get(api_url)
             data = response.json()
             
             text = ""
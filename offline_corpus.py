@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Offline Wikipedia corpus for MultiSourceLearner
+
+Builds a local article store from a Wikipedia or Simple Wikipedia extract dump:
+JSON lines with "title" and "text", as written by WikiExtractor --json,
+optionally .gz or .bz2 compressed. The store holds two files in CORPUS_DIR.
+
+articles.bin
+    A header (MAGIC, build generation), then one codec blob (zlib-compressed
+    JSON) per article, back to back. Only the article being read is ever
+    decompressed.
+
+titles.idx
+    A header, fixed-width entries sorted by normalized title, then the title
+    keys themselves.
+    header:  MAGIC, entry count, build generation
+    entry:   key offset, key length, article offset, article length
+    The file is memory-mapped, so a lookup is a binary search over the entries
+    (O(log n)) that touches only a few pages and never loads the index into
+    memory.
+
+Both files are written as .partial and renamed into place once complete. The
+two renames are not atomic together, so both headers carry a random generation
+id; a reader that opens files from different builds gets StaleCorpus, and
+open_corpus() retries briefly while a swap is in progress.
+
+The build never holds every title in memory. Index entries are sorted in runs
+of RUN_ENTRIES, spilled to temporary files and merged with heapq.merge. A title
+repeated in the dump keeps its first article; later copies still occupy space
+in articles.bin but are never indexed.
+
+Usage: python offline_corpus.py build <dump.jsonl[.gz|.bz2]> [corpus_dir]
+       python offline_corpus.py lookup <title> [corpus_dir]
+"""
+import bz2
+import gzip
+import heapq
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+import codec
+from wiki_titles import candidate_titles
+
+CORPUS_DIR = os.environ.get('STUDYPAL_CORPUS_DIR', 'corpus')
+ARTICLES = 'articles.bin'
+INDEX = 'titles.idx'
+MAGIC = b'SPCORP02'
+HEADER = struct.Struct('<8sQQ')
+ARTICLES_HEADER = struct.Struct('<8sQ')
+ENTRY = struct.Struct('<QIQI')
+RUN_RECORD = struct.Struct('<IQI')   # key length, article offset, article length; key follows
+RUN_ENTRIES = 200000                 # index entries sorted in memory per run
+OPEN_RETRIES = 3
+
+
+class StaleCorpus(ValueError):
+    """titles.idx and articles.bin come from different builds (a swap is in progress)"""
+
+
+def normalize_title(title):
+    """Index key: case-folded, underscores as spaces, whitespace collapsed"""
+    return ' '.join(title.replace('_', ' ').casefold().split())
+
+
+def _open_dump(path):
+    if path.endswith('.bz2'):
+        return bz2.open(path, 'rt', encoding='utf-8')
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, encoding='utf-8')
+
+
+def iter_dump(path):
+    """(title, text) pairs from an extract dump, skipping blank or malformed lines"""
+    with _open_dump(path) as dump:
+        for line in dump:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            title, text = record.get('title'), record.get('text')
+            if title and text and text.strip():
+                yield title, text.strip()
+
+
+def build(articles, corpus_dir=CORPUS_DIR):
+    """Write the store from (title, text) pairs; the first article for a title wins. Returns the count."""
+    os.makedirs(corpus_dir, exist_ok=True)
+    articles_path, index_path = os.path.join(corpus_dir, ARTICLES), os.path.join(corpus_dir, INDEX)
+    generation = int.from_bytes(os.urandom(8), 'little')
+    work_dir = tempfile.mkdtemp(prefix='.build-', dir=corpus_dir)
+    try:
+        runs, chunk = [], []
+        with open(articles_path + '.partial', 'wb') as out:
+            out.write(ARTICLES_HEADER.pack(MAGIC, generation))
+            for title, text in articles:
+                key = normalize_title(title).encode('utf-8')
+                if not key:
+                    continue
+                blob = codec.encode({'title': title, 'text': text})
+                chunk.append((key, out.tell(), len(blob)))
+                out.write(blob)
+                if len(chunk) >= RUN_ENTRIES:
+                    runs.append(_write_run(chunk, os.path.join(work_dir, f'run-{len(runs)}')))
+                    chunk = []
+        if chunk:
+            runs.append(_write_run(chunk, os.path.join(work_dir, f'run-{len(runs)}')))
+
+        count = _write_index(runs, index_path + '.partial', os.path.join(work_dir, 'keys'), generation)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    os.replace(articles_path + '.partial', articles_path)
+    os.replace(index_path + '.partial', index_path)
+    return count
+
+
+def _write_run(chunk, path):
+    """Sort one chunk of (key, offset, length) entries into a run file; returns its path"""
+    chunk.sort()
+    with open(path, 'wb') as out:
+        for key, offset, length in chunk:
+            out.write(RUN_RECORD.pack(len(key), offset, length))
+            out.write(key)
+    return path
+
+
+def _read_run(path):
+    with open(path, 'rb') as run:
+        while True:
+            record = run.read(RUN_RECORD.size)
+            if not record:
+                return
+            key_length, offset, length = RUN_RECORD.unpack(record)
+            yield run.read(key_length), offset, length
+
+
+def _write_index(runs, path, keys_path, generation):
+    """Merge sorted runs into titles.idx, keeping the earliest article per key; returns the count"""
+    count, key_offset, previous = 0, 0, None
+    with open(path, 'wb') as out, open(keys_path, 'w+b') as keys:
+        out.write(HEADER.pack(MAGIC, 0, generation))
+        # Ties sort by article offset, so the first copy in the dump comes first
+        for key, offset, length in heapq.merge(*(_read_run(run) for run in runs)):
+            if key == previous:
+                continue
+            previous = key
+            out.write(ENTRY.pack(key_offset, len(key), offset, length))
+            keys.write(key)
+            key_offset += len(key)
+            count += 1
+        keys.seek(0)
+        shutil.copyfileobj(keys, out)
+        out.seek(0)
+        out.write(HEADER.pack(MAGIC, count, generation))
+    return count
+
+
+class OfflineCorpus:
+    """Read-only view of a built corpus; safe to share between threads"""
+
+    def __init__(self, corpus_dir=CORPUS_DIR):
+        self.corpus_dir = corpus_dir
+        self._files = []
+        self._index = self._map(os.path.join(corpus_dir, INDEX))
+        self._articles = self._map(os.path.join(corpus_dir, ARTICLES))
+
+        try:
+            magic, self.count, generation = HEADER.unpack_from(self._index, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{corpus_dir}: not a corpus index")
+            if ARTICLES_HEADER.unpack_from(self._articles, 0) != (MAGIC, generation):
+                raise StaleCorpus(f"{corpus_dir}: index and articles are from different builds")
+        except Exception:
+            self.close()
+            raise
+        self._keys_start = HEADER.size + self.count * ENTRY.size
+
+    def _map(self, path):
+        f = open(path, 'rb')
+        self._files.append(f)
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return self.count
+
+    def _entry(self, i):
+        return ENTRY.unpack_from(self._index, HEADER.size + i * ENTRY.size)
+
+    def _key(self, entry):
+        start = self._keys_start + entry[0]
+        return self._index[start:start + entry[1]]
+
+    def find(self, title):
+        """(offset, length) of the article stored under title, or None"""
+        key = normalize_title(title).encode('utf-8')
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry = self._entry(mid)
+            probe = self._key(entry)
+            if probe == key:
+                return entry[2], entry[3]
+            if probe < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def article(self, title):
+        """(title, text) for title, decompressing only that article; None if absent"""
+        location = self.find(title)
+        if location is None:
+            return None
+        offset, length = location
+        record = codec.decode(self._articles[offset:offset + length])
+        return record['title'], record['text']
+
+    def lookup(self, query):
+        """First article matching the query's candidate titles (see wiki_titles)"""
+        for title in candidate_titles(query):
+            found = self.article(title)
+            if found is not None:
+                return found
+        return None
+
+    def close(self):
+        for mapped in (self._index, self._articles):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+        for f in self._files:
+            f.close()
+
+
+def open_corpus(corpus_dir=CORPUS_DIR):
+    """OfflineCorpus for corpus_dir, or None if no corpus has been built there"""
+    if not os.path.exists(os.path.join(corpus_dir, INDEX)):
+        return None
+    for attempt in range(OPEN_RETRIES):
+        try:
+            return OfflineCorpus(corpus_dir)
+        except StaleCorpus:
+            if attempt == OPEN_RETRIES - 1:
+                raise
+            time.sleep(0.1)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3 or sys.argv[1] not in ('build', 'lookup'):
+        print("Usage: python offline_corpus.py build <dump.jsonl[.gz|.bz2]> [corpus_dir]")
+        print("       python offline_corpus.py lookup <title> [corpus_dir]")
+        sys.exit(1)
+    corpus_dir = sys.argv[3] if len(sys.argv) > 3 else CORPUS_DIR
+
+    if sys.argv[1] == 'build':
+        print(f"📚 Building offline corpus from {sys.argv[2]} into {corpus_dir}...")
+        count = build(iter_dump(sys.argv[2]), corpus_dir)
+        print(f"✅ {count} articles indexed")
+    else:
+        corpus = open_corpus(corpus_dir)
+        found = corpus.lookup(sys.argv[2]) if corpus else None
+        if found is None:
+            print(f"❌ Not found: {sys.argv[2]}")
+            sys.exit(1)
+        print(f"📖 {found[0]}\n\n{found[1][:1000]}")
@@ -0,0 +1,47 @@
+"""
+Per-question quiz results (quiz_answers)
+
+study_history.quiz_data keeps the full record of a submission for the history
+view; quiz_answers holds one narrow row per question so accuracy by topic or by
+question can be computed in SQL without decoding every quiz_data blob.
+"""
+import hashlib
+
+INSERT_ANSWER = '''
+    INSERT OR IGNORE INTO quiz_answers
+        (history_id, question_index, user_id, topic, question_hash, is_correct, answered_at)
+    VALUES (?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+'''
+
+
+def question_hash(question):
+    """Stable key for the same question text across quizzes"""
+    normalized = ' '.join(str(question).lower().split())
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:16]
+
+
+def answer_rows(history_id, user_id, topic, quiz_data, answered_at=None):
+    questions = quiz_data.get('questions') or []
+    results = quiz_data.get('results') or []
+    return [(history_id, index, user_id, topic, question_hash(question), int(bool(result)), answered_at)
+            for index, (question, result) in enumerate(zip(questions, results))]
+
+
+def record_answers(conn, history_id, user_id, topic, quiz_data, answered_at=None):
+    """Insert one row per question of a submission (caller commits)"""
+    conn.executemany(INSERT_ANSWER, answer_rows(history_id, user_id, topic, quiz_data, answered_at))
+
+
+def topic_accuracy(conn, user_id, limit=50):
+    """Per-topic answered / correct counts for a user, most practised first"""
+    rows = conn.execute('''
+        SELECT topic, COUNT(*) AS answered, SUM(is_correct) AS correct
+        FROM quiz_answers
+        WHERE user_id = ?
+        GROUP BY topic
+        ORDER BY answered DESC, topic
+        LIMIT ?
+    ''', (user_id, limit)).fetchall()
+    return [{'topic': row['topic'], 'answered': row['answered'], 'correct': row['correct'],
+             'accuracy': round(row['correct'] / row['answered'] * 100, 1)} for row in rows]
+
@@ -0,0 +1,109 @@
+"""
+Storage for in-progress quiz sessions (temp_quiz_sessions)
+
+The parent row holds a small header (topic, quiz mode, sources, segment count);
+each segment's questions live in temp_quiz_segments keyed by
+(session_id, segment_index), so grading one segment only reads that segment.
+Both are stored with codec.encode.
+
+Recently written sessions are also kept in an in-process LRU cache so quick
+successive submissions skip SQLite entirely. A session enters the cache only
+after its rows are committed (cache_session, or the first read). The cache TTL
+is far shorter than the session TTL and entries are dropped whenever the
+maintenance thread deletes their rows.
+
+The cache is per process with no cross-process invalidation: a session deleted
+by another worker's maintenance thread can still be graded from this worker's
+copy until the entry expires.
+"""
+import codec
+from cache import TTLCache
+import maintenance
+
+CACHE_MAX_SESSIONS = 512
+CACHE_TTL_SECONDS = 30 * 60
+
+# quiz_session_id -> {'user_id', 'topic', 'segments': {segment_index: questions}}
+session_cache = TTLCache(max_entries=CACHE_MAX_SESSIONS, ttl=CACHE_TTL_SECONDS)
+maintenance.on_sessions_deleted.append(session_cache.delete_many)
+
+
+def store_session(conn, session_id, user_id, topic, quiz_mode, sources, segments):
+    """Insert a session header plus one row per segment quiz.
+
+    The caller commits, then calls cache_session, so a session that is rolled
+    back never reaches the cache.
+    """
+    header = codec.encode({
+        'topic': topic,
+        'quiz_mode': quiz_mode,
+        'sources': sources,
+        'segment_count': len(segments)
+    })
+    conn.execute('''
+        INSERT INTO temp_quiz_sessions (session_id, user_id, quiz_data, topic)
+        VALUES (?, ?, ?, ?)
+    ''', (session_id, user_id, header, topic))
+    conn.executemany('''
+        INSERT INTO temp_quiz_segments (session_id, segment_index, quiz)
+        VALUES (?, ?, ?)
+    ''', [(session_id, idx, codec.encode(segment.get('quiz', []))) for idx, segment in enumerate(segments)])
+    session_cache.delete(session_id)
+
+
+def cache_session(session_id, user_id, topic, segments):
+    """Cache a session written by store_session once the caller has committed it"""
+    session_cache.set(session_id, {
+        'user_id': user_id,
+        'topic': topic,
+        'segments': {idx: segment.get('quiz', []) for idx, segment in enumerate(segments)}
+    })
+
+
+def load_segment_quiz(conn, session_id, user_id, segment_index):
+    """Return (topic, questions) for one segment, or None if the session is gone.
+
+    questions is None when the session exists but has no such segment.
+    """
+    row = conn.execute('''
+        SELECT s.topic, s.quiz_data, q.quiz
+        FROM temp_quiz_sessions s
+        LEFT JOIN temp_quiz_segments q
+            ON q.session_id = s.session_id AND q.segment_index = ?
+        WHERE s.session_id = ? AND s.user_id = ?
+    ''', (segment_index, session_id, user_id)).fetchone()
+
+    if not row:
+        return None
+
+    if row['quiz'] is not None:
+        return row['topic'], codec.decode(row['quiz'])
+
+    # Sessions written before segment rows existed keep the whole blob
+    data = codec.decode(row['quiz_data'])
+    segments = data.get('segments')
+    if segments is None or not isinstance(segment_index, int) or not 0 <= segment_index < len(segments):
+        return data.get('topic', row['topic']), None
+    return data.get('topic', row['topic']), segments[segment_index].get('quiz', [])
+
+
+def get_segment_quiz(conn, session_id, user_id, segment_index):
+    """Read-through wrapper around load_segment_quiz using session_cache"""
+    entry = session_cache.get(session_id)
+    if entry is not None and entry['user_id'] == user_id:
+        questions = entry['segments'].get(segment_index)
+        if questions is not None:
+            return entry['topic'], questions
+
+    result = load_segment_quiz(conn, session_id, user_id, segment_index)
+    if result is None:
+        session_cache.delete(session_id)
+        return None
+
+    topic, questions = result
+    if questions is not None:
+        if entry is None or entry['user_id'] != user_id:
+            entry = {'user_id': user_id, 'topic': topic, 'segments': {}}
+            session_cache.set(session_id, entry)
+        entry['segments'][segment_index] = questions
+    return result
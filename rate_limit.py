@@ -0,0 +1,95 @@
+"""
+Token-bucket rate limits for outbound content sources (rate_limits table)
+
+Each source has a bucket of `burst` tokens refilled at `rate` tokens per second.
+The bucket state lives in studypal.db, so every worker process and thread draws
+from the same budget. Taking a token is a single UPSERT ... RETURNING on the
+autocommit side connection (database.side_pool), never the request's: it refills
+the bucket from the elapsed time and takes a token even when that drives the
+balance negative (a reservation behind earlier callers). The caller then sleeps
+for the deficit. Callers that would wait longer than max_wait, or than the
+max_wait they pass in (such as the time left before their deadline), take
+nothing and get RateLimited instead.
+"""
+import threading
+import time
+import database
+
+# source -> (tokens per second, burst)
+LIMITS = {
+    'wikipedia': (5.0, 10),
+    'simple_wikipedia': (5.0, 10),
+    'duckduckgo': (1.0, 3),
+    'web_search': (0.5, 2),
+}
+MAX_WAIT_SECONDS = 5.0
+
+
+class RateLimited(Exception):
+    """The bucket is exhausted for longer than the caller is willing to wait"""
+
+
+class RateLimiter:
+    """Shared token buckets with per-process wait metrics"""
+
+    def __init__(self, db_path=None, limits=None, max_wait=MAX_WAIT_SECONDS):
+        self.db_path = db_path
+        self.limits = LIMITS if limits is None else limits
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def reserve(self, bucket, now=None, max_wait=None):
+        """Take a token from bucket; returns seconds until it may be used"""
+        rate, burst = self.limits[bucket]
+        now = time.time() if now is None else now
+        max_wait = self.max_wait if max_wait is None else min(self.max_wait, max_wait)
+        params = {'bucket': bucket, 'rate': rate, 'burst': burst, 'now': now, 'max_wait': max_wait}
+        conn = database.side_pool.acquire(self.db_path)
+        row = conn.execute('''
+            INSERT INTO rate_limits (bucket, tokens, updated) VALUES (:bucket, :burst - 1, :now)
+            ON CONFLICT(bucket) DO UPDATE SET
+                tokens = MIN(:burst, tokens + MAX(0.0, :now - updated) * :rate) - 1,
+                updated = MAX(updated, :now)
+            WHERE (1 - MIN(:burst, tokens + MAX(0.0, :now - updated) * :rate)) / :rate <= :max_wait
+            RETURNING tokens
+        ''', params).fetchone()
+
+        if row is None:
+            self._record(bucket, rejected=1)
+            tokens = conn.execute('SELECT tokens FROM rate_limits WHERE bucket = ?', (bucket,)).fetchone()
+            wait = (1 - tokens[0]) / rate if tokens else 0.0
+            raise RateLimited(f"{bucket}: next token in {wait:.1f}s")
+        # tokens is the balance after taking ours; below zero we queue behind earlier callers
+        return max(0.0, -row[0] / rate)
+
+    def acquire(self, bucket, max_wait=None):
+        """
+        Block until bucket allows one request; returns seconds waited. max_wait
+        (seconds) can only shorten the limiter's own max_wait.
+        """
+        if bucket not in self.limits:
+            return 0.0
+        wait = self.reserve(bucket, max_wait=max_wait)
+        if wait:
+            time.sleep(wait)
+        self._record(bucket, acquired=1, waited=1 if wait else 0, wait_seconds=wait)
+        return wait
+
+    def _record(self, bucket, acquired=0, waited=0, wait_seconds=0.0, rejected=0):
+        with self._lock:
+            entry = self._stats.setdefault(bucket, {'acquired': 0, 'waited': 0, 'wait_seconds': 0.0,
+                                                    'max_wait': 0.0, 'rejected': 0})
+            entry['acquired'] += acquired
+            entry['waited'] += waited
+            entry['wait_seconds'] += wait_seconds
+            entry['max_wait'] = max(entry['max_wait'], wait_seconds)
+            entry['rejected'] += rejected
+
+    def stats(self):
+        with self._lock:
+            return {bucket: dict(entry,
+                                 wait_seconds=round(entry['wait_seconds'], 3),
+                                 max_wait=round(entry['max_wait'], 3),
+                                 avg_wait=round(entry['wait_seconds'] / entry['acquired'], 3) if entry['acquired'] else 0.0)
+                    for bucket, entry in self._stats.items()}
@@ -0,0 +1,141 @@
+"""
+Streaming schedule exports (plain text, CSV, iCalendar)
+
+Each exporter takes an iterable of schedule rows already ordered by
+scheduled_date, start_time and yields chunks of text, so the download can start
+before the query finishes and memory use does not grow with the schedule.
+"""
+import csv
+import io
+from datetime import datetime, timezone
+
+EXPORT_FORMATS = {
+    'txt': ('text/plain', 'study_schedule.txt'),
+    'csv': ('text/csv', 'study_schedule.csv'),
+    'ics': ('text/calendar', 'study_schedule.ics'),
+}
+
+CSV_COLUMNS = ['id', 'scheduled_date', 'start_time', 'end_time', 'subject', 'unit_name', 'topic_name',
+               'difficulty', 'estimated_hours', 'status', 'notes']
+
+
+def export_text(rows):
+    """The original human-readable report, grouped by day"""
+    yield "MY AI-GENERATED STUDY SCHEDULE\n" + "=" * 60 + "\n\n"
+
+    total = completed = total_hours = 0
+    current_date = None
+
+    for schedule in rows:
+        if schedule['scheduled_date'] != current_date:
+            current_date = schedule['scheduled_date']
+            formatted_date = datetime.strptime(current_date, '%Y-%m-%d').strftime('%A, %B %d, %Y')
+            yield f"\n{formatted_date}\n" + "-" * 60 + "\n"
+
+        status_icon = "✓" if schedule['status'] == 'completed' else "○"
+        chunk = f"{status_icon} {schedule['start_time']} - {schedule['end_time']}: "
+        chunk += f"{schedule['topic_name']} ({(schedule['difficulty'] or '').upper()})\n"
+        if schedule['unit_name']:
+            chunk += f"   Unit: {schedule['unit_name']}\n"
+        if schedule['notes']:
+            chunk += f"   Notes: {schedule['notes']}\n"
+        chunk += f"   Estimated Time: {schedule['estimated_hours']} hours\n"
+        chunk += "\n"
+        yield chunk
+
+        total += 1
+        completed += schedule['status'] == 'completed'
+        total_hours += schedule['estimated_hours'] or 0
+
+    summary = "\n" + "=" * 60 + "\n"
+    summary += "STATISTICS\n"
+    summary += "=" * 60 + "\n"
+    summary += f"Total Topics: {total}\n"
+    summary += f"Completed: {completed}\n"
+    summary += f"Remaining: {total - completed}\n"
+    summary += f"Total Study Hours: {total_hours}\n"
+    summary += f"Progress: {round((completed/total)*100, 1) if total > 0 else 0}%\n"
+    yield summary
+
+
+def export_csv(rows):
+    """One CSV line per schedule item"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        value = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return value
+
+    writer.writerow(CSV_COLUMNS)
+    yield flush()
+    for schedule in rows:
+        writer.writerow([schedule[column] for column in CSV_COLUMNS])
+        yield flush()
+
+
+def ics_escape(value):
+    return (str(value).replace('\\', '\\\\').replace(';', '\\;')
+            .replace(',', '\\,').replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def ics_line(line):
+    """Fold a content line at 75 octets as RFC 5545 requires"""
+    chunks = []
+    current = ''
+    for char in line:
+        limit = 75 if not chunks else 74  # continuation lines start with a space
+        if len((current + char).encode('utf-8')) > limit:
+            chunks.append(current)
+            current = ''
+        current += char
+    chunks.append(current)
+    return '\r\n '.join(chunks) + '\r\n'
+
+
+def ics_time(scheduled_date, clock):
+    return scheduled_date.replace('-', '') + 'T' + clock.replace(':', '')[:4] + '00'
+
+
+def export_ics(rows):
+    """iCalendar feed with one VEVENT per schedule item (floating local times)"""
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    yield ics_line('BEGIN:VCALENDAR')
+    yield ics_line('VERSION:2.0')
+    yield ics_line('PRODID:-//StudyVerse//Study Schedule//EN')
+    yield ics_line('CALSCALE:GREGORIAN')
+
+    for schedule in rows:
+        lines = ['BEGIN:VEVENT', f"UID:schedule-{schedule['id']}@studyverse", f'DTSTAMP:{stamp}']
+        if schedule['start_time']:
+            lines.append(f"DTSTART:{ics_time(schedule['scheduled_date'], schedule['start_time'])}")
+            if schedule['end_time']:
+                lines.append(f"DTEND:{ics_time(schedule['scheduled_date'], schedule['end_time'])}")
+        else:
+            lines.append(f"DTSTART;VALUE=DATE:{schedule['scheduled_date'].replace('-', '')}")
+
+        lines.append(f"SUMMARY:{ics_escape(schedule['topic_name'])} ({ics_escape(schedule['subject'])})")
+
+        description = [f"Difficulty: {schedule['difficulty']}", f"Estimated Time: {schedule['estimated_hours']} hours"]
+        if schedule['unit_name']:
+            description.insert(0, f"Unit: {schedule['unit_name']}")
+        if schedule['notes']:
+            description.append(f"Notes: {schedule['notes']}")
+        lines.append('DESCRIPTION:' + ics_escape('\n'.join(description)))
+        lines.append(f"CATEGORIES:{ics_escape(schedule['subject'])}")
+        if schedule['status'] == 'completed':
+            lines.append('X-STUDYVERSE-STATUS:COMPLETED')
+        lines.append('END:VEVENT')
+
+        yield ''.join(ics_line(line) for line in lines)
+
+    yield ics_line('END:VCALENDAR')
+
+
+EXPORTERS = {
+    'txt': export_text,
+    'csv': export_csv,
+    'ics': export_ics,
+}
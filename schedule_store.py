@@ -0,0 +1,183 @@
+"""
+Data access for the schedules table
+"""
+import base64
+import binascii
+import json
+
+INSERT_COLUMNS = ('user_id', 'subject', 'unit_name', 'topic_name', 'difficulty', 'estimated_hours',
+                  'scheduled_date', 'start_time', 'end_time', 'is_auto_generated', 'status')
+
+
+def schedule_row(user_id, item):
+    """Column values for one item posted by the scheduler UI"""
+    return (
+        user_id,
+        item.get('subject', ''),
+        item.get('unit_name', ''),
+        item.get('topic_name', ''),
+        item.get('difficulty', 'medium'),
+        item.get('estimated_hours', 2),
+        item.get('scheduled_date', ''),
+        item.get('start_time', '09:00'),
+        item.get('end_time', '11:00'),
+        item.get('is_auto_generated', 1),
+        'pending'
+    )
+
+
+def insert_bulk(conn, user_id, items, dedupe=False):
+    """Insert many schedule items in one transaction.
+
+    Returns a list of new row ids aligned with `items`; an entry is None when
+    dedupe is on and the item matched an existing row (or an earlier item) with
+    the same subject, topic and date.
+
+    Runs in its own BEGIN IMMEDIATE transaction, or inside a savepoint when the
+    caller already has one open (the caller then commits).
+    """
+    rows = [schedule_row(user_id, item) for item in items]
+
+    own_transaction = not conn.in_transaction
+    conn.execute('BEGIN IMMEDIATE' if own_transaction else 'SAVEPOINT insert_bulk')
+    try:
+        keep = [True] * len(rows)
+        if dedupe and rows:
+            dates = [row[6] for row in rows]
+            seen = {tuple(key) for key in conn.execute('''
+                SELECT subject, topic_name, scheduled_date FROM schedules
+                WHERE user_id = ? AND scheduled_date BETWEEN ? AND ?
+            ''', (user_id, min(dates), max(dates)))}
+            for i, row in enumerate(rows):
+                key = (row[1], row[3], row[6])
+                if key in seen:
+                    keep[i] = False
+                else:
+                    seen.add(key)
+
+        new_rows = [row for row, kept in zip(rows, keep) if kept]
+        conn.executemany(f'''
+            INSERT INTO schedules ({', '.join(INSERT_COLUMNS)})
+            VALUES ({', '.join('?' * len(INSERT_COLUMNS))})
+        ''', new_rows)
+
+        # The write lock is held for the whole transaction, so AUTOINCREMENT
+        # hands out a contiguous id range ending at last_insert_rowid()
+        last_id = conn.execute('SELECT last_insert_rowid()').fetchone()[0]
+        if own_transaction:
+            conn.commit()
+        else:
+            conn.execute('RELEASE SAVEPOINT insert_bulk')
+    except Exception:
+        if own_transaction:
+            conn.rollback()
+        else:
+            conn.execute('ROLLBACK TO SAVEPOINT insert_bulk')
+            conn.execute('RELEASE SAVEPOINT insert_bulk')
+        raise
+
+    next_id = last_id - len(new_rows) + 1
+    ids = []
+    for kept in keep:
+        if kept:
+            ids.append(next_id)
+            next_id += 1
+        else:
+            ids.append(None)
+    return ids
+
+
+# ==========================================
+# READS
+# ==========================================
+SCHEDULE_COLUMNS = ('id', 'user_id', 'subject', 'unit_name', 'topic_name', 'difficulty', 'estimated_hours',
+                    'scheduled_date', 'start_time', 'end_time', 'status', 'completion_percentage', 'notes',
+                    'is_auto_generated', 'created_at', 'completed_at')
+KEYSET_COLUMNS = ('scheduled_date', 'start_time', 'id')
+MAX_PAGE_SIZE = 1000
+
+
+def schedule_version(conn, user_id):
+    """Counter that changes whenever any of the user's schedule rows change"""
+    row = conn.execute('SELECT version FROM schedule_versions WHERE user_id = ?', (user_id,)).fetchone()
+    return row[0] if row else 0
+
+
+def encode_cursor(row):
+    raw = json.dumps([row['scheduled_date'], row['start_time'] or '', row['id']])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    scheduled_date, start_time, schedule_id = json.loads(base64.urlsafe_b64decode(padded))
+    return str(scheduled_date), str(start_time), int(schedule_id)
+
+
+def query_schedule(conn, user_id, date_from=None, date_to=None, status=None, subject=None,
+                   fields=None, limit=None, after=None):
+    """One page of a user's schedule in (scheduled_date, start_time, id) order.
+
+    Returns (items, next_cursor); next_cursor is None on the last page.
+    Raises ValueError for unknown fields, bad limits or malformed cursors.
+    """
+    fields = list(fields or SCHEDULE_COLUMNS)
+    unknown = [field for field in fields if field not in SCHEDULE_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    if limit is not None and not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+    where = ['user_id = ?']
+    params = [user_id]
+    if date_from:
+        where.append('scheduled_date >= ?')
+        params.append(date_from)
+    if date_to:
+        where.append('scheduled_date <= ?')
+        params.append(date_to)
+    if status:
+        where.append('status = ?')
+        params.append(status)
+    if subject:
+        where.append('subject = ?')
+        params.append(subject)
+    if after:
+        try:
+            params.extend(decode_cursor(after))
+        except (ValueError, TypeError, binascii.Error):
+            raise ValueError("Invalid cursor")
+        where.append("(scheduled_date, IFNULL(start_time, ''), id) > (?, ?, ?)")
+
+    selected = fields + [column for column in KEYSET_COLUMNS if column not in fields]
+    sql = f'''
+        SELECT {', '.join(selected)} FROM schedules
+        WHERE {' AND '.join(where)}
+        ORDER BY scheduled_date, IFNULL(start_time, ''), id
+    '''
+    if limit is not None:
+        sql += ' LIMIT ?'
+        params.append(limit + 1)  # one extra row tells us whether another page exists
+
+    rows = conn.execute(sql, params).fetchall()
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1])
+
+    return [{field: row[field] for field in fields} for row in rows], next_cursor
+
+
+def iter_schedule(conn, user_id, batch_size=500):
+    """Yield every schedule row for a user in calendar order, fetching in batches"""
+    cursor = conn.execute('''
+        SELECT * FROM schedules
+        WHERE user_id = ?
+        ORDER BY scheduled_date, IFNULL(start_time, ''), id
+    ''', (user_id,))
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield from rows
@@ -0,0 +1,148 @@
+"""
+Per-source health for MultiSourceLearner: success rate, yield, latency and a circuit breaker
+
+Every network fetch is recorded as one of three outcomes. It succeeds when it
+returns more than MIN_CHARS characters. It fails when it raises (transport
+errors, timeouts, HTTP errors, scrapes the fetcher knows went wrong). Anything
+else is a miss: the source answered but had nothing on the topic. Success rate,
+yield (characters per successful fetch) and latency are exponentially weighted
+moving averages, so recent behaviour dominates; misses lower the success rate.
+
+Only failures count towards the circuit breaker, and a miss resets the count,
+since the source evidently works. After FAILURE_THRESHOLD consecutive failures
+a source's circuit opens and it is skipped for COOLDOWN_SECONDS. After that one
+trial fetch is let through (half-open): a success or miss closes the circuit,
+failure reopens it with the cooldown doubled, up to MAX_COOLDOWN_SECONDS.
+
+order() puts sources without enough history first, in their given order, so they
+get measured. The rest follow by expected characters per second:
+success rate * yield / latency.
+
+State is per process; each worker learns on its own.
+"""
+import threading
+import time
+
+ALPHA = 0.3                  # weight of the newest sample in the moving averages
+MIN_CHARS = 100
+MIN_SAMPLES = 3              # outcomes needed before a source is ranked by score
+FAILURE_THRESHOLD = 3
+COOLDOWN_SECONDS = 60
+MAX_COOLDOWN_SECONDS = 600
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+
+class SourceHealth:
+    """Thread-safe health records keyed by source name"""
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN_SECONDS, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._sources = {}
+
+    def _entry(self, source):
+        entry = self._sources.get(source)
+        if entry is None:
+            entry = self._sources[source] = {
+                'samples': 0, 'successes': 0, 'misses': 0, 'failures': 0,
+                'success_rate': None, 'avg_chars': None, 'avg_latency': None,
+                'consecutive_failures': 0, 'state': CLOSED,
+                'opened_at': None, 'cooldown': self.cooldown, 'trial_at': None, 'skipped': 0,
+            }
+        return entry
+
+    def _state(self, entry):
+        if entry['state'] == OPEN and self.clock() - entry['opened_at'] >= entry['cooldown']:
+            entry['state'] = HALF_OPEN
+        return entry['state']
+
+    def allow(self, source):
+        """False while the source's circuit is open (one trial is allowed when half-open)"""
+        with self._lock:
+            entry = self._entry(source)
+            state = self._state(entry)
+            if state == CLOSED:
+                return True
+            # A trial that never reported back (cancelled, rate limited) expires after a cooldown
+            now = self.clock()
+            if state == HALF_OPEN and (entry['trial_at'] is None or now - entry['trial_at'] >= entry['cooldown']):
+                entry['trial_at'] = now
+                return True
+            entry['skipped'] += 1
+            return False
+
+    def record(self, source, chars, seconds, error=False):
+        """Record one fetch outcome: error for a failure, else a success or miss by chars"""
+        ok = not error and chars > MIN_CHARS
+        with self._lock:
+            entry = self._entry(source)
+            entry['samples'] += 1
+            entry['failures' if error else 'successes' if ok else 'misses'] += 1
+            entry['success_rate'] = _ewma(entry['success_rate'], 1.0 if ok else 0.0)
+            entry['avg_latency'] = _ewma(entry['avg_latency'], seconds)
+            if ok:
+                entry['avg_chars'] = _ewma(entry['avg_chars'], chars)
+
+            state = self._state(entry)
+            entry['trial_at'] = None
+            if not error:
+                entry['consecutive_failures'] = 0
+                entry['state'] = CLOSED
+                entry['cooldown'] = self.cooldown
+                return
+            entry['consecutive_failures'] += 1
+            if state == HALF_OPEN:
+                entry['cooldown'] = min(entry['cooldown'] * 2, MAX_COOLDOWN_SECONDS)
+            if state == HALF_OPEN or entry['consecutive_failures'] >= self.failure_threshold:
+                entry['state'] = OPEN
+                entry['opened_at'] = self.clock()
+
+    def score(self, source):
+        """Expected characters per second, or None without enough history"""
+        with self._lock:
+            entry = self._sources.get(source)
+            if entry is None or entry['samples'] < MIN_SAMPLES:
+                return None
+            return _score(entry)
+
+    def order(self, fetch_methods):
+        """Drop sources with an open circuit and sort the rest by score (see module docstring)"""
+        allowed = [(name, method) for name, method in fetch_methods if self.allow(name)]
+        scores = {name: self.score(name) for name, _ in allowed}
+        untested = [item for item in allowed if scores[item[0]] is None]
+        ranked = sorted((item for item in allowed if scores[item[0]] is not None),
+                        key=lambda item: -scores[item[0]])
+        return untested + ranked
+
+    def stats(self):
+        with self._lock:
+            report = {}
+            for source, entry in self._sources.items():
+                report[source] = {
+                    'state': self._state(entry),
+                    'samples': entry['samples'],
+                    'successes': entry['successes'],
+                    'misses': entry['misses'],
+                    'failures': entry['failures'],
+                    'skipped': entry['skipped'],
+                    'success_rate': _round(entry['success_rate']),
+                    'avg_chars': _round(entry['avg_chars'], 0),
+                    'avg_latency': _round(entry['avg_latency']),
+                    'score': _round(_score(entry), 1) if entry['samples'] >= MIN_SAMPLES else None,
+                }
+            return report
+
+
+def _ewma(previous, value):
+    return value if previous is None else ALPHA * value + (1 - ALPHA) * previous
+
+
+def _score(entry):
+    return (entry['success_rate'] or 0.0) * (entry['avg_chars'] or 0.0) / max(entry['avg_latency'] or 0.0, 0.05)
+
+
+def _round(value, digits=3):
+    return None if value is None else round(value, digits)
@@ -0,0 +1,74 @@
+"""
+Daily streak tracking for user_stats
+
+Page views call touch_streak() on every request. A user's streak can only change
+once per day, so after the first check of the day the answer is served from an
+in-process cache keyed by (user, day) and the database is not touched. When the
+day has changed, a single conditional UPDATE advances or resets the streak.
+"""
+from datetime import date, timedelta
+from cache import TTLCache
+
+# (user_id, 'YYYY-MM-DD') -> streak for that day
+streak_cache = TTLCache(max_entries=10000, ttl=24 * 60 * 60)
+
+# Callbacks run as (conn, user_id, streak) inside the transaction that moves a streak;
+# each may return a list of newly unlocked achievements (see touch_streak)
+on_streak_changed = []
+
+
+def parse_date(value):
+    try:
+        return date.fromisoformat(value[:10])
+    except (TypeError, ValueError):
+        return None
+
+
+def notify(conn, user_id, streak, unlocks):
+    for callback in on_streak_changed:
+        unlocked = callback(conn, user_id, streak)
+        if unlocked and unlocks is not None:
+            unlocks.extend(unlocked)
+
+
+def touch_streak(conn, user_id, today=None, unlocks=None):
+    """Record activity for today and return the user's current streak.
+
+    Achievements unlocked by a streak change are appended to `unlocks` if given.
+    """
+    today = today or date.today()
+    today_str = today.isoformat()
+    key = (user_id, today_str)
+
+    cached = streak_cache.get(key)
+    if cached is not None:
+        return cached
+
+    row = conn.execute('SELECT streak, last_activity FROM user_stats WHERE user_id = ?', (user_id,)).fetchone()
+
+    if row is None:
+        conn.execute('INSERT OR IGNORE INTO user_stats (user_id, streak, last_activity) VALUES (?, 1, ?)',
+                     (user_id, today_str))
+        streak = 1
+        notify(conn, user_id, streak, unlocks)
+        conn.commit()
+    else:
+        last_date = parse_date(row['last_activity'])
+        if last_date is not None and last_date >= today:
+            # Already counted today - read only
+            streak = row['streak']
+        else:
+            streak = (row['streak'] or 0) + 1 if last_date == today - timedelta(days=1) else 1
+            # Compare-and-set on the value we read, so only one worker moves the streak
+            cursor = conn.execute('''
+                UPDATE user_stats SET streak = ?, last_activity = ?
+                WHERE user_id = ? AND last_activity IS ?
+            ''', (streak, today_str, user_id, row['last_activity']))
+            if cursor.rowcount:
+                notify(conn, user_id, streak, unlocks)
+            conn.commit()
+            if not cursor.rowcount:
+                streak = conn.execute('SELECT streak FROM user_stats WHERE user_id = ?', (user_id,)).fetchone()[0]
+
+    streak_cache.set(key, streak)
+    return streak
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test script for the daily_activity rollup
+"""
+
+import sys
+from datetime import date, timedelta
+sys.path.insert(0, '.')
+
+import database
+import activity
+import quiz_sessions
+from app import app, init_db
+import testing_db
+from testing_db import make_conn
+
+TODAY = date(2026, 3, 10)
+
+def test_record_and_range():
+    """Increments accumulate per day and gaps are filled with zeros"""
+    print("🧪 Testing record_activity...")
+
+    conn = make_conn()
+    activity.record_activity(conn, 1, TODAY, quizzes=1, questions=5, correct=4, minutes=10)
+    activity.record_activity(conn, 1, TODAY, quizzes=1, questions=5, correct=5, minutes=7)
+    activity.record_activity(conn, 1, TODAY - timedelta(days=2), minutes=120)
+    activity.record_activity(conn, 2, TODAY, quizzes=1)
+    conn.commit()
+
+    days = activity.activity_days(conn, 1, 3, today=TODAY)
+    assert [day['date'] for day in days] == ['2026-03-08', '2026-03-09', '2026-03-10']
+    assert [day['has_activity'] for day in days] == [True, False, True]
+    assert days[2] == {'date': '2026-03-10', 'quizzes': 2, 'questions': 10, 'correct': 9, 'minutes': 17, 'has_activity': True}
+    assert days[0]['minutes'] == 120 and days[1]['quizzes'] == 0
+    print("  ✅ Totals accumulate per (user, day)\n")
+
+def test_range_uses_primary_key():
+    """The calendar query is a primary-key range scan, not a table scan"""
+    print("🧪 Testing query plan...")
+
+    conn = make_conn()
+    plan = ' '.join(row[3] for row in conn.execute('''
+        EXPLAIN QUERY PLAN
+        SELECT day, quizzes, questions, correct, minutes FROM daily_activity
+        WHERE user_id = ? AND day BETWEEN ? AND ?
+    ''', (1, '2026-01-01', '2026-12-31')))
+    assert 'SEARCH daily_activity USING PRIMARY KEY' in plan, plan
+    print(f"  ✅ {plan}\n")
+
+def test_rebuild_from_history():
+    """Backfill derives the same totals from study_history and schedules"""
+    print("🧪 Testing rebuild...")
+
+    conn = make_conn()
+    conn.executemany('INSERT INTO study_history (user_id, topic, score, study_duration, timestamp) VALUES (?, ?, ?, ?, ?)', [
+        (1, 'A', '3/5', 10, '2026-03-09 12:00:00'),
+        (1, 'B', '5/5', 20, '2026-03-09 13:00:00'),
+        (1, 'C', 'n/a', 5, '2026-03-10 12:00:00'),
+    ])
+    conn.execute('''INSERT INTO schedules (user_id, subject, topic_name, scheduled_date, estimated_hours, status, completed_at)
+                    VALUES (1, 'Math', 'Limits', '2026-03-10', 2, 'completed', '2026-03-10 15:00:00.123456')''')
+    conn.commit()
+
+    with conn:
+        assert activity.rebuild(conn) >= 2
+    found = activity.activity_range(conn, 1, date(2026, 3, 1), date(2026, 3, 31))
+
+    # Timestamps are UTC, so compare against the same conversion the backfill uses
+    history_day = conn.execute("SELECT date('2026-03-09 12:00:00', 'localtime')").fetchone()[0]
+    assert found[history_day]['quizzes'] >= 2
+    assert sum(row['correct'] for row in found.values()) == 8
+    assert sum(row['questions'] for row in found.values()) == 10
+    assert found['2026-03-10']['minutes'] >= 120
+    assert sum(row['minutes'] for row in found.values()) == 10 + 20 + 5 + 120
+    print(f"  ✅ {len(found)} days rebuilt\n")
+
+def test_endpoints_update_rollup():
+    """submit_quiz and complete_schedule feed the profile calendar and heatmap"""
+    print("🧪 Testing endpoints...")
+
+    db_path = testing_db.db_path()
+    init_db(db_path)
+    original_db = app.config['DATABASE']
+    app.config['DATABASE'] = db_path
+    try:
+        conn = database.connect(db_path)
+        conn.execute("INSERT INTO users (id, username, email, password_hash, full_name) VALUES (1, 'u', 'u@x', 'h', 'U')")
+        conn.execute("INSERT INTO schedules (id, user_id, subject, topic_name, scheduled_date, estimated_hours) VALUES (7, 1, 'Math', 'Limits', '2026-03-10', 1)")
+        question = {'question': 'Q?', 'options': ['a', 'b'], 'answer': 'a'}
+        quiz_sessions.store_session(conn, 'sess', 1, 'Topic', 'enabled', [], [{'quiz': [question, question]}])
+        conn.commit()
+
+        with app.test_client() as client:
+            with client.session_transaction() as sess:
+                sess['user_id'] = 1
+                sess['quiz_session_id'] = 'sess'
+
+            assert client.post('/submit_quiz', json={'segment_index': 0, 'answers': {'0': 'a'}, 'study_duration': 600}).status_code == 200
+            assert client.post('/api/complete_schedule/7').status_code == 200
+            assert client.post('/api/complete_schedule/7').status_code == 200  # repeat does not double count
+
+            response = client.get('/api/activity_heatmap')
+            assert response.status_code == 200
+            days = response.get_json()['days']
+            assert len(days) == activity.HEATMAP_DAYS and days[-1]['date'] == date.today().isoformat()
+            assert {k: days[-1][k] for k in ('quizzes', 'questions', 'correct', 'minutes')} == \
+                {'quizzes': 1, 'questions': 2, 'correct': 1, 'minutes': 10 + 60}
+
+            assert len(client.get('/api/activity_heatmap?days=7').get_json()['days']) == 7
+            assert client.get('/api/activity_heatmap?days=0').status_code == 400
+            assert client.get('/api/activity_heatmap?days=abc').status_code == 400
+        print("  ✅ Rollup maintained incrementally\n")
+    finally:
+        app.config['DATABASE'] = original_db
+
+def main():
+    """Run all tests"""
+    print("\n" + "="*60)
+    print("🚀 DAILY ACTIVITY TEST SUITE")
+    print("="*60 + "\n")
+
+    try:
+        test_record_and_range()
+        test_range_uses_primary_key()
+        test_rebuild_from_history()
+        test_endpoints_update_rollup()
+
+        print("="*60)
+        print("✅ ALL TESTS PASSED!")
+        print("="*60 + "\n")
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}\n")
+        return 1
+
+if __name__ == '__main__':
+    exit(main())
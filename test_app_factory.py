@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Test script for the create_app() factory and CLI commands
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+sys.path.insert(0, '.')
+
+import achievements
+import database
+import download_nltk_data
+import migrations
+import streaks
+import app as app_module
+from app import app, create_app
+import testing_db
+
+def background_threads():
+    return [thread.name for thread in threading.enumerate() if thread.name.startswith('studypal-')]
+
+def test_import_has_no_side_effects():
+    """Importing app only defines routes"""
+    print("🧪 Testing import side effects...")
+
+    assert app_module._multi_learner is None, "MultiSourceLearner is built on first use"
+    assert not app_module._background_started
+    assert 'studypal-maintenance' not in background_threads()
+    print("  ✅ No database, NLTK or thread work at import\n")
+
+def test_create_app():
+    """Each call builds its own configured app; threads start once per process"""
+    print("🧪 Testing create_app()...")
+
+    db_path = testing_db.db_path()
+    try:
+        created = create_app({'DATABASE': db_path, 'MAINTENANCE_ENABLED': False, 'BACKUP_INTERVAL': 0})
+        assert created is not app and created.config['DATABASE'] == db_path
+        assert app.config['DATABASE'] != db_path, "The module-level app is left alone"
+        assert 'studypal.login' in {rule.endpoint for rule in created.url_map.iter_rules()}
+        conn = database.connect(db_path)
+        assert migrations.current_version(conn) == migrations.MIGRATIONS[-1][0]
+        conn.close()
+        assert achievements.on_streak_changed in streaks.on_streak_changed
+
+        before = background_threads()
+        second = create_app({'DATABASE': db_path, 'MAINTENANCE_ENABLED': True})
+        assert second is not created
+        assert background_threads() == before, "Second call does not start threads"
+    finally:
+        app_module._background_started = False
+    print("  ✅ Separate apps, database migrated, background start guarded\n")
+
+def test_background_in_one_process():
+    """Workers that lose the background claim start no reaper or backup thread"""
+    print("🧪 Testing background threads across workers...")
+
+    db_path = testing_db.db_path()
+    claim = f'import maintenance; print(maintenance.claim_background({db_path!r}), flush=True); import time; time.sleep(30)'
+    other_worker = subprocess.Popen([sys.executable, '-c', claim], stdout=subprocess.PIPE, text=True)
+    try:
+        assert other_worker.stdout.readline().strip() == 'True'
+        before = background_threads()
+        create_app({'DATABASE': db_path, 'MAINTENANCE_ENABLED': True, 'BACKUP_INTERVAL': 3600})
+        assert app_module._background_started
+        assert background_threads() == before, "Only the claiming worker runs background threads"
+    finally:
+        other_worker.kill()
+        other_worker.wait()
+        other_worker.stdout.close()
+        app_module._background_started = False
+    print("  ✅ No maintenance or backup thread in the second worker\n")
+
+def test_learner_built_once():
+    """Concurrent first requests share one MultiSourceLearner"""
+    print("🧪 Testing get_multi_learner() under concurrency...")
+
+    built = []
+    original_class = app_module.MultiSourceLearner
+
+    def slow_learner(**kwargs):
+        time.sleep(0.05)
+        built.append(kwargs)
+        return original_class(**kwargs)
+
+    app_module.MultiSourceLearner = slow_learner
+    learners = []
+    start = threading.Barrier(8)
+
+    def first_request():
+        with app.app_context():
+            start.wait()
+            learners.append(app_module.get_multi_learner())
+
+    try:
+        threads = [threading.Thread(target=first_request) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        app_module.MultiSourceLearner = original_class
+        app_module._multi_learner = None
+    assert len(built) == 1 and len({id(learner) for learner in learners}) == 1
+
+    # Scripts outside an app context pass the config themselves
+    db_path = testing_db.make_db()
+    try:
+        learner = app_module.get_multi_learner(dict(app.config, DATABASE=db_path))
+        assert learner.cache.db_path == db_path and app_module.get_multi_learner() is learner
+    finally:
+        app_module._multi_learner = None
+    print("  ✅ One learner for 8 concurrent first requests\n")
+
+def test_cli_commands():
+    """init-db and fetch-nltk are registered on app.cli"""
+    print("🧪 Testing CLI commands...")
+
+    db_path = testing_db.db_path()
+    original_db = app.config['DATABASE']
+    app.config['DATABASE'] = db_path
+    try:
+        runner = app.test_cli_runner()
+
+        result = runner.invoke(args=['init-db'])
+        assert result.exit_code == 0 and 'Database initialized' in result.output
+        assert os.path.exists(db_path)
+
+        original_missing, original_download = download_nltk_data.missing_datasets, download_nltk_data.download
+        requested = []
+        download_nltk_data.missing_datasets = lambda: ['stopwords']
+        download_nltk_data.download = lambda datasets: requested.extend(datasets) or []
+        try:
+            result = runner.invoke(args=['fetch-nltk'])
+        finally:
+            download_nltk_data.missing_datasets, download_nltk_data.download = original_missing, original_download
+        assert result.exit_code == 0 and requested == ['stopwords'], result.output
+        print("  ✅ flask --app app init-db / fetch-nltk\n")
+    finally:
+        app.config['DATABASE'] = original_db
+
+def test_nltk_presence_check():
+    """The presence check only reports known datasets and does not download"""
+    print("🧪 Testing NLTK presence check...")
+
+    missing = download_nltk_data.missing_datasets()
+    assert set(missing) <= set(download_nltk_data.DATASETS)
+    print(f"  ✅ Missing locally: {missing or 'none'}\n")
+
+def main():
+    """Run all tests"""
+    print("\n" + "="*60)
+    print("🚀 APP FACTORY TEST SUITE")
+    print("="*60 + "\n")
+
+    try:
+        test_import_has_no_side_effects()
+        test_create_app()
+        test_background_in_one_process()
+        test_learner_built_once()
+        test_cli_commands()
+        test_nltk_presence_check()
+
+        print("="*60)
+        print("✅ ALL TESTS PASSED!")
+        print("="*60 + "\n")
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}\n")
+        return 1
+
+if __name__ == '__main__':
+    exit(main())
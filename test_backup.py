@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test script for online backups
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import threading
+sys.path.insert(0, '.')
+
+import backup
+import database
+import migrations
+import testing_db
+
+def make_db(rows=2000):
+    db_path = testing_db.db_path()
+    conn = database.connect(db_path)
+    migrations.migrate(conn)
+    conn.executemany('INSERT INTO study_history (user_id, topic, score, quiz_data) VALUES (1, ?, ?, randomblob(2000))',
+                     [(f'Topic {i}', '1/1') for i in range(rows)])
+    conn.commit()
+    return db_path, conn
+
+def test_backup_is_verified_copy():
+    """A backup is a complete, integrity-checked copy"""
+    print("🧪 Testing backup()...")
+
+    db_path, conn = make_db()
+    backup_dir = testing_db.temp_dir()
+    path = backup.backup(db_path, backup_dir, pages=16, sleep=0)
+
+    assert os.path.exists(path) and not os.path.exists(path + '.partial')
+    assert backup.verify(path)
+    copy = sqlite3.connect(path)
+    assert copy.execute('SELECT COUNT(*) FROM study_history').fetchone()[0] == 2000
+    assert copy.execute('SELECT MAX(version) FROM schema_version').fetchone()[0] == migrations.MIGRATIONS[-1][0]
+    copy.close()
+    print(f"  ✅ {backup.stats['last_pages']} pages in {backup.stats['last_seconds']}s\n")
+
+def test_retention():
+    """Only the newest backups are kept"""
+    print("🧪 Testing retention...")
+
+    db_path, conn = make_db(rows=10)
+    backup_dir = testing_db.temp_dir()
+    paths = [backup.backup(db_path, backup_dir, sleep=0, keep=3) for _ in range(5)]
+
+    assert backup.list_backups(backup_dir) == paths[:-4:-1]
+    assert backup.prune(backup_dir, keep=1) == paths[-2:-4:-1]
+    assert backup.list_backups(backup_dir) == [paths[-1]]
+    print("  ✅ Older backups pruned\n")
+
+def test_writes_during_backup():
+    """Writers keep committing while a slow paged backup runs, and the copy is one snapshot"""
+    print("🧪 Testing backup under concurrent writes...")
+
+    db_path, conn = make_db()
+    backup_dir = testing_db.temp_dir()
+    stop = threading.Event()
+    commits = []
+
+    def writer():
+        writer_conn = database.connect(db_path)
+        while not stop.is_set():
+            started = time.perf_counter()
+            writer_conn.execute("INSERT INTO study_history (user_id, topic, score) VALUES (2, 'During', '1/1')")
+            writer_conn.commit()
+            commits.append(time.perf_counter() - started)
+            time.sleep(0.002)
+        writer_conn.close()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    time.sleep(0.05)
+    path = backup.backup(db_path, backup_dir, pages=8, sleep=0.002)
+    stop.set()
+    thread.join()
+
+    copy = sqlite3.connect(path)
+    copied = copy.execute('SELECT COUNT(*) FROM study_history').fetchone()[0]
+    copy.close()
+    assert 2000 < copied < 2000 + len(commits), "Copy holds the rows committed before it started, not later ones"
+    assert len(commits) > 10 and max(commits) < 1.0, f"Writers stalled: {max(commits):.3f}s"
+    print(f"  ✅ {len(commits)} commits during backup, slowest {max(commits) * 1000:.1f} ms\n")
+
+def test_failed_verification_leaves_nothing():
+    """A copy that fails integrity_check is removed and counted"""
+    print("🧪 Testing failed verification...")
+
+    db_path, conn = make_db(rows=10)
+    backup_dir = testing_db.temp_dir()
+    failures = backup.stats['failures']
+
+    original = backup.verify
+    backup.verify = lambda path: False
+    try:
+        backup.backup(db_path, backup_dir, sleep=0)
+        assert False, "Expected DatabaseError"
+    except sqlite3.DatabaseError:
+        pass
+    finally:
+        backup.verify = original
+
+    assert os.listdir(backup_dir) == []
+    assert backup.stats['failures'] == failures + 1
+    print("  ✅ Partial file removed\n")
+
+def main():
+    """Run all tests"""
+    print("\n" + "="*60)
+    print("🚀 ONLINE BACKUP TEST SUITE")
+    print("="*60 + "\n")
+
+    try:
+        test_backup_is_verified_copy()
+        test_retention()
+        test_writes_during_backup()
+        test_failed_verification_leaves_nothing()
+
+        print("="*60)
+        print("✅ ALL TESTS PASSED!")
+        print("="*60 + "\n")
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}\n")
+        return 1
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test script for the quiz_data codec and its recompression migration
+"""
+
+import sys
+import json
+sys.path.insert(0, '.')
+
+import codec
+import migrations
+import testing_db
+
+QUIZ = {
+    'questions': ['Which process turns light energy into chemical energy in plants?'] * 10,
+    'user_answers': ['Photosynthesis'] * 10,
+    'correct_answers': ['Photosynthesis'] * 10,
+    'results': [True] * 10
+}
+
+def test_round_trip():
+    """Encoded values decode to the original, with a version byte in front"""
+    print("🧪 Testing encode/decode...")
+
+    blob = codec.encode(QUIZ)
+    assert blob[0] == codec.ZLIB_JSON
+    assert codec.decode(blob) == QUIZ
+    assert len(blob) < len(json.dumps(QUIZ)) / 4
+
+    tiny = codec.encode([])
+    assert tiny[0] == codec.RAW_JSON and codec.decode(tiny) == []
+
+    unicode_value = {'question': 'Qu’est-ce que la photosynthèse ? 🌱'}
+    assert codec.decode(codec.encode(unicode_value)) == unicode_value
+    print(f"  ✅ {len(json.dumps(QUIZ))} bytes -> {len(blob)} bytes\n")
+
+def test_legacy_values():
+    """Plain JSON text from older rows still decodes"""
+    print("🧪 Testing legacy JSON...")
+
+    assert codec.decode(json.dumps(QUIZ)) == QUIZ
+    assert codec.decode(json.dumps(QUIZ).encode('utf-8')) == QUIZ
+    assert codec.decode(None) is None
+    print("  ✅ Legacy text and bytes accepted\n")
+
+def test_recompress_migration():
+    """The migration rewrites legacy text rows in every quiz_data column"""
+    print("🧪 Testing recompression migration...")
+
+    conn = testing_db.make_conn()
+    conn.execute('INSERT INTO study_history (user_id, topic, score, quiz_data) VALUES (1, ?, ?, ?)',
+                 ('Plants', '10/10', json.dumps(QUIZ)))
+    conn.execute('INSERT INTO study_history (user_id, topic, score, quiz_data) VALUES (1, ?, ?, ?)',
+                 ('Broken', '0/0', 'not json'))
+    conn.execute('INSERT INTO temp_quiz_sessions (session_id, user_id, quiz_data, topic) VALUES (?, 1, ?, ?)',
+                 ('sess', json.dumps({'segments': [{'quiz': QUIZ['questions']}]}), 'Plants'))
+    conn.execute('INSERT INTO temp_quiz_segments (session_id, segment_index, quiz) VALUES (?, 0, ?)',
+                 ('sess', json.dumps(QUIZ['questions'])))
+    conn.commit()
+
+    migrations.recompress_quiz_data(conn)
+
+    types = [row[0] for row in conn.execute('SELECT typeof(quiz_data) FROM study_history ORDER BY id')]
+    assert types == ['blob', 'text'], "Unparseable rows are left alone"
+    assert codec.decode(conn.execute('SELECT quiz_data FROM study_history WHERE topic = ?', ('Plants',)).fetchone()[0]) == QUIZ
+    assert conn.execute("SELECT typeof(quiz_data) FROM temp_quiz_sessions").fetchone()[0] == 'blob'
+    assert codec.decode(conn.execute('SELECT quiz FROM temp_quiz_segments').fetchone()[0]) == QUIZ['questions']
+    print("  ✅ Legacy rows recompressed\n")
+
+def test_recompress_in_batches():
+    """Rows are rewritten batch by batch, unparseable ones skipped, composite keys included"""
+    print("🧪 Testing batched recompression...")
+
+    conn = testing_db.make_conn()
+    for i in range(23):
+        conn.execute('INSERT INTO study_history (user_id, topic, score, quiz_data) VALUES (1, ?, ?, ?)',
+                     (f'Topic {i}', '1/1', 'not json' if i % 4 == 0 else json.dumps(QUIZ)))
+        conn.execute('INSERT INTO temp_quiz_segments (session_id, segment_index, quiz) VALUES (?, ?, ?)',
+                     (f'sess{i % 3}', i, json.dumps([i])))
+    conn.commit()
+
+    original = migrations.BATCH_ROWS
+    migrations.BATCH_ROWS = 5
+    try:
+        migrations.recompress_quiz_data(conn)
+    finally:
+        migrations.BATCH_ROWS = original
+
+    types = [row[0] for row in conn.execute('SELECT typeof(quiz_data) FROM study_history ORDER BY id')]
+    assert types == ['text' if i % 4 == 0 else 'blob' for i in range(23)], types
+    segments = conn.execute('SELECT segment_index, quiz FROM temp_quiz_segments').fetchall()
+    assert len(segments) == 23 and all(codec.decode(quiz) == [index] for index, quiz in segments)
+    print("  ✅ 23 rows over batches of 5\n")
+
+def main():
+    """Run all tests"""
+    print("\n" + "="*60)
+    print("🚀 QUIZ DATA CODEC TEST SUITE")
+    print("="*60 + "\n")
+
+    try:
+        test_round_trip()
+        test_legacy_values()
+        test_recompress_migration()
+        test_recompress_in_batches()
+
+        print("="*60)
+        print("✅ ALL TESTS PASSED!")
+        print("="*60 + "\n")
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}\n")
+        return 1
+
+if __name__ == '__main__':
+    exit(main())
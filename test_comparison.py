@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Test script for N-way comparison queries
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+sys.path.insert(0, '.')
+
+import comparison
+import content_cache
+from app import MultiSourceLearner, segment_into_topics
+import testing_db
+
+ARTICLES = {
+    'Machine Learning': "Machine learning builds statistical models from data. Models learn patterns from "
+                        "training data and improve predictions. Feature engineering and regression are common. " * 4,
+    'Deep Learning': "Deep learning trains neural networks with many layers on data. Networks learn patterns "
+                     "from training data using backpropagation and gradient descent on GPUs. " * 4,
+    'Reinforcement Learning': "Reinforcement learning trains an agent from rewards. The agent learns patterns of "
+                              "actions from training data gathered by exploring an environment policy. " * 4,
+}
+
+def make_cache():
+    return content_cache.ContentCache(testing_db.make_db())
+
+def test_split_topics():
+    """Any number of sides split on vs / vs. / versus"""
+    print("🧪 Testing query splitting...")
+
+    assert comparison.split_topics('Machine Learning vs Deep Learning versus AI') == \
+        ['Machine Learning', 'Deep Learning', 'AI']
+    assert comparison.split_topics('TCP vs. UDP') == ['TCP', 'UDP']
+    assert comparison.split_topics('TCP vs TCP') == ['TCP']
+    assert comparison.split_topics('TCP vs tcp vs  Tcp ') == ['TCP']
+    assert not comparison.is_comparison('TCP vs tcp')
+    assert not comparison.is_comparison('Photosynthesis')
+    assert not comparison.is_comparison('Canvas vs')
+    print("  ✅ 2- and 3-way queries parsed\n")
+
+def test_compare_terms():
+    """Shared terms appear on every side; distinct terms on exactly one"""
+    print("🧪 Testing shared and distinct terms...")
+
+    counts = [Counter({'data': 3, 'patterns': 2, 'regression': 4}),
+              Counter({'data': 5, 'patterns': 1, 'networks': 2, 'gradient': 1}),
+              Counter({'data': 1, 'patterns': 2, 'agent': 3, 'gradient': 2})]
+    shared, distinct = comparison.compare_terms(counts)
+    assert shared == ['data', 'patterns'], shared
+    assert distinct == [['regression'], ['networks'], ['agent']], distinct
+    assert comparison.compare_terms([Counter(), Counter()]) == ([], [[], []])
+
+    terms = comparison.term_counts("The models learn from the data; data drives models.", topic='Machine Learning')
+    assert terms == Counter({'models': 2, 'data': 2, 'learn': 1, 'drives': 1}), terms
+    print(f"  ✅ shared={shared}\n")
+
+def test_sides_fetched_concurrently_through_cache():
+    """Three sides take about one fetch; a repeat is served from the content cache"""
+    print("🧪 Testing concurrent 3-way comparison...")
+
+    learner = MultiSourceLearner(cache=make_cache())
+    calls, active, peak = [], [0], [0]
+    lock = threading.Lock()
+
+    def fetch(query):
+        with lock:
+            calls.append(query)
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.3)
+        with lock:
+            active[0] -= 1
+        return ARTICLES[query], f"Wikipedia: {query}"
+
+    learner.fetch_from_wikipedia = fetch
+    query = 'Machine Learning vs Deep Learning vs Reinforcement Learning'
+
+    started = time.perf_counter()
+    text, label = learner.fetch_comparison_content(query)
+    elapsed = time.perf_counter() - started
+    assert sorted(calls) == sorted(ARTICLES) and peak[0] == 3
+    assert elapsed < 0.6, f"Sides fetched serially: {elapsed:.2f}s"
+    assert text.startswith('COMPARISON: Machine Learning vs Deep Learning vs Reinforcement Learning')
+    assert '=== REINFORCEMENT LEARNING ===' in text
+    assert 'all involve' in text and 'patterns' in text.split('KEY SIMILARITIES:')[1]
+    assert 'is distinguished by' in text
+    assert label == 'Comparison: Wikipedia: Machine Learning & Wikipedia: Deep Learning & Wikipedia: Reinforcement Learning'
+
+    text_again, label = learner.fetch_comparison_content(query)
+    assert len(calls) == 3, "Second comparison must not fetch"
+    assert text_again == text and label.count('(cached)') == 3
+    print(f"  ✅ 3 sides in {elapsed * 1000:.0f} ms, repeat served from cache\n")
+
+def test_missing_side():
+    """A side with no article is left out; two or more found sides still compare"""
+    print("🧪 Testing missing side...")
+
+    learner = MultiSourceLearner()
+    learner.fetch_from_wikipedia = lambda query: (ARTICLES.get(query, ""), f"Wikipedia: {query}")
+
+    text, label = learner.fetch_comparison_content('Machine Learning vs Quantum Foam vs Deep Learning')
+    assert text.startswith('COMPARISON: Machine Learning vs Deep Learning') and 'both involve' in text
+    assert 'QUANTUM FOAM' not in text
+
+    assert learner.fetch_comparison_content('Machine Learning vs Quantum Foam') == ("", "")
+    print("  ✅ Comparison built from the sides that were found\n")
+
+def test_sides_in_flight_capped():
+    """A 6-way comparison keeps at most MAX_FETCHES_PER_SEARCH sides in flight"""
+    print("🧪 Testing comparison fan-out cap...")
+
+    learner = MultiSourceLearner()
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def fetch(query):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.1)
+        with lock:
+            active[0] -= 1
+        return ARTICLES['Machine Learning'], f"Wikipedia: {query}"
+
+    learner.fetch_from_wikipedia = fetch
+    text, label = learner.fetch_comparison_content(' vs '.join(f'Topic {i}' for i in range(6)))
+    assert text and label.count('Wikipedia:') == 6
+    assert peak[0] == MultiSourceLearner.MAX_FETCHES_PER_SEARCH, peak
+    print(f"  ✅ 6 sides, at most {peak[0]} at once\n")
+
+def test_one_deadline_per_search():
+    """A comparison that runs out the clock leaves the fan-out no fresh budget"""
+    print("🧪 Testing shared search deadline...")
+
+    learner = MultiSourceLearner(deadline=0.5)
+    calls = []
+
+    def slow_side(query):
+        time.sleep(1)
+        return ARTICLES['Machine Learning'], f"Wikipedia: {query}"
+
+    def network(query):
+        calls.append(query)
+        return ARTICLES['Deep Learning'], 'Network'
+
+    learner.fetch_from_wikipedia = slow_side
+    learner.fetch_from_simple_wikipedia = learner.fetch_from_duckduckgo = learner.fetch_from_web_search = network
+
+    segment_into_topics(ARTICLES['Deep Learning'], 'warm-up')     # first call loads NLTK data
+    started = time.perf_counter()
+    segments, sources = learner.search_and_learn('Machine Learning vs Deep Learning')
+    elapsed = time.perf_counter() - started
+    assert elapsed < 0.9, f"Deadline restarted after the comparison: {elapsed:.2f}s"
+    assert calls == [] and sources == ['AI-Generated Study Guide'], sources
+    print(f"  ✅ Whole search gave up after {elapsed * 1000:.0f} ms\n")
+
+def test_partial_comparison_not_cached():
+    """A side that misses the deadline is fetched again on the next search"""
+    print("🧪 Testing partial comparison caching...")
+
+    learner = MultiSourceLearner(cache=make_cache(), deadline=0.5)
+    slow = ['Reinforcement Learning']
+
+    def fetch(query):
+        if query in slow:
+            time.sleep(1)
+        return ARTICLES[query], f"Wikipedia: {query}"
+
+    learner.fetch_from_wikipedia = fetch
+    query = 'Machine Learning vs Deep Learning vs Reinforcement Learning'
+    _, sources = learner.search_and_learn(query)
+    assert sources == ['Comparison: Wikipedia: Machine Learning & Wikipedia: Deep Learning'], sources
+
+    slow.clear()
+    _, sources = learner.search_and_learn(query)
+    assert len(sources) == 1 and 'Wikipedia: Reinforcement Learning' in sources[0], sources
+    assert sources[0].count('(cached)') >= 2, sources
+    print("  ✅ Missing side filled in on the next search\n")
+
+def test_open_circuit_skips_sides():
+    """Comparison sides respect the Wikipedia circuit breaker"""
+    print("🧪 Testing comparison with an open circuit...")
+
+    learner = MultiSourceLearner()
+    calls = []
+    learner.fetch_from_wikipedia = lambda query: calls.append(query) or (ARTICLES[query], f"Wikipedia: {query}")
+    for _ in range(3):
+        learner.health.record('wikipedia', 0, 5.0, error=True)
+
+    assert learner.fetch_comparison_content('Machine Learning vs Deep Learning') == ("", "")
+    assert calls == [] and learner.health.stats()['wikipedia']['skipped'] == 2
+    print("  ✅ No side fetched while the circuit is open\n")
+
+def main():
+    """Run all tests"""
+    print("\n" + "="*60)
+    print("🚀 COMPARISON TEST SUITE")
+    print("="*60 + "\n")
+
+    try:
+        test_split_topics()
+        test_compare_terms()
+        test_sides_fetched_concurrently_through_cache()
+        test_missing_side()
+        test_sides_in_flight_capped()
+        test_one_deadline_per_search()
+        test_partial_comparison_not_cached()
+        test_open_circuit_skips_sides()
+
+        print("="*60)
+        print("✅ ALL TESTS PASSED!")
+        print("="*60 + "\n")
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}\n")
+        return 1
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent content cache
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import content_cache
+import database
+from app import MultiSourceLearner
+import testing_db
+
+ARTICLE = "Photosynthesis is the process by which plants turn light into chemical energy. " * 10
+
+def make_cache(**kwargs):
+    return content_cache.ContentCache(testing_db.make_db(), **kwargs)
+
+def test_round_trip():
+    """Entries are keyed by normalized query and source"""
+    print("🧪 Testing get/set...")
+
+    cache = make_cache()
+    assert cache.get('Photosynthesis', 'wikipedia') is None
+    cache.set('Photosynthesis', 'wikipedia', ARTICLE, 'Wikipedia: Photosynthesis')
+
+    assert cache.get('  photosynthesis ', 'wikipedia') == (ARTICLE, 'Wikipedia: Photosynthesis')
+    assert cache.get('Photosynthesis', 'duckduckgo') is None
+    stats = cache.stats()
+    assert stats['hits'] == 1 and stats['misses'] == 2
+    print(f"  ✅ Hit rate {stats['hit_rate']}\n")
+
+def test_ttl():
+    """Expired entries are not served and go first once the cache is over budget"""
+    print("🧪 Testing TTL expiry...")
+
+    size = len(content_cache.codec.encode({'text': ARTICLE, 'label': 'Wikipedia: Mitosis'}))
+    cache = make_cache(ttl=60, max_bytes=size * 3 // 2)
+    cache.set('Mitosis', 'wikipedia', ARTICLE, 'Wikipedia: Mitosis')
+    conn = database.pool.acquire(cache.db_path)
+    with conn:
+        conn.execute('UPDATE content_cache SET fetched_at = fetched_at - 120')
+
+    assert cache.get('Mitosis', 'wikipedia') is None
+    cache.set('Meiosis', 'wikipedia', ARTICLE, 'Wikipedia: Meiosis')
+    keys = [row[0] for row in conn.execute('SELECT query_key FROM content_cache')]
+    assert keys == ['meiosis'], keys
+    assert cache.stats()['evictions'] == 1
+    print("  ✅ Stale entry expired\n")
+
+def test_lru_eviction():
+    """Least recently used entries go first once max_bytes is exceeded"""
+    print("🧪 Testing LRU eviction...")
+
+    size = len(content_cache.codec.encode({'text': ARTICLE, 'label': 'x'}))
+    cache = make_cache(max_bytes=size * 3)
+    conn = database.pool.acquire(cache.db_path)
+    for i, topic in enumerate(['a', 'b', 'c']):
+        cache.set(topic, 'wikipedia', ARTICLE, 'x')
+        with conn:
+            conn.execute('UPDATE content_cache SET last_used = ? WHERE query_key = ?', (1000 + i, topic))
+    with conn:
+        conn.execute("UPDATE content_cache SET last_used = 2000 WHERE query_key = 'a'")
+
+    assert cache.total_bytes() == size * 3 and cache.stats()['evictions'] == 0, "At budget, nothing evicted"
+
+    cache.set('d', 'wikipedia', ARTICLE, 'x')
+    keys = sorted(row[0] for row in conn.execute('SELECT query_key FROM content_cache'))
+    assert keys == ['a', 'c', 'd'], keys
+    assert cache.stats()['evictions'] == 1
+    assert cache.total_bytes() == sum(row[0] for row in conn.execute('SELECT size FROM content_cache'))
+    print("  ✅ Oldest unused entry evicted\n")
+
+def test_caller_transaction_untouched():
+    """Cache reads and writes never commit or roll back the request connection's transaction"""
+    print("🧪 Testing cache isolation from the request transaction...")
+
+    cache = make_cache()
+    cache.set('Photosynthesis', 'wikipedia', ARTICLE, 'Wikipedia: Photosynthesis')
+    conn = database.pool.acquire(cache.db_path)
+    conn.execute("INSERT INTO users (username, email, password_hash, full_name) VALUES ('u', 'u@x', 'h', 'U')")
+    assert cache.get('Photosynthesis', 'wikipedia') is not None
+    assert conn.in_transaction, "The pending insert is still uncommitted"
+    conn.rollback()
+    assert conn.execute('SELECT COUNT(*) FROM users').fetchone()[0] == 0
+
+    cache.set('Mitosis', 'wikipedia', ARTICLE, 'Wikipedia: Mitosis')
+    assert not conn.in_transaction and not database.side_pool.acquire(cache.db_path).in_transaction
+    print("  ✅ Request transaction left alone\n")
+
+def test_search_and_learn_uses_cache():
+    """A repeated query is answered from the cache without fetching"""
+    print("🧪 Testing search_and_learn through the cache...")
+
+    learner = MultiSourceLearner(cache=make_cache())
+    calls = []
+
+    def fetch(query):
+        calls.append(query)
+        return ARTICLE, f"Wikipedia: {query}"
+
+    learner.fetch_from_wikipedia = fetch
+    learner.fetch_from_simple_wikipedia = learner.fetch_from_duckduckgo = \
+        learner.fetch_from_web_search = lambda query: ("", "")
+    segments, sources = learner.search_and_learn('Photosynthesis')
+    assert calls == ['Photosynthesis'] and sources == ['Wikipedia: Photosynthesis']
+
+    segments_again, sources = learner.search_and_learn('photosynthesis')
+    assert calls == ['Photosynthesis'], "Second lookup must not fetch"
+    assert sources == ['Wikipedia: Photosynthesis (cached)']
+    assert len(segments_again) == len(segments)
+    print("  ✅ Second search served from cache\n")
+
+def main():
+    """Run all tests"""
+    print("\n" + "="*60)
+    print("🚀 CONTENT CACHE TEST SUITE")
+    print("="*60 + "\n")
+
+    try:
+        test_round_trip()
+        test_ttl()
+        test_lru_eviction()
+        test_caller_transaction_untouched()
+        test_search_and_learn_uses_cache()
+
+        print("="*60)
+        print("✅ ALL TESTS PASSED!")
+        print("="*60 + "\n")
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}\n")
+        return 1
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test script for the pooled SQLite connection layer
+"""
+
+import sys
+import threading
+sys.path.insert(0, '.')
+
+import database
+from app import app, init_db, get_db_connection
+import testing_db
+
+def make_test_db():
+    """Create an initialized database in a temp directory"""
+    db_path = testing_db.db_path()
+    init_db(db_path)
+    return db_path
+
+def test_connection_pragmas():
+    """New connections come up in WAL mode with tuned settings"""
+    print("🧪 Testing connection pragmas...")
+    
+    conn = database.connect(make_test_db())
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1  # NORMAL
+    assert conn.execute('PRAGMA busy_timeout').fetchone()[0] == 5000
+    assert conn.execute('PRAGMA cache_size').fetchone()[0] == -16000
+    conn.close()
+    
+    print("  ✅ WAL, synchronous=NORMAL, busy_timeout and cache_size applied\n")
+
+def test_one_connection_per_request():
+    """Every helper in a request shares a single connection"""
+    print("🧪 Testing request-scoped connection...")
+    
+    original_db = app.config['DATABASE']
+    app.config['DATABASE'] = make_test_db()
+    try:
+        opened_before = database.pool.opened
+
+        with app.test_request_context('/'):
+            first = get_db_connection()
+            second = get_db_connection()
+            assert first is second, "Helpers should share the request connection"
+
+        with app.test_request_context('/'):
+            assert get_db_connection() is first, "Thread should reuse its pooled connection"
+
+        assert database.pool.opened - opened_before == 1
+        print("  ✅ One connection opened and reused across requests\n")
+    finally:
+        app.config['DATABASE'] = original_db
+
+def test_connections_are_per_thread():
+    """Threads never share a connection"""
+    print("🧪 Testing per-thread pool...")
+    
+    db_path = make_test_db()
+    seen = []
+    barrier = threading.Barrier(4)
+    
+    def worker():
+        seen.append(database.pool.acquire(db_path))
+        barrier.wait()  # keep every connection alive until all threads have one
+        database.pool.close_all()
+    
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    
+    assert len(set(id(conn) for conn in seen)) == 4
+    print(f"  ✅ {len(seen)} threads each got their own connection\n")
+
+def main():
+    """Run all tests"""
+    print("\n" + "="*60)
+    print("🚀 DATABASE LAYER TEST SUITE")
+    print("="*60 + "\n")
+    
+    try:
+        test_connection_pragmas()
+        test_one_connection_per_request()
+        test_connections_are_per_thread()
+        
+        print("="*60)
+        print("✅ ALL TESTS PASSED!")
+        print("="*60 + "\n")
+        return 0
+    
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}\n")
+        return 1
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared HTTP session used by the content fetchers
+"""
+
+import gzip
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, '.')
+
+import http_session
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Fails the first request to /flaky with 503, /down always; /slow stalls; gzipped JSON otherwise"""
+    protocol_version = 'HTTP/1.1'
+    failures_left = 1
+    client_ports = set()
+    encodings = []
+
+    def do_GET(self):
+        StubHandler.client_ports.add(self.client_address[1])
+        StubHandler.encodings.append(self.headers.get('Accept-Encoding', ''))
+        if self.path == '/slow':
+            time.sleep(2)
+        if self.path == '/down' or (self.path == '/flaky' and StubHandler.failures_left):
+            if self.path == '/flaky':
+                StubHandler.failures_left -= 1
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = gzip.compress(json.dumps({'path': self.path}).encode())
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def fresh_session():
+    """Rebuild the shared session without backoff sleeps"""
+    http_session.BACKOFF_SECONDS = 0
+    http_session._session = None
+
+def test_keep_alive_and_gzip():
+    """Sequential requests reuse one connection and are gzip-decoded"""
+    print("🧪 Testing connection reuse and compression...")
+
+    server, base = start_server()
+    original = http_session.BACKOFF_SECONDS
+    try:
+        fresh_session()
+        StubHandler.client_ports.clear()
+        for i in range(5):
+            assert http_session.get(f"{base}/page/{i}").json() == {'path': f'/page/{i}'}
+    finally:
+        http_session.BACKOFF_SECONDS = original
+        server.shutdown()
+
+    assert len(StubHandler.client_ports) == 1, f"{len(StubHandler.client_ports)} connections opened"
+    assert all('gzip' in encoding for encoding in StubHandler.encodings)
+    print("  ✅ 5 requests over 1 connection\n")
+
+def test_retry_on_503():
+    """Transient 5xx responses are retried and counted"""
+    print("🧪 Testing retry policy...")
+
+    server, base = start_server()
+    original = http_session.BACKOFF_SECONDS
+    retries = http_session.stats['retries']
+    try:
+        fresh_session()
+        StubHandler.failures_left = 1
+        response = http_session.get(f"{base}/flaky")
+    finally:
+        http_session.BACKOFF_SECONDS = original
+        server.shutdown()
+
+    assert response.status_code == 200
+    assert http_session.stats['retries'] == retries + 1
+    host = http_session.stats['hosts']['127.0.0.1']
+    print(f"  ✅ Recovered after one retry ({host} requests to stub host)\n")
+
+def test_deadline_caps_retries():
+    """Retries stop when they no longer fit the deadline; a stalled read ends at it"""
+    print("🧪 Testing deadline-bound fetches...")
+
+    server, base = start_server()
+    original = http_session.BACKOFF_SECONDS
+    try:
+        fresh_session()
+        response = http_session.get(f"{base}/down")
+        assert response.status_code == 503
+        assert len(response.raw.retries.history) == http_session.RETRIES
+
+        response = http_session.get(f"{base}/down", deadline=time.monotonic() + 1)
+        assert response.status_code == 503
+        assert not response.raw.retries.history, "Retried with no time for another attempt"
+
+        started = time.perf_counter()
+        try:
+            with http_session.deadline_scope(time.monotonic() + 0.3):
+                http_session.get(f"{base}/slow")
+            assert False, "Stalled read should time out"
+        except Exception as e:
+            assert not isinstance(e, AssertionError), e
+        elapsed = time.perf_counter() - started
+        assert elapsed < 1.0, f"Deadline not enforced: {elapsed:.2f}s"
+        assert http_session.time_left() is None
+    finally:
+        http_session.BACKOFF_SECONDS = original
+        server.shutdown()
+
+    print(f"  ✅ No retries past the deadline, stalled read ended after {elapsed * 1000:.0f} ms\n")
+
+def test_per_host_limit():
+    """With every connection to a host busy, a request waits until its deadline, not beyond"""
+    print("🧪 Testing per-host connection limit...")
+
+    import requests
+    server, base = start_server()
+    original = http_session.BACKOFF_SECONDS, http_session.PER_HOST_CONNECTIONS
+    http_session.PER_HOST_CONNECTIONS = 2
+    try:
+        fresh_session()
+        StubHandler.client_ports.clear()
+        busy = [threading.Thread(target=http_session.get, args=(f"{base}/slow",)) for _ in range(2)]
+        for thread in busy:
+            thread.start()
+        time.sleep(0.2)
+
+        started = time.perf_counter()
+        try:
+            http_session.get(f"{base}/page/blocked", deadline=time.monotonic() + 0.3)
+            assert False, "Request should not get a connection"
+        except requests.ConnectTimeout:
+            pass
+        elapsed = time.perf_counter() - started
+
+        for thread in busy:
+            thread.join()
+        assert http_session.get(f"{base}/page/after").status_code == 200
+    finally:
+        http_session.BACKOFF_SECONDS, http_session.PER_HOST_CONNECTIONS = original
+        http_session._session = None
+        server.shutdown()
+
+    assert 0.25 < elapsed < 1.0, f"Waited {elapsed:.2f}s for a connection"
+    assert len(StubHandler.client_ports) == 2, f"{len(StubHandler.client_ports)} connections opened"
+    print(f"  ✅ Gave up after {elapsed * 1000:.0f} ms with 2 connections busy\n")
+
+def test_wiki_transport_deadline():
+    """The Wikipedia client's transport retries within the deadline and ends stalled reads at it"""
+    print("🧪 Testing deadline-bound Wikipedia transport...")
+
+    import httpx
+    server, base = start_server()
+    original = http_session.BACKOFF_SECONDS
+    http_session.BACKOFF_SECONDS = 0
+    client = httpx.Client(transport=http_session.build_wiki_transport(), timeout=http_session._wiki_timeout())
+    try:
+        StubHandler.failures_left = 1
+        assert client.get(f"{base}/flaky").status_code == 200
+
+        with http_session.deadline_scope(time.monotonic() + 1):
+            assert client.get(f"{base}/down").status_code == 503
+
+        started = time.perf_counter()
+        try:
+            with http_session.deadline_scope(time.monotonic() + 0.3):
+                client.get(f"{base}/slow")
+            assert False, "Stalled read should time out"
+        except httpx.TimeoutException:
+            pass
+        elapsed = time.perf_counter() - started
+        assert elapsed < 1.0, f"Deadline not enforced: {elapsed:.2f}s"
+    finally:
+        client.close()
+        http_session.BACKOFF_SECONDS = original
+        server.shutdown()
+
+    print(f"  ✅ Retried a 503, stalled read ended after {elapsed * 1000:.0f} ms\n")
+
+def test_wikipedia_clients_are_shared():
+    """One wikipediaapi client per language, built once"""
+    print("🧪 Testing shared Wikipedia clients...")
+
+    en = http_session.wikipedia('en')
+    assert http_session.wikipedia('en') is en
+    assert http_session.wikipedia('simple') is not en
+    assert http_session.wikipedia('simple').language == 'simple'
+    print("  ✅ Clients reused per language\n")
+
+def main():
+    """Run all tests"""
+    print("\n" + "="*60)
+    print("🚀 HTTP SESSION TEST SUITE")
+    print("="*60 + "\n")
+
+    try:
+        test_keep_alive_and_gzip()
+        test_retry_on_503()
+        test_deadline_caps_retries()
+        test_per_host_limit()
+        test_wiki_transport_deadline()
+        test_wikipedia_clients_are_shared()
+
+        print("="*60)
+        print("✅ ALL TESTS PASSED!")
+        print("="*60 + "\n")
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}\n")
+        return 1
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Import-time budget for app.py
+
+Runs `python -X importtime -c "import app"` in a fresh interpreter and fails if
+a heavy optional dependency is imported at startup or if the import as a whole
+goes over budget. Upload parsers, scrapers and NLP code must load on first use.
+"""
+
+import os
+import subprocess
+import sys
+
+IMPORT_BUDGET_MS = 1000
+HEAVY_MODULES = ['numpy', 'joblib', 'nltk', 'sklearn', 'scipy', 'bs4', 'wikipediaapi', 'PyPDF2', 'pptx', 'requests']
+
+def profile_import(module='app'):
+    """Return {module name: cumulative microseconds} for a cold import of module"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if cumulative.strip().isdigit():
+            timings[name.strip()] = int(cumulative.strip())
+    return timings
+
+def test_no_heavy_imports():
+    """None of the heavy optional dependencies load when app is imported"""
+    print("🧪 Testing startup imports...")
+
+    timings = profile_import()
+    loaded = sorted({name.split('.')[0] for name in timings} & set(HEAVY_MODULES))
+    assert not loaded, f"Imported at startup: {loaded}"
+    print("  ✅ No heavy modules at import\n")
+
+def test_import_budget():
+    """Importing app stays within IMPORT_BUDGET_MS"""
+    print("🧪 Testing import-time budget...")
+
+    elapsed_ms = profile_import()['app'] / 1000
+    assert elapsed_ms < IMPORT_BUDGET_MS, f"import app took {elapsed_ms:.0f} ms (budget {IMPORT_BUDGET_MS} ms)"
+    print(f"  ✅ import app: {elapsed_ms:.0f} ms\n")
+
+def main():
+    """Run all tests"""
+    print("\n" + "="*60)
+    print("🚀 IMPORT TIME TEST SUITE")
+    print("="*60 + "\n")
+
+    try:
+        test_no_heavy_imports()
+        test_import_budget()
+
+        print("="*60)
+        print("✅ ALL TESTS PASSED!")
+        print("="*60 + "\n")
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}\n")
+        return 1
+
+if __name__ == '__main__':
+    exit(main())
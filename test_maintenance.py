@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script for temp_quiz_sessions maintenance (TTL reaper, caps, vacuum)
+"""
+
+import subprocess
+import sys
+sys.path.insert(0, '.')
+
+import maintenance
+import testing_db
+from testing_db import make_conn
+
+def add_session(conn, session_id, user_id, age_hours, size=1000):
+    conn.execute('''
+        INSERT INTO temp_quiz_sessions (session_id, user_id, quiz_data, topic, created_at)
+        VALUES (?, ?, ?, 'Topic', datetime('now', ?))
+    ''', (session_id, user_id, 'x' * size, f'-{age_hours} hours'))
+    conn.commit()
+
+def session_ids(conn):
+    return {row[0] for row in conn.execute('SELECT session_id FROM temp_quiz_sessions')}
+
+def test_reap_expired_in_batches():
+    """Expired sessions are deleted across several bounded batches"""
+    print("🧪 Testing TTL reaper...")
+    
+    conn = make_conn()
+    for i in range(25):
+        add_session(conn, f'old-{i}', 1, age_hours=30)
+    add_session(conn, 'fresh', 1, age_hours=1)
+    
+    deleted = []
+    maintenance.on_sessions_deleted.append(deleted.append)
+    batch_size = maintenance.BATCH_SIZE
+    maintenance.BATCH_SIZE = 10
+    try:
+        rows, freed = maintenance.reap_expired_sessions(conn)
+    finally:
+        maintenance.BATCH_SIZE = batch_size
+        maintenance.on_sessions_deleted.remove(deleted.append)
+    
+    assert rows == 25 and freed == 25 * 1000
+    assert [len(batch) for batch in deleted] == [10, 10, 5]
+    assert session_ids(conn) == {'fresh'}
+    print(f"  ✅ Reaped {rows} rows ({freed} bytes) in {len(deleted)} batches\n")
+
+def test_session_caps():
+    """Oldest sessions beyond the per-user and global caps are evicted"""
+    print("🧪 Testing session caps...")
+    
+    conn = make_conn()
+    for i in range(5):
+        add_session(conn, f'u1-{i}', 1, age_hours=5 - i)  # u1-4 is newest
+    for i in range(2):
+        add_session(conn, f'u2-{i}', 2, age_hours=10 + i)  # u2-0 is newer
+    
+    rows, _ = maintenance.enforce_session_caps(conn, per_user=3, total=4)
+    
+    assert rows == 3
+    assert session_ids(conn) == {'u1-4', 'u1-3', 'u1-2', 'u2-0'}
+    print(f"  ✅ Evicted {rows} sessions\n")
+
+def test_incremental_vacuum():
+    """Freed pages are returned to the filesystem"""
+    print("🧪 Testing incremental vacuum...")
+    
+    conn = make_conn()
+    assert conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2
+    for i in range(50):
+        add_session(conn, f's-{i}', 1, age_hours=48, size=20000)
+    maintenance.reap_expired_sessions(conn)
+    
+    pages = maintenance.incremental_vacuum(conn)
+    assert pages > 0
+    assert conn.execute('PRAGMA freelist_count').fetchone()[0] == 0
+    print(f"  ✅ Released {pages} pages\n")
+
+def test_background_claimed_by_one_process():
+    """Only the first process to ask runs background threads for a database"""
+    print("🧪 Testing background claim...")
+    
+    db_path = testing_db.db_path()
+    claim = f'import maintenance; print(maintenance.claim_background({db_path!r}), flush=True)'
+    first = subprocess.Popen([sys.executable, '-c', claim + '; import time; time.sleep(30)'],
+                             stdout=subprocess.PIPE, text=True)
+    try:
+        assert first.stdout.readline().strip() == 'True'
+        second = subprocess.run([sys.executable, '-c', claim], capture_output=True, text=True, timeout=30)
+        assert second.stdout.strip() == 'False', second.stdout + second.stderr
+    finally:
+        first.kill()
+        first.wait()
+        first.stdout.close()
+    
+    assert maintenance.claim_background(db_path), "Lock is released when its process exits"
+    maintenance._background_locks.pop(db_path + '.background.lock').close()
+    print("  ✅ Second process declined, lock freed on exit\n")
+
+def main():
+    """Run all tests"""
+    print("\n" + "="*60)
+    print("🚀 MAINTENANCE TEST SUITE")
+    print("="*60 + "\n")
+    
+    try:
+        test_reap_expired_in_batches()
+        test_session_caps()
+        test_incremental_vacuum()
+        test_background_claimed_by_one_process()
+        
+        print("="*60)
+        print("✅ ALL TESTS PASSED!")
+        print("="*60 + "\n")
+        return 0
+    
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}\n")
+        return 1
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test script for the versioned schema migrations
+"""
+
+import json
+import sqlite3
+import sys
+sys.path.insert(0, '.')
+
+import database
+import migrations
+import testing_db
+
+def temp_db_path():
+    return testing_db.db_path()
+
+def test_fresh_database():
+    """A new database ends up at the latest version with all indexes"""
+    print("🧪 Testing fresh database migration...")
+    
+    conn = database.connect(temp_db_path())
+    applied = migrations.migrate(conn)
+    
+    latest = migrations.MIGRATIONS[-1][0]
+    assert applied == [m[0] for m in migrations.MIGRATIONS]
+    assert migrations.current_version(conn) == latest
+    
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+    for name in ['idx_study_history_user_time', 'idx_schedules_user_date', 'idx_temp_quiz_sessions_created']:
+        assert name in indexes, f"Missing index {name}"
+    
+    # Running again is a no-op
+    assert migrations.migrate(conn) == []
+    conn.close()
+    
+    print(f"  ✅ Migrated to version {latest}, second run applied nothing\n")
+
+def test_queries_use_indexes():
+    """Hot queries are served by the composite indexes"""
+    print("🧪 Testing query plans...")
+    
+    conn = database.connect(temp_db_path())
+    migrations.migrate(conn)
+    
+    plan = ' '.join(row[-1] for row in conn.execute('''
+        EXPLAIN QUERY PLAN SELECT * FROM schedules WHERE user_id = ? ORDER BY scheduled_date, start_time
+    ''', (1,)))
+    assert 'idx_schedules_user_date' in plan and 'TEMP B-TREE' not in plan, plan
+    
+    plan = ' '.join(row[-1] for row in conn.execute('''
+        EXPLAIN QUERY PLAN SELECT * FROM study_history WHERE user_id = ? ORDER BY timestamp DESC LIMIT 10
+    ''', (1,)))
+    assert 'idx_study_history_user_time' in plan and 'TEMP B-TREE' not in plan, plan
+    conn.close()
+    
+    print("  ✅ No full scans or temp sorts\n")
+
+def test_legacy_database():
+    """Old day_of_week schedules, missing columns and missing stats rows are upgraded"""
+    print("🧪 Testing legacy database upgrade...")
+    
+    conn = database.connect(temp_db_path())
+    conn.executescript('''
+        CREATE TABLE users (id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT UNIQUE NOT NULL,
+            email TEXT UNIQUE NOT NULL, password_hash TEXT NOT NULL, full_name TEXT NOT NULL,
+            bio TEXT, avatar_url TEXT, created_at TIMESTAMP, last_login TIMESTAMP);
+        CREATE TABLE user_stats (user_id INTEGER PRIMARY KEY, streak INTEGER DEFAULT 0,
+            last_activity DATE, total_quizzes INTEGER DEFAULT 0, correct_answers INTEGER DEFAULT 0);
+        CREATE TABLE study_history (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER,
+            topic TEXT, score TEXT, difficulty TEXT, timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        CREATE TABLE schedules (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER,
+            subject TEXT NOT NULL, day_of_week TEXT NOT NULL, start_time TEXT NOT NULL,
+            end_time TEXT NOT NULL, priority TEXT DEFAULT 'medium', notes TEXT,
+            completed INTEGER DEFAULT 0, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        INSERT INTO users (username, email, password_hash, full_name) VALUES ('a', 'a@x', 'h', 'A');
+        INSERT INTO users (username, email, password_hash, full_name) VALUES ('b', 'b@x', 'h', 'B');
+        INSERT INTO user_stats (user_id, streak) VALUES (1, 2);
+        INSERT INTO schedules (user_id, subject, day_of_week, start_time, end_time, completed)
+            VALUES (1, 'Math', 'Monday', '09:00', '11:00', 1);
+    ''')
+    
+    migrations.migrate(conn)
+    
+    assert 'quiz_data' in migrations.column_names(conn, 'study_history')
+    assert 'total_study_time' in migrations.column_names(conn, 'user_stats')
+    
+    stats = conn.execute('SELECT * FROM user_stats ORDER BY user_id').fetchall()
+    assert [row['user_id'] for row in stats] == [1, 2]
+    assert stats[0]['streak'] == 2 and stats[0]['total_questions'] == 0
+    
+    schedule = conn.execute('SELECT * FROM schedules').fetchone()
+    assert 'day_of_week' not in schedule.keys()
+    assert schedule['topic_name'] == 'Math' and schedule['status'] == 'completed'
+    assert schedule['scheduled_date']
+    conn.close()
+    
+    print("  ✅ Legacy schedules, columns and user_stats migrated\n")
+
+def test_backfills_from_history():
+    """Steps 9, 10 and 12 fill their tables from existing history with frozen SQL"""
+    print("🧪 Testing data backfills...")
+    
+    conn = database.connect(temp_db_path())
+    steps = migrations.MIGRATIONS
+    migrations.MIGRATIONS = [step for step in steps if step[0] <= 8]
+    try:
+        migrations.migrate(conn)
+    finally:
+        migrations.MIGRATIONS = steps
+    quiz = json.dumps({'questions': ['Q1?', 'Q2?'], 'results': [True, False]})
+    conn.execute("INSERT INTO user_stats (user_id, streak, total_quizzes, correct_answers, total_questions) VALUES (1, 3, 1, 1, 2)")
+    conn.execute("INSERT INTO study_history (user_id, topic, score, study_duration, quiz_data) VALUES (1, 'A', '1/2', 15, ?)", (quiz,))
+    conn.commit()
+    
+    migrations.migrate(conn)
+    assert conn.execute('SELECT quizzes, questions, correct, minutes FROM daily_activity').fetchone()[:] == (1, 2, 1, 15)
+    earned = {row[0] for row in conn.execute('SELECT achievement_id FROM user_achievements WHERE user_id = 1')}
+    assert '3day' in earned and not earned & {'7day', 'quiz10', 'accuracy70', 'perfect'}, earned
+    answers = conn.execute('SELECT question_index, is_correct FROM quiz_answers ORDER BY question_index').fetchall()
+    assert [tuple(row) for row in answers] == [(0, 1), (1, 0)]
+    conn.close()
+    
+    print("  ✅ daily_activity, user_achievements and quiz_answers backfilled\n")
+
+def test_incremental_vacuum_enabled_once():
+    """A database created without auto_vacuum is switched by a migration, not at runtime"""
+    print("🧪 Testing auto_vacuum migration...")
+    
+    path = temp_db_path()
+    legacy = sqlite3.connect(path)
+    legacy.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT)')
+    legacy.commit()
+    legacy.close()
+    
+    conn = database.connect(path)
+    assert conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 0
+    assert 15 in migrations.migrate(conn)
+    assert conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2
+    assert not conn.in_transaction
+    conn.close()
+    
+    print("  ✅ auto_vacuum=INCREMENTAL after migrating\n")
+
+def main():
+    """Run all tests"""
+    print("\n" + "="*60)
+    print("🚀 MIGRATIONS TEST SUITE")
+    print("="*60 + "\n")
+    
+    try:
+        test_fresh_database()
+        test_queries_use_indexes()
+        test_legacy_database()
+        test_backfills_from_history()
+        test_incremental_vacuum_enabled_once()
+        
+        print("="*60)
+        print("✅ ALL TESTS PASSED!")
+        print("="*60 + "\n")
+        return 0
+    
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}\n")
+        return 1
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test script for the offline Wikipedia corpus
+"""
+
+import bz2
+import json
+import math
+import os
+import shutil
+import sys
+sys.path.insert(0, '.')
+
+import offline_corpus
+from app import MultiSourceLearner
+import testing_db
+
+ARTICLE = "Photosynthesis is the process by which plants turn light into chemical energy. " * 10
+
+def write_dump(records, name='simplewiki.jsonl.bz2'):
+    path = os.path.join(testing_db.temp_dir(), name)
+    with bz2.open(path, 'wt', encoding='utf-8') as dump:
+        for record in records:
+            dump.write(record if isinstance(record, str) else json.dumps(record))
+            dump.write('\n')
+    return path
+
+def build_corpus(records):
+    corpus_dir = testing_db.temp_dir()
+    count = offline_corpus.build(offline_corpus.iter_dump(write_dump(records)), corpus_dir)
+    return offline_corpus.open_corpus(corpus_dir), count
+
+def test_build_and_lookup():
+    """A compressed dump is indexed and looked up by normalized title"""
+    print("🧪 Testing build and lookup...")
+
+    corpus, count = build_corpus([
+        {'id': '1', 'title': 'Photosynthesis', 'text': ARTICLE},
+        {'id': '2', 'title': 'Machine learning', 'text': 'Machine learning is a field of study.'},
+        {'id': '3', 'title': 'Photosynthesis', 'text': 'A later duplicate'},
+        'not json',
+        {'id': '4', 'title': 'Empty', 'text': '   '},
+        {'id': '5', 'title': 'Python (programming language)', 'text': 'Python is a programming language.'},
+    ])
+    assert count == 3 and len(corpus) == 3
+    assert corpus.article('photosynthesis') == ('Photosynthesis', ARTICLE.strip())
+    assert corpus.article('Machine_Learning')[0] == 'Machine learning'
+    assert corpus.article('Quantum foam') is None
+    assert corpus.lookup('machine learning')[0] == 'Machine learning'
+    assert corpus.article('Empty') is None
+    assert offline_corpus.open_corpus(testing_db.temp_dir()) is None
+    corpus.close()
+    print("  ✅ 3 articles indexed, duplicates and blanks skipped\n")
+
+def test_logarithmic_lookup_and_lazy_decompression():
+    """A lookup probes O(log n) index entries and decompresses one article"""
+    print("🧪 Testing index lookups...")
+
+    n = 20000
+    corpus_dir = testing_db.temp_dir()
+    offline_corpus.build(((f'Topic {i:05d}', f'Text of topic {i}. ' * 20) for i in range(n)), corpus_dir)
+    corpus = offline_corpus.open_corpus(corpus_dir)
+
+    probes, decodes = [], []
+    original_entry, original_decode = corpus._entry, offline_corpus.codec.decode
+    corpus._entry = lambda i: probes.append(i) or original_entry(i)
+    offline_corpus.codec.decode = lambda blob: decodes.append(len(blob)) or original_decode(blob)
+    try:
+        for i in (0, 12345, n - 1):
+            probes.clear()
+            title, text = corpus.article(f'topic {i:05d}')
+            assert title == f'Topic {i:05d}' and text.startswith(f'Text of topic {i}.')
+            assert len(probes) <= math.ceil(math.log2(n)) + 1, len(probes)
+        probes.clear()
+        assert corpus.article('Topic 99999') is None
+        assert len(probes) <= math.ceil(math.log2(n)) + 1
+    finally:
+        offline_corpus.codec.decode = original_decode
+    assert len(decodes) == 3, "Only the requested articles are decompressed"
+    corpus.close()
+    print(f"  ✅ At most {math.ceil(math.log2(n)) + 1} probes over {n} titles\n")
+
+def test_external_sort_across_runs():
+    """Titles spilled over several sorted runs merge into one index; first duplicate wins"""
+    print("🧪 Testing multi-run index build...")
+
+    records = [(f'Topic {i:04d}', f'First {i}') for i in range(997, -1, -1)]
+    records += [('topic 0500', 'Later duplicate'), ('Topic 0002', 'Later duplicate')]
+    corpus_dir = testing_db.temp_dir()
+    original = offline_corpus.RUN_ENTRIES
+    offline_corpus.RUN_ENTRIES = 64
+    try:
+        count = offline_corpus.build(iter(records), corpus_dir)
+    finally:
+        offline_corpus.RUN_ENTRIES = original
+
+    corpus = offline_corpus.open_corpus(corpus_dir)
+    assert count == len(corpus) == 998
+    keys = [corpus._key(corpus._entry(i)) for i in range(len(corpus))]
+    assert keys == sorted(keys) and len(set(keys)) == 998
+    assert corpus.article('Topic 0500') == ('Topic 0500', 'First 500')
+    assert corpus.article('topic 0002')[1] == 'First 2'
+    assert sorted(os.listdir(corpus_dir)) == ['articles.bin', 'titles.idx'], "Run files left behind"
+    corpus.close()
+    print(f"  ✅ {count} titles merged from {math.ceil(len(records) / 64)} runs\n")
+
+def test_mismatched_build_detected():
+    """An index paired with another build's articles is refused, not misread"""
+    print("🧪 Testing half-swapped corpus...")
+
+    old_dir, new_dir = testing_db.temp_dir(), testing_db.temp_dir()
+    offline_corpus.build(iter([('Photosynthesis', ARTICLE)]), old_dir)
+    offline_corpus.build(iter([('Chlorophyll', 'Green pigment. ' * 20), ('Photosynthesis', ARTICLE)]), new_dir)
+    # The state between build()'s two renames: new articles, old index
+    shutil.copy(os.path.join(new_dir, 'articles.bin'), os.path.join(old_dir, 'articles.bin'))
+
+    try:
+        offline_corpus.open_corpus(old_dir)
+        assert False, "Mismatched generations should be refused"
+    except offline_corpus.StaleCorpus:
+        pass
+    corpus = offline_corpus.open_corpus(new_dir)
+    assert corpus.article('photosynthesis')[1] == ARTICLE
+    corpus.close()
+    print("  ✅ StaleCorpus raised for mixed builds\n")
+
+def test_first_priority_source():
+    """A substantial offline hit answers search_and_learn without any network source"""
+    print("🧪 Testing offline source in search_and_learn...")
+
+    corpus, _ = build_corpus([{'title': 'Photosynthesis', 'text': ARTICLE}])
+    learner = MultiSourceLearner(offline=corpus)
+    calls = []
+
+    def network(query):
+        calls.append(query)
+        return "", ""
+
+    learner.fetch_from_wikipedia = learner.fetch_from_simple_wikipedia = network
+    learner.fetch_from_duckduckgo = learner.fetch_from_web_search = network
+
+    segments, sources = learner.search_and_learn('photosynthesis')
+    assert sources == ['Offline Wikipedia: Photosynthesis'] and segments
+    assert calls == [], "Network sources were not needed"
+
+    segments, sources = learner.search_and_learn('Chlorophyll')
+    assert len(calls) == 4 and sources == ['AI-Generated Study Guide']
+    corpus.close()
+    print("  ✅ Offline hit served with zero network calls\n")
+
+def main():
+    """Run all tests"""
+    print("\n" + "="*60)
+    print("🚀 OFFLINE CORPUS TEST SUITE")
+    print("="*60 + "\n")
+
+    try:
+        test_build_and_lookup()
+        test_logarithmic_lookup_and_lazy_decompression()
+        test_external_sort_across_runs()
+        test_mismatched_build_detected()
+        test_first_priority_source()
+
+        print("="*60)
+        print("✅ ALL TESTS PASSED!")
+        print("="*60 + "\n")
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}\n")
+        return 1
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test script for the normalized quiz_answers table
+"""
+
+import sys
+import json
+sys.path.insert(0, '.')
+
+import codec
+import database
+import migrations
+import quiz_answers
+import quiz_sessions
+from app import app, init_db
+import testing_db
+from testing_db import make_conn
+
+def quiz_data(results):
+    return {
+        'questions': [f'Question {i}?' for i in range(len(results))],
+        'user_answers': ['a'] * len(results),
+        'correct_answers': ['a' if ok else 'b' for ok in results],
+        'results': results
+    }
+
+def test_question_hash():
+    """Whitespace and case do not change a question's key"""
+    print("🧪 Testing question_hash...")
+
+    assert quiz_answers.question_hash('What is  DNA?') == quiz_answers.question_hash(' what is dna? ')
+    assert quiz_answers.question_hash('What is DNA?') != quiz_answers.question_hash('What is RNA?')
+    print("  ✅ Normalized hashes\n")
+
+def test_topic_accuracy():
+    """Per-topic accuracy comes from SQL over the user/topic index"""
+    print("🧪 Testing topic_accuracy...")
+
+    conn = make_conn()
+    quiz_answers.record_answers(conn, 1, 1, 'Biology', quiz_data([True, True, False, True]))
+    quiz_answers.record_answers(conn, 2, 1, 'Biology', quiz_data([False, True]))
+    quiz_answers.record_answers(conn, 3, 1, 'History', quiz_data([True]))
+    quiz_answers.record_answers(conn, 4, 2, 'History', quiz_data([False]))
+    conn.commit()
+
+    assert quiz_answers.topic_accuracy(conn, 1) == [
+        {'topic': 'Biology', 'answered': 6, 'correct': 4, 'accuracy': 66.7},
+        {'topic': 'History', 'answered': 1, 'correct': 1, 'accuracy': 100.0},
+    ]
+
+    plan = ' '.join(row[3] for row in conn.execute('''
+        EXPLAIN QUERY PLAN
+        SELECT topic, COUNT(*), SUM(is_correct) FROM quiz_answers WHERE user_id = ? GROUP BY topic
+    ''', (1,)))
+    assert 'COVERING INDEX idx_quiz_answers_user_topic' in plan, plan
+    print(f"  ✅ {plan}\n")
+
+def test_migration_backfill():
+    """Migration 12 normalizes existing history rows (compressed or legacy text) once"""
+    print("🧪 Testing migration 12 backfill...")
+
+    conn = database.connect(testing_db.db_path())
+    steps = migrations.MIGRATIONS
+    migrations.MIGRATIONS = [step for step in steps if step[0] < 12]
+    try:
+        migrations.migrate(conn)
+    finally:
+        migrations.MIGRATIONS = steps
+    conn.execute('INSERT INTO study_history (id, user_id, topic, score, quiz_data, timestamp) VALUES (1, 1, ?, ?, ?, ?)',
+                 ('Biology', '2/3', codec.encode(quiz_data([True, False, True])), '2026-03-10 12:00:00'))
+    conn.execute('INSERT INTO study_history (id, user_id, topic, score, quiz_data) VALUES (2, 1, ?, ?, ?)',
+                 ('History', '1/1', json.dumps(quiz_data([True]))))
+    conn.execute('INSERT INTO study_history (id, user_id, topic, score, quiz_data) VALUES (3, 1, ?, ?, ?)',
+                 ('Broken', '0/0', 'not json'))
+    conn.commit()
+
+    original = migrations.BATCH_ROWS
+    migrations.BATCH_ROWS = 1
+    try:
+        migrations.migrate(conn)
+        assert conn.execute('SELECT COUNT(*) FROM quiz_answers').fetchone()[0] == 4
+        migrations.create_quiz_answers(conn)
+        assert conn.execute('SELECT COUNT(*) FROM quiz_answers').fetchone()[0] == 4, "Re-running adds nothing"
+    finally:
+        migrations.BATCH_ROWS = original
+    row = conn.execute('SELECT answered_at, is_correct FROM quiz_answers WHERE history_id = 1 AND question_index = 1').fetchone()
+    assert tuple(row) == ('2026-03-10 12:00:00', 0)
+    assert conn.execute('SELECT question_hash FROM quiz_answers WHERE history_id = 2').fetchone()[0] == \
+        quiz_answers.question_hash('Question 0?'), "Frozen hash matches the app's"
+    conn.close()
+    print("  ✅ 4 answers backfilled\n")
+
+def test_submit_quiz_records_answers():
+    """/submit_quiz writes one row per question alongside the history row"""
+    print("🧪 Testing /submit_quiz...")
+
+    db_path = testing_db.db_path()
+    init_db(db_path)
+    original_db = app.config['DATABASE']
+    app.config['DATABASE'] = db_path
+    try:
+        conn = database.connect(db_path)
+        conn.execute("INSERT INTO users (id, username, email, password_hash, full_name) VALUES (1, 'u', 'u@x', 'h', 'U')")
+        questions = [{'question': f'Q{i}?', 'options': ['a', 'b'], 'answer': 'a'} for i in range(3)]
+        quiz_sessions.store_session(conn, 'sess', 1, 'Cells', 'enabled', [], [{'quiz': questions}])
+        conn.commit()
+
+        with app.test_client() as client:
+            with client.session_transaction() as sess:
+                sess['user_id'] = 1
+                sess['quiz_session_id'] = 'sess'
+
+            assert client.post('/submit_quiz', json={'segment_index': 0, 'answers': {'0': 'a', '1': 'b'}}).status_code == 200
+            topics = client.get('/api/topic_accuracy').get_json()['topics']
+
+        history_id = conn.execute('SELECT id FROM study_history').fetchone()[0]
+        rows = conn.execute('SELECT question_index, is_correct FROM quiz_answers WHERE history_id = ? ORDER BY question_index',
+                            (history_id,)).fetchall()
+        assert [tuple(row) for row in rows] == [(0, 1), (1, 0), (2, 0)]
+        assert topics == [{'topic': 'Cells', 'answered': 3, 'correct': 1, 'accuracy': 33.3}]
+        print("  ✅ Answers recorded and served\n")
+    finally:
+        app.config['DATABASE'] = original_db
+
+def main():
+    """Run all tests"""
+    print("\n" + "="*60)
+    print("🚀 QUIZ ANSWERS TEST SUITE")
+    print("="*60 + "\n")
+
+    try:
+        test_question_hash()
+        test_topic_accuracy()
+        test_migration_backfill()
+        test_submit_quiz_records_answers()
+
+        print("="*60)
+        print("✅ ALL TESTS PASSED!")
+        print("="*60 + "\n")
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}\n")
+        return 1
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test script for segment-addressable quiz session storage
+"""
+
+import sys
+import json
+sys.path.insert(0, '.')
+
+import codec
+import database
+import maintenance
+import quiz_sessions
+from cache import TTLCache
+from app import app, init_db
+import testing_db
+from testing_db import make_conn
+
+QUESTION = {'question': 'Capital of France?', 'options': ['Paris', 'Rome'], 'answer': 'Paris', 'type': 'Multiple Choice'}
+
+def make_segments(count):
+    return [{'title': f'Part {i}', 'content': ['Sentence.'] * 50, 'quiz': [dict(QUESTION)]} for i in range(count)]
+
+def test_load_single_segment():
+    """One segment's questions come back without the rest of the session"""
+    print("🧪 Testing segment lookup...")
+    
+    conn = make_conn()
+    quiz_sessions.store_session(conn, 'sess', 1, 'Geography', 'enabled', ['Test'], make_segments(30))
+    conn.commit()
+    
+    header = codec.decode(conn.execute('SELECT quiz_data FROM temp_quiz_sessions').fetchone()[0])
+    assert 'segments' not in header and header['segment_count'] == 30
+    
+    topic, questions = quiz_sessions.load_segment_quiz(conn, 'sess', 1, 7)
+    assert topic == 'Geography' and questions == [QUESTION]
+    assert quiz_sessions.load_segment_quiz(conn, 'sess', 1, 30) == ('Geography', None)
+    assert quiz_sessions.load_segment_quiz(conn, 'sess', 2, 0) is None, "Other users cannot read the session"
+    print("  ✅ Segment read by (session_id, segment_index)\n")
+
+def test_legacy_blob_sessions():
+    """Sessions stored as one JSON blob are still gradable"""
+    print("🧪 Testing legacy session rows...")
+    
+    conn = make_conn()
+    blob = json.dumps({'segments': make_segments(2), 'topic': 'Old', 'quiz_mode': 'enabled', 'sources': []})
+    conn.execute('INSERT INTO temp_quiz_sessions (session_id, user_id, quiz_data, topic) VALUES (?, ?, ?, ?)',
+                 ('legacy', 1, blob, 'Old'))
+    
+    assert quiz_sessions.load_segment_quiz(conn, 'legacy', 1, 1) == ('Old', [QUESTION])
+    assert quiz_sessions.load_segment_quiz(conn, 'legacy', 1, 5) == ('Old', None)
+    print("  ✅ Legacy blobs fall back to full decode\n")
+
+def test_reaper_removes_segments():
+    """Deleting a session removes its segment rows"""
+    print("🧪 Testing cascade on expiry...")
+    
+    conn = make_conn()
+    quiz_sessions.store_session(conn, 'sess', 1, 'Topic', 'enabled', [], make_segments(3))
+    conn.execute("UPDATE temp_quiz_sessions SET created_at = datetime('now', '-2 days')")
+    conn.commit()
+    
+    rows, freed = maintenance.reap_expired_sessions(conn)
+    assert rows == 1 and freed > 3 * len(json.dumps([QUESTION]))
+    assert conn.execute('SELECT COUNT(*) FROM temp_quiz_segments').fetchone()[0] == 0
+    print("  ✅ Segment rows deleted with their session\n")
+
+def test_ttl_cache():
+    """LRU order and TTL expiry are both honoured"""
+    print("🧪 Testing TTLCache...")
+    
+    lru = TTLCache(max_entries=2, ttl=60)
+    lru.set('a', 1)
+    lru.set('b', 2)
+    assert lru.get('a') == 1  # 'b' is now least recently used
+    lru.set('c', 3)
+    assert lru.get('b') is None and lru.get('a') == 1 and lru.get('c') == 3
+    
+    expiring = TTLCache(max_entries=2, ttl=-1)
+    expiring.set('a', 1)
+    assert expiring.get('a') is None and len(expiring) == 0
+    
+    stats = lru.stats()
+    assert stats['hits'] == 3 and stats['misses'] == 1 and stats['evictions'] == 1
+    print(f"  ✅ {stats}\n")
+
+def test_session_cache_read_through():
+    """Fresh sessions are graded from memory and invalidated by the reaper"""
+    print("🧪 Testing quiz session cache...")
+    
+    conn = make_conn()
+    quiz_sessions.session_cache.clear()
+    quiz_sessions.store_session(conn, 'cached', 1, 'Topic', 'enabled', [], make_segments(3))
+    assert quiz_sessions.session_cache.get('cached') is None, "Nothing is cached before commit"
+    conn.commit()
+    quiz_sessions.cache_session('cached', 1, 'Topic', make_segments(3))
+    
+    # Committed sessions are served without touching the database
+    assert quiz_sessions.get_segment_quiz(None, 'cached', 1, 2) == ('Topic', [QUESTION])
+    
+    # Misses read through and populate the cache
+    quiz_sessions.session_cache.clear()
+    assert quiz_sessions.get_segment_quiz(conn, 'cached', 1, 1) == ('Topic', [QUESTION])
+    assert quiz_sessions.get_segment_quiz(None, 'cached', 1, 1) == ('Topic', [QUESTION])
+    
+    # A rolled back session never reaches the cache
+    quiz_sessions.store_session(conn, 'aborted', 1, 'Topic', 'enabled', [], make_segments(1))
+    conn.rollback()
+    assert quiz_sessions.get_segment_quiz(conn, 'aborted', 1, 0) is None
+    
+    # Expired rows are dropped from the cache too
+    conn.execute("UPDATE temp_quiz_sessions SET created_at = datetime('now', '-2 days')")
+    conn.commit()
+    maintenance.reap_expired_sessions(conn)
+    assert quiz_sessions.get_segment_quiz(conn, 'cached', 1, 1) is None
+    print(f"  ✅ {quiz_sessions.session_cache.stats()}\n")
+
+def test_submit_quiz_endpoint():
+    """/submit_quiz grades a segment stored by store_session"""
+    print("🧪 Testing /submit_quiz...")
+    
+    db_path = testing_db.db_path()
+    init_db(db_path)
+    original_db = app.config['DATABASE']
+    app.config['DATABASE'] = db_path
+    try:
+        conn = database.connect(db_path)
+        conn.execute("INSERT INTO users (id, username, email, password_hash, full_name) VALUES (1, 'u', 'u@x', 'h', 'U')")
+        quiz_sessions.store_session(conn, 'sess', 1, 'Geography', 'enabled', [], make_segments(5))
+        conn.commit()
+
+        with app.test_client() as client:
+            with client.session_transaction() as sess:
+                sess['user_id'] = 1
+                sess['quiz_session_id'] = 'sess'
+
+            response = client.post('/submit_quiz', json={'segment_index': 4, 'answers': {'0': 'Paris'}, 'study_duration': 60})
+            assert response.status_code == 200, response.get_json()
+            assert response.get_json()['score'] == 1
+
+            response = client.post('/submit_quiz', json={'segment_index': 9, 'answers': {}})
+            assert response.status_code == 400
+
+        history = conn.execute('SELECT topic, score FROM study_history').fetchone()
+        assert tuple(history) == ('Geography', '1/1')
+        print("  ✅ Segment graded and recorded\n")
+    finally:
+        app.config['DATABASE'] = original_db
+
+def main():
+    """Run all tests"""
+    print("\n" + "="*60)
+    print("🚀 QUIZ SESSION STORAGE TEST SUITE")
+    print("="*60 + "\n")
+    
+    try:
+        test_load_single_segment()
+        test_legacy_blob_sessions()
+        test_reaper_removes_segments()
+        test_ttl_cache()
+        test_session_cache_read_through()
+        test_submit_quiz_endpoint()
+        
+        print("="*60)
+        print("✅ ALL TESTS PASSED!")
+        print("="*60 + "\n")
+        return 0
+    
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}\n")
+        return 1
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared token-bucket rate limiter
+"""
+
+import os
+import subprocess
+import sys
+import time
+sys.path.insert(0, '.')
+
+import database
+import http_session
+import rate_limit
+from testing_db import make_db
+
+def test_burst_then_queue():
+    """A full bucket serves its burst at once, then callers queue behind each other"""
+    print("🧪 Testing token bucket...")
+
+    limiter = rate_limit.RateLimiter(make_db(), limits={'wiki': (10.0, 2)}, max_wait=1)
+    now = 1000.0
+    waits = [limiter.reserve('wiki', now=now) for _ in range(4)]
+    assert [round(w, 3) for w in waits] == [0, 0, 0.1, 0.2], waits
+
+    # A second later the bucket has refilled to its burst size only
+    waits = [limiter.reserve('wiki', now=now + 10) for _ in range(3)]
+    assert [round(w, 3) for w in waits] == [0, 0, 0.1], waits
+    print("  ✅ Burst of 2, then 100 ms apart\n")
+
+def test_max_wait():
+    """Callers that would wait too long are refused without taking a token"""
+    print("🧪 Testing max_wait...")
+
+    limiter = rate_limit.RateLimiter(make_db(), limits={'ddg': (1.0, 1)}, max_wait=0.5)
+    assert limiter.reserve('ddg', now=50.0) == 0
+    try:
+        limiter.reserve('ddg', now=50.0)
+        assert False, "Expected RateLimited"
+    except rate_limit.RateLimited:
+        pass
+    assert round(limiter.reserve('ddg', now=50.6), 3) == 0.4, "Refused call left the bucket untouched"
+    assert limiter.stats()['ddg']['rejected'] == 1
+    assert limiter.acquire('unlimited') == 0
+    print("  ✅ Refused past max_wait\n")
+
+def test_deadline_caps_wait():
+    """A fetch bound to a deadline is refused instead of sleeping past it"""
+    print("🧪 Testing deadline-bound throttling...")
+
+    from app import MultiSourceLearner
+    limiter = rate_limit.RateLimiter(make_db(), limits={'duckduckgo': (1.0, 1)}, max_wait=5)
+    learner = MultiSourceLearner(limiter=limiter)
+    learner.throttle('duckduckgo')
+
+    started = time.perf_counter()
+    try:
+        with http_session.deadline_scope(time.monotonic() + 0.3):
+            learner.throttle('duckduckgo')
+        assert False, "Expected RateLimited"
+    except rate_limit.RateLimited:
+        pass
+    elapsed = time.perf_counter() - started
+    assert elapsed < 0.2, f"Slept {elapsed:.2f}s before giving up"
+    stats = limiter.stats()['duckduckgo']
+    assert stats['acquired'] == 1 and stats['rejected'] == 1, stats
+
+    # The refused call took no token: an unbounded caller only waits for the refill
+    assert 0.5 < limiter.acquire('duckduckgo') <= 1.0
+    print(f"  ✅ Refused after {elapsed * 1000:.0f} ms, no token spent\n")
+
+def test_leaves_request_connection_alone():
+    """Reserving inside a caller's open transaction neither fails nor ends it"""
+    print("🧪 Testing reserve during a caller's transaction...")
+
+    db_path = make_db()
+    limiter = rate_limit.RateLimiter(db_path, limits={'wiki': (10.0, 2)})
+    conn = database.pool.acquire(db_path)
+    try:
+        conn.execute('BEGIN')
+        conn.execute('SELECT COUNT(*) FROM rate_limits').fetchone()
+        assert limiter.reserve('wiki', now=10.0) == 0
+        assert conn.in_transaction, "Caller's transaction was closed"
+        conn.rollback()
+        assert database.connect(db_path).execute('SELECT tokens FROM rate_limits').fetchone()[0] == 1
+    finally:
+        database.pool.close_all()
+    print("  ✅ Token taken on the side connection\n")
+
+def test_shared_across_processes():
+    """Several worker processes draw from one budget"""
+    print("🧪 Testing cross-process budget...")
+
+    db_path = make_db()
+    script = (
+        "import sys; sys.path.insert(0, '.'); import rate_limit\n"
+        f"limiter = rate_limit.RateLimiter({db_path!r}, limits={{'wiki': (20.0, 1)}}, max_wait=5)\n"
+        "for _ in range(10): limiter.acquire('wiki')\n"
+        "print(limiter.stats()['wiki']['wait_seconds'])\n"
+    )
+    started = time.perf_counter()
+    workers = [subprocess.Popen([sys.executable, '-c', script], stdout=subprocess.PIPE, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))) for _ in range(3)]
+    waited = [float(worker.communicate(timeout=60)[0]) for worker in workers]
+    elapsed = time.perf_counter() - started
+
+    # 30 tokens at 20/s with a burst of 1 cannot be handed out in under 1.45 s
+    assert elapsed >= 1.4, f"Budget not shared: 30 requests in {elapsed:.2f}s"
+    assert all(w > 0 for w in waited)
+    print(f"  ✅ 30 requests from 3 processes took {elapsed:.2f}s\n")
+
+def test_metrics():
+    """Queue waits are recorded per bucket"""
+    print("🧪 Testing wait metrics...")
+
+    limiter = rate_limit.RateLimiter(make_db(), limits={'wiki': (50.0, 1)})
+    for _ in range(3):
+        limiter.acquire('wiki')
+    stats = limiter.stats()['wiki']
+    assert stats['acquired'] == 3 and stats['waited'] >= 1
+    assert 0 < stats['max_wait'] <= 0.03 and stats['avg_wait'] > 0
+    print(f"  ✅ {stats}\n")
+
+def main():
+    """Run all tests"""
+    print("\n" + "="*60)
+    print("🚀 RATE LIMIT TEST SUITE")
+    print("="*60 + "\n")
+
+    try:
+        test_burst_then_queue()
+        test_max_wait()
+        test_deadline_caps_wait()
+        test_leaves_request_connection_alone()
+        test_shared_across_processes()
+        test_metrics()
+
+        print("="*60)
+        print("✅ ALL TESTS PASSED!")
+        print("="*60 + "\n")
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}\n")
+        return 1
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Test script for streamed schedule exports (txt, csv, ics)
+"""
+
+import sys
+import csv
+import io
+sys.path.insert(0, '.')
+
+import database
+import schedule_export
+import schedule_store
+from app import app, init_db
+import testing_db
+
+ITEMS = [
+    {'scheduled_date': '2026-01-05', 'start_time': '14:00', 'end_time': '16:00', 'subject': 'Math', 'unit_name': 'Calc',
+     'topic_name': 'Limits', 'difficulty': 'easy', 'estimated_hours': 2},
+    {'scheduled_date': '2026-01-05', 'start_time': '09:00', 'end_time': '11:00', 'subject': 'Math',
+     'topic_name': 'Series', 'difficulty': 'hard', 'estimated_hours': 2},
+    {'scheduled_date': '2026-01-07', 'start_time': '18:00', 'end_time': '20:00', 'subject': 'Math',
+     'topic_name': 'Proofs', 'difficulty': 'medium', 'estimated_hours': 2},
+]
+
+def make_db():
+    db_path = testing_db.db_path()
+    init_db(db_path)
+    conn = database.connect(db_path)
+    conn.execute("INSERT INTO users (id, username, email, password_hash, full_name) VALUES (1, 'u', 'u@x', 'h', 'U')")
+    conn.commit()
+    schedule_store.insert_bulk(conn, 1, ITEMS)
+    conn.execute("UPDATE schedules SET status = 'completed', notes = 'done, finally' WHERE topic_name = 'Series'")
+    conn.commit()
+    return db_path, conn
+
+def test_iter_schedule_order():
+    """Rows come back in calendar order across fetch batches"""
+    print("🧪 Testing iter_schedule...")
+
+    db_path, conn = make_db()
+    rows = list(schedule_store.iter_schedule(conn, 1, batch_size=1))
+    assert [row['topic_name'] for row in rows] == ['Series', 'Limits', 'Proofs']
+    assert list(schedule_store.iter_schedule(conn, 2)) == []
+    print("  ✅ Ordered by date, start time, id\n")
+
+def test_text_report():
+    """The text export keeps the original day-grouped layout and totals"""
+    print("🧪 Testing text export...")
+
+    db_path, conn = make_db()
+    text = ''.join(schedule_export.export_text(schedule_store.iter_schedule(conn, 1)))
+    assert text.startswith("MY AI-GENERATED STUDY SCHEDULE\n")
+    assert text.count("Monday, January 05, 2026") == 1
+    assert "✓ 09:00 - 11:00: Series (HARD)\n   Notes: done, finally\n" in text
+    assert "Total Topics: 3\nCompleted: 1\nRemaining: 2\nTotal Study Hours: 6\nProgress: 33.3%\n" in text
+
+    empty = ''.join(schedule_export.export_text([]))
+    assert "Total Topics: 0" in empty and "Progress: 0%" in empty
+    print("  ✅ Report matches the original format\n")
+
+def test_csv_export():
+    """CSV round-trips through csv.reader, including quoted commas"""
+    print("🧪 Testing CSV export...")
+
+    db_path, conn = make_db()
+    chunks = list(schedule_export.export_csv(schedule_store.iter_schedule(conn, 1)))
+    assert len(chunks) == 4, "Header plus one chunk per row"
+
+    rows = list(csv.DictReader(io.StringIO(''.join(chunks))))
+    assert [row['topic_name'] for row in rows] == ['Series', 'Limits', 'Proofs']
+    assert rows[0]['notes'] == 'done, finally' and rows[0]['status'] == 'completed'
+    print("  ✅ CSV rows parsed back\n")
+
+def test_ics_escaping_and_folding():
+    """Text values are escaped and long lines folded at 75 octets"""
+    print("🧪 Testing iCalendar helpers...")
+
+    assert schedule_export.ics_escape('a,b;c\\d\ne') == 'a\\,b\\;c\\\\d\\ne'
+
+    folded = schedule_export.ics_line('DESCRIPTION:' + 'é' * 100)
+    lines = folded[:-2].split('\r\n')
+    assert len(lines) > 1 and all(line.startswith(' ') for line in lines[1:])
+    assert all(len(line.encode('utf-8')) <= 75 for line in lines)
+    assert ''.join(line[1:] if i else line for i, line in enumerate(lines)) == 'DESCRIPTION:' + 'é' * 100
+    print("  ✅ Escaping and folding follow RFC 5545\n")
+
+def test_ics_export():
+    """Every schedule item becomes a VEVENT"""
+    print("🧪 Testing iCalendar export...")
+
+    db_path, conn = make_db()
+    conn.execute("INSERT INTO schedules (user_id, subject, topic_name, scheduled_date) VALUES (1, 'Art', 'Sketch', '2026-02-01')")
+    conn.commit()
+    calendar = ''.join(schedule_export.export_ics(schedule_store.iter_schedule(conn, 1)))
+
+    assert calendar.startswith('BEGIN:VCALENDAR\r\n') and calendar.endswith('END:VCALENDAR\r\n')
+    assert calendar.count('BEGIN:VEVENT') == 4
+    assert 'DTSTART:20260105T090000\r\nDTEND:20260105T110000\r\n' in calendar
+    assert 'DTSTART;VALUE=DATE:20260201\r\n' in calendar
+    assert 'X-STUDYVERSE-STATUS:COMPLETED' in calendar
+    assert 'done\\, finally' in calendar.replace('\r\n ', '')
+    print("  ✅ Calendar feed generated\n")
+
+def test_export_endpoint():
+    """/api/export_schedule streams each format and rejects unknown ones"""
+    print("🧪 Testing /api/export_schedule...")
+
+    db_path, conn = make_db()
+    original_db = app.config['DATABASE']
+    app.config['DATABASE'] = db_path
+    try:
+        with app.test_client() as client:
+            with client.session_transaction() as sess:
+                sess['user_id'] = 1
+
+            response = client.get('/api/export_schedule')
+            assert response.status_code == 200 and response.is_streamed
+            assert response.mimetype == 'text/plain'
+            assert 'study_schedule.txt' in response.headers['Content-disposition']
+            assert 'Total Topics: 3' in response.get_data(as_text=True)
+
+            for export_format, (mimetype, filename) in schedule_export.EXPORT_FORMATS.items():
+                response = client.get(f'/api/export_schedule?format={export_format}')
+                assert response.status_code == 200 and response.mimetype == mimetype
+                assert filename in response.headers['Content-disposition']
+                assert response.get_data(as_text=True)
+
+            assert client.get('/api/export_schedule?format=pdf').status_code == 400
+        print("  ✅ txt, csv and ics downloads streamed\n")
+    finally:
+        app.config['DATABASE'] = original_db
+
+def main():
+    """Run all tests"""
+    print("\n" + "="*60)
+    print("🚀 SCHEDULE EXPORT TEST SUITE")
+    print("="*60 + "\n")
+
+    try:
+        test_iter_schedule_order()
+        test_text_report()
+        test_csv_export()
+        test_ics_escaping_and_folding()
+        test_ics_export()
+        test_export_endpoint()
+
+        print("="*60)
+        print("✅ ALL TESTS PASSED!")
+        print("="*60 + "\n")
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}\n")
+        return 1
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Test script for bulk schedule persistence
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import schedule_store
+from app import app, init_db
+import testing_db
+from testing_db import make_conn
+
+def item(topic, day):
+    return {'subject': 'Math', 'topic_name': topic, 'scheduled_date': f'2026-01-{day:02d}',
+            'difficulty': 'easy', 'estimated_hours': 2}
+
+def test_bulk_insert_returns_ids():
+    """Returned ids match the stored rows in input order"""
+    print("🧪 Testing bulk insert ids...")
+    
+    conn = make_conn()
+    schedule_store.insert_bulk(conn, 2, [item('Other user', 1)])
+    items = [item(f'Topic {i}', i % 28 + 1) for i in range(50)]
+    ids = schedule_store.insert_bulk(conn, 1, items)
+    
+    assert len(ids) == 50 and None not in ids
+    for schedule_id, expected in zip(ids, items):
+        row = conn.execute('SELECT user_id, topic_name, status FROM schedules WHERE id = ?', (schedule_id,)).fetchone()
+        assert tuple(row) == (1, expected['topic_name'], 'pending')
+    print(f"  ✅ {len(ids)} ids returned in order\n")
+
+def test_dedupe():
+    """Items already scheduled (or repeated in the payload) are skipped"""
+    print("🧪 Testing de-duplication...")
+    
+    conn = make_conn()
+    schedule_store.insert_bulk(conn, 1, [item('Limits', 1), item('Derivatives', 2)])
+    
+    ids = schedule_store.insert_bulk(conn, 1, [item('Limits', 1), item('Integrals', 3), item('Integrals', 3), item('Limits', 4)], dedupe=True)
+    
+    assert ids[0] is None and ids[2] is None
+    assert ids[1] is not None and ids[3] is not None
+    assert conn.execute('SELECT COUNT(*) FROM schedules').fetchone()[0] == 4
+    
+    # Without dedupe everything is inserted, as before
+    assert None not in schedule_store.insert_bulk(conn, 1, [item('Limits', 1)])
+    print("  ✅ Duplicates skipped only when requested\n")
+
+def test_rollback_on_error():
+    """A failing item leaves no partial schedule behind"""
+    print("🧪 Testing transaction rollback...")
+    
+    conn = make_conn()
+    items = [item('Good', 1), {'subject': 'Math', 'topic_name': None, 'scheduled_date': '2026-01-02'}]
+    try:
+        schedule_store.insert_bulk(conn, 1, items)
+        assert False, "NOT NULL violation should raise"
+    except Exception as e:
+        assert 'NOT NULL' in str(e)
+    
+    assert conn.execute('SELECT COUNT(*) FROM schedules').fetchone()[0] == 0
+    assert not conn.in_transaction
+    print("  ✅ Nothing persisted\n")
+
+def test_inside_caller_transaction():
+    """An open transaction is neither committed nor rolled back by insert_bulk"""
+    print("🧪 Testing insert inside a caller's transaction...")
+    
+    conn = make_conn()
+    conn.execute("INSERT INTO users (id, username, email, password_hash, full_name) VALUES (1, 'u', 'u@x', 'h', 'U')")
+    ids = schedule_store.insert_bulk(conn, 1, [item('A', 1), item('B', 2)])
+    assert conn.in_transaction and len(ids) == 2
+    
+    try:
+        schedule_store.insert_bulk(conn, 1, [item('C', 3), {'subject': 'Math', 'topic_name': None}])
+        assert False, "NOT NULL violation should raise"
+    except Exception as e:
+        assert 'NOT NULL' in str(e)
+    assert conn.in_transaction, "Caller's transaction survives the failed insert"
+    
+    conn.rollback()
+    assert conn.execute('SELECT COUNT(*) FROM users').fetchone()[0] == 0
+    assert conn.execute('SELECT COUNT(*) FROM schedules').fetchone()[0] == 0
+    print("  ✅ Savepoint used, caller keeps control of commit\n")
+
+def test_keyset_pagination():
+    """Pages follow (scheduled_date, start_time, id) with no gaps or repeats, NULL times included"""
+    print("🧪 Testing keyset pagination...")
+    
+    conn = make_conn()
+    # Untimed rows hold NULL or '' and must page as one group ordered by id
+    items = [dict(item(f'Topic {i}', i % 5 + 1), start_time=['09:00', '14:00', None, ''][i % 4]) for i in range(23)]
+    schedule_store.insert_bulk(conn, 1, items)
+    
+    expected = [row[0] for row in conn.execute(
+        "SELECT id FROM schedules WHERE user_id = 1 ORDER BY scheduled_date, IFNULL(start_time, ''), id")]
+    plan = ' '.join(row[-1] for row in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM schedules WHERE user_id = 1 ORDER BY scheduled_date, IFNULL(start_time, ''), id"))
+    assert 'TEMP B-TREE' not in plan, plan
+    
+    seen, cursor, pages = [], None, 0
+    while True:
+        page, cursor = schedule_store.query_schedule(conn, 1, fields=['id'], limit=5, after=cursor)
+        seen.extend(row['id'] for row in page)
+        pages += 1
+        if cursor is None:
+            break
+    
+    assert seen == expected and pages == 5
+    print(f"  ✅ {len(seen)} rows over {pages} pages\n")
+
+def test_filters_and_projection():
+    """Date window, status and subject filters plus column projection"""
+    print("🧪 Testing filters and projection...")
+    
+    conn = make_conn()
+    schedule_store.insert_bulk(conn, 1, [item('A', 1), item('B', 5), item('C', 9), dict(item('D', 5), subject='Art')])
+    conn.execute("UPDATE schedules SET status = 'completed' WHERE topic_name = 'C'")
+    
+    rows, _ = schedule_store.query_schedule(conn, 1, date_from='2026-01-02', date_to='2026-01-09',
+                                            subject='Math', fields=['topic_name'])
+    assert rows == [{'topic_name': 'B'}, {'topic_name': 'C'}]
+    
+    rows, _ = schedule_store.query_schedule(conn, 1, status='completed')
+    assert [row['topic_name'] for row in rows] == ['C'] and 'notes' in rows[0]
+    
+    for bad in [dict(fields=['password_hash']), dict(limit=0), dict(after='not-a-cursor')]:
+        try:
+            schedule_store.query_schedule(conn, 1, **bad)
+            assert False, f"{bad} should be rejected"
+        except ValueError:
+            pass
+    print("  ✅ Filters, projection and validation work\n")
+
+def test_get_schedule_etag():
+    """Unchanged calendars revalidate with 304; any write changes the ETag"""
+    print("🧪 Testing /api/get_schedule ETag...")
+    
+    db_path = testing_db.db_path()
+    init_db(db_path)
+    original_db = app.config['DATABASE']
+    app.config['DATABASE'] = db_path
+    try:
+        with app.test_client() as client:
+            with client.session_transaction() as sess:
+                sess['user_id'] = 1
+
+            client.post('/api/save_bulk_schedule', json={'schedule': [item('Limits', 1), item('Series', 2)]})
+
+            first = client.get('/api/get_schedule?limit=1')
+            assert first.status_code == 200 and first.get_json()['next_cursor']
+            etag = first.headers['ETag']
+
+            again = client.get('/api/get_schedule?limit=1', headers={'If-None-Match': etag})
+            assert again.status_code == 304 and not again.data
+
+            other_params = client.get('/api/get_schedule?limit=2', headers={'If-None-Match': etag})
+            assert other_params.status_code == 200
+
+            for bad in ('0', '00', '-1', 'ten'):
+                assert client.get(f'/api/get_schedule?limit={bad}').status_code == 400, bad
+            huge = client.get('/api/get_schedule?limit=999999')
+            assert huge.status_code == 200 and len(huge.get_json()['schedule']) == 2
+
+            schedule_id = first.get_json()['schedule'][0]['id']
+            client.post(f'/api/complete_schedule/{schedule_id}')
+            changed = client.get('/api/get_schedule?limit=1', headers={'If-None-Match': etag})
+            assert changed.status_code == 200 and changed.headers['ETag'] != etag
+
+        print("  ✅ 304 while unchanged, new ETag after a write\n")
+    finally:
+        app.config['DATABASE'] = original_db
+
+def main():
+    """Run all tests"""
+    print("\n" + "="*60)
+    print("🚀 SCHEDULE STORE TEST SUITE")
+    print("="*60 + "\n")
+    
+    try:
+        test_bulk_insert_returns_ids()
+        test_dedupe()
+        test_rollback_on_error()
+        test_inside_caller_transaction()
+        test_keyset_pagination()
+        test_filters_and_projection()
+        test_get_schedule_etag()
+        
+        print("="*60)
+        print("✅ ALL TESTS PASSED!")
+        print("="*60 + "\n")
+        return 0
+    
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}\n")
+        return 1
+
+if __name__ == '__main__':
+    exit(main())
@@ -3,7 +3,7 @@
 Test script to verify search functionality
 """
 
-from app import multi_learner, segment_into_topics, generate_quiz_for_segment
+from app import app, init_db, get_multi_learner, segment_into_topics, generate_quiz_for_segment
 
 def test_search(query):
     print(f"\n{'='*60}")
@@ -11,7 +11,7 @@ def test_search(query):
     print(f"{'='*60}")
     
     # Search
-    segments, sources = multi_learner.search_and_learn(query)
+    segments, sources = get_multi_learner().search_and_learn(query)
     
     print(f"\nResults:")
     print(f"  Segments: {len(segments)}")
@@ -40,10 +40,12 @@ if __name__ == '__main__':
         "Photosynthesis"
     ]
     
+    init_db(app.config['DATABASE'])
     results = []
-    for query in tests:
-        success = test_search(query)
-        results.append((query, success))
+    with app.app_context():
+        for query in tests:
+            success = test_search(query)
+            results.append((query, success))
     
     print(f"\n{'='*60}")
     print("SUMMARY")
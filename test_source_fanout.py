@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test script for concurrent source fan-out in MultiSourceLearner
+"""
+
+import sys
+import time
+sys.path.insert(0, '.')
+
+from app import MultiSourceLearner
+
+ARTICLE = "Photosynthesis is the process by which plants turn light into chemical energy. " * 10
+SNIPPET = "Photosynthesis converts light energy into chemical energy that is stored in glucose molecules inside green plants."
+
+def slow(seconds, text, label):
+    def fetch(query):
+        time.sleep(seconds)
+        return text, label
+    return fetch
+
+def sources_of(learner):
+    return [(name, getattr(learner, f'fetch_from_{name}'))
+            for name in ('wikipedia', 'simple_wikipedia', 'duckduckgo', 'web_search')]
+
+def make_learner(deadline=2, **sources):
+    learner = MultiSourceLearner(deadline=deadline)
+    for name, fetch in sources.items():
+        setattr(learner, f'fetch_from_{name}', fetch)
+    return learner
+
+def test_first_substantial_wins():
+    """A fast substantial source is used without waiting for slower ones"""
+    print("🧪 Testing first-sufficient-wins...")
+
+    learner = make_learner(wikipedia=slow(1.5, ARTICLE, 'Wikipedia'),
+                           simple_wikipedia=slow(0.05, SNIPPET, 'Simple'),
+                           duckduckgo=slow(0.1, ARTICLE, 'DuckDuckGo'),
+                           web_search=slow(1.5, "", ""))
+    segments, sources = learner.search_and_learn('Photosynthesis')
+    assert sources == ['DuckDuckGo'], sources
+    assert segments
+
+    started = time.perf_counter()
+    results, timings = learner.fetch_concurrently('Photosynthesis', sources_of(learner))
+    elapsed = time.perf_counter() - started
+    assert [r[0] for r in results] == ['duckduckgo']
+    assert elapsed < 1.0, f"Waited for slow sources: {elapsed:.2f}s"
+    print(f"  ✅ Answered in {elapsed * 1000:.0f} ms\n")
+
+def test_deadline_keeps_partial_results():
+    """At the deadline, short results gathered so far are combined in priority order"""
+    print("🧪 Testing overall deadline...")
+
+    learner = make_learner(deadline=0.5,
+                           wikipedia=slow(3, ARTICLE, 'Wikipedia'),
+                           simple_wikipedia=slow(0.1, SNIPPET, 'Simple'),
+                           duckduckgo=slow(0.05, SNIPPET + ' Also light.', 'DuckDuckGo'),
+                           web_search=slow(3, ARTICLE, 'Web'))
+    started = time.perf_counter()
+    results, timings = learner.fetch_concurrently('Photosynthesis', sources_of(learner))
+    elapsed = time.perf_counter() - started
+
+    assert [r[0] for r in results] == ['simple_wikipedia', 'duckduckgo']
+    assert timings['wikipedia'] is None and timings['web_search'] is None
+    assert timings['duckduckgo'] < timings['simple_wikipedia']
+    assert elapsed < 1.0, f"Deadline not enforced: {elapsed:.2f}s"
+    print(f"  ✅ Returned after {elapsed * 1000:.0f} ms with {len(results)} partial results\n")
+
+def test_failing_source_is_isolated():
+    """An exception in one source does not affect the others"""
+    print("🧪 Testing failing source...")
+
+    def broken(query):
+        raise RuntimeError('boom')
+
+    learner = make_learner(wikipedia=broken,
+                           simple_wikipedia=slow(0, "", ""),
+                           duckduckgo=slow(0, "", ""),
+                           web_search=slow(0.05, ARTICLE, 'Web'))
+    segments, sources = learner.search_and_learn('Photosynthesis')
+    assert sources == ['Web'], sources
+    print("  ✅ Other sources still used\n")
+
+def test_busy_pool_counts_against_deadline():
+    """With every fetch slot taken, sources are dropped at the deadline instead of queueing"""
+    print("🧪 Testing exhausted fetch pool...")
+
+    learner = make_learner(deadline=0.3,
+                           wikipedia=slow(0, ARTICLE, 'Wikipedia'),
+                           simple_wikipedia=slow(0, SNIPPET, 'Simple'),
+                           duckduckgo=slow(0, SNIPPET, 'DuckDuckGo'),
+                           web_search=slow(0, ARTICLE, 'Web'))
+    held = 0
+    while MultiSourceLearner.fetch_slots.acquire(blocking=False):
+        held += 1
+    try:
+        started = time.perf_counter()
+        results, timings = learner.fetch_concurrently('Photosynthesis', sources_of(learner))
+        elapsed = time.perf_counter() - started
+    finally:
+        for _ in range(held):
+            MultiSourceLearner.fetch_slots.release()
+
+    assert results == [] and set(timings.values()) == {None}
+    assert elapsed < 0.6, f"Queued past the deadline: {elapsed:.2f}s"
+
+    # Once slots are back the same learner answers normally
+    results, _ = learner.fetch_concurrently('Photosynthesis', sources_of(learner))
+    assert [r[0] for r in results] in (['wikipedia'], ['web_search'])
+    print(f"  ✅ Gave up after {elapsed * 1000:.0f} ms, recovered once slots freed\n")
+
+def main():
+    """Run all tests"""
+    print("\n" + "="*60)
+    print("🚀 SOURCE FAN-OUT TEST SUITE")
+    print("="*60 + "\n")
+
+    try:
+        test_first_substantial_wins()
+        test_deadline_keeps_partial_results()
+        test_failing_source_is_isolated()
+        test_busy_pool_counts_against_deadline()
+
+        print("="*60)
+        print("✅ ALL TESTS PASSED!")
+        print("="*60 + "\n")
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}\n")
+        return 1
+
+if __name__ == '__main__':
+    exit(main())
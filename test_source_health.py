@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test script for per-source health tracking and circuit breaking
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import source_health
+from app import MultiSourceLearner
+
+ARTICLE = "Photosynthesis is the process by which plants turn light into chemical energy. " * 10
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_circuit_opens_and_recovers():
+    """Consecutive failures open the circuit; a half-open trial closes or reopens it"""
+    print("🧪 Testing circuit breaker...")
+
+    clock = FakeClock()
+    health = source_health.SourceHealth(failure_threshold=3, cooldown=60, clock=clock)
+    for _ in range(3):
+        assert health.allow('web_search')
+        health.record('web_search', 0, 10.0, error=True)
+    assert not health.allow('web_search'), "Open after 3 failures"
+
+    clock.now += 61
+    assert health.allow('web_search'), "Half-open trial after cooldown"
+    assert not health.allow('web_search'), "Only one trial at a time"
+    health.record('web_search', 0, 10.0, error=True)
+    assert health.stats()['web_search']['state'] == 'open'
+
+    clock.now += 61
+    assert not health.allow('web_search'), "Cooldown doubled after failed trial"
+    clock.now += 60
+    assert health.allow('web_search')
+    health.record('web_search', 2000, 1.0)
+    stats = health.stats()['web_search']
+    assert stats['state'] == 'closed' and stats['skipped'] == 3
+    print(f"  ✅ {stats}\n")
+
+def test_misses_do_not_trip():
+    """A source that answers "nothing here" stays closed; only errors open the circuit"""
+    print("🧪 Testing misses versus failures...")
+
+    health = source_health.SourceHealth(failure_threshold=3)
+    for _ in range(5):
+        health.record('wikipedia', 0, 0.2)
+    health.record('wikipedia', 0, 5.0, error=True)
+    health.record('wikipedia', 0, 5.0, error=True)
+    health.record('wikipedia', 40, 0.2)             # a stub article resets the failure run
+    health.record('wikipedia', 0, 5.0, error=True)
+    health.record('wikipedia', 0, 5.0, error=True)
+    stats = health.stats()['wikipedia']
+    assert stats['state'] == 'closed' and health.allow('wikipedia'), stats
+    assert (stats['misses'], stats['failures'], stats['successes']) == (6, 4, 0), stats
+    assert stats['success_rate'] == 0.0
+    print(f"  ✅ {stats['misses']} misses and {stats['failures']} scattered errors, circuit closed\n")
+
+def test_order_by_score():
+    """Untested sources go first; the rest are ranked by chars per second"""
+    print("🧪 Testing adaptive ordering...")
+
+    health = source_health.SourceHealth()
+    for _ in range(3):
+        health.record('wikipedia', 5000, 2.0)       # ~2500 chars/s
+        health.record('duckduckgo', 600, 0.2)       # ~3000 chars/s
+        health.record('simple_wikipedia', 3000, 0.5)
+    health.record('simple_wikipedia', 0, 0.5)       # one miss lowers its success rate
+
+    methods = [(name, None) for name in ('wikipedia', 'simple_wikipedia', 'duckduckgo', 'web_search')]
+    order = [name for name, _ in health.order(methods)]
+    assert order == ['web_search', 'simple_wikipedia', 'duckduckgo', 'wikipedia'], order
+    print(f"  ✅ {order}\n")
+
+def test_search_skips_open_circuit():
+    """search_and_learn stops calling a source that keeps failing"""
+    print("🧪 Testing search_and_learn with a failing source...")
+
+    learner = MultiSourceLearner()
+    calls = []
+
+    def broken(query):
+        calls.append(query)
+        raise ConnectionError('connection refused')
+
+    learner.fetch_from_wikipedia = lambda query: (ARTICLE, 'Wikipedia')
+    learner.fetch_from_simple_wikipedia = learner.fetch_from_duckduckgo = lambda query: ("", "")
+    learner.fetch_from_web_search = broken
+
+    for i in range(5):
+        learner.fetch_concurrently(f'topic {i}', learner.health.order([
+            ('wikipedia', learner.fetch_from_wikipedia),
+            ('web_search', learner.fetch_from_web_search)]))
+    assert len(calls) == source_health.FAILURE_THRESHOLD, calls
+
+    segments, sources = learner.search_and_learn('Photosynthesis')
+    assert sources == ['Wikipedia']
+    assert learner.health.stats()['web_search']['state'] == 'open'
+    print(f"  ✅ web_search called {len(calls)} times, then skipped\n")
+
+def main():
+    """Run all tests"""
+    print("\n" + "="*60)
+    print("🚀 SOURCE HEALTH TEST SUITE")
+    print("="*60 + "\n")
+
+    try:
+        test_circuit_opens_and_recovers()
+        test_misses_do_not_trip()
+        test_order_by_score()
+        test_search_skips_open_circuit()
+
+        print("="*60)
+        print("✅ ALL TESTS PASSED!")
+        print("="*60 + "\n")
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}\n")
+        return 1
+
+if __name__ == '__main__':
+    exit(main())
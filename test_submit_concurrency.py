@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Concurrency test: many threads hammering /submit_quiz must not lose stats updates
+"""
+
+import sys
+import threading
+sys.path.insert(0, '.')
+
+import database
+import quiz_sessions
+from app import app, init_db
+import testing_db
+
+THREADS = 8
+SUBMISSIONS_PER_THREAD = 10
+QUESTIONS = [
+    {'question': 'Q1?', 'options': ['A', 'B'], 'answer': 'A', 'type': 'Multiple Choice'},
+    {'question': 'Q2?', 'options': ['A', 'B'], 'answer': 'B', 'type': 'Multiple Choice'},
+]
+
+def test_concurrent_submissions():
+    """Every submission is counted exactly once in user_stats and study_history"""
+    print("🧪 Hammering /submit_quiz...")
+    
+    db_path = testing_db.db_path()
+    init_db(db_path)
+    original_db = app.config['DATABASE']
+    app.config['DATABASE'] = db_path
+    try:
+        conn = database.connect(db_path)
+        conn.execute("INSERT INTO users (id, username, email, password_hash, full_name) VALUES (1, 'u', 'u@x', 'h', 'U')")
+        quiz_sessions.store_session(conn, 'race', 1, 'Race', 'enabled', [], [{'quiz': QUESTIONS}])
+        conn.commit()
+
+        errors = []
+        start = threading.Barrier(THREADS)
+
+        def worker():
+            with app.test_client() as client:
+                with client.session_transaction() as sess:
+                    sess['user_id'] = 1
+                    sess['quiz_session_id'] = 'race'
+                start.wait()
+                for _ in range(SUBMISSIONS_PER_THREAD):
+                    # One right, one wrong; 120 s of study time = 2 minutes
+                    response = client.post('/submit_quiz', json={
+                        'segment_index': 0, 'answers': {'0': 'A', '1': 'A'}, 'study_duration': 120
+                    })
+                    if response.status_code != 200:
+                        errors.append(response.get_json())
+            database.pool.close_all()
+
+        threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        total = THREADS * SUBMISSIONS_PER_THREAD
+        stats = conn.execute('SELECT * FROM user_stats WHERE user_id = 1').fetchone()
+        history = conn.execute('SELECT COUNT(*) FROM study_history WHERE user_id = 1').fetchone()[0]
+
+        assert not errors, errors[:3]
+        assert stats['total_quizzes'] == total, stats['total_quizzes']
+        assert stats['correct_answers'] == total
+        assert stats['total_questions'] == 2 * total
+        assert stats['total_study_time'] == 2 * total
+        assert history == total
+
+        print(f"  ✅ {total} concurrent submissions, no lost updates\n")
+    finally:
+        app.config['DATABASE'] = original_db
+
+def test_concurrent_schedule_completion():
+    """A schedule item completed from several threads at once counts its hours once"""
+    print("🧪 Completing one schedule item from every thread...")
+    
+    db_path = testing_db.db_path()
+    init_db(db_path)
+    original_db = app.config['DATABASE']
+    app.config['DATABASE'] = db_path
+    try:
+        conn = database.connect(db_path)
+        conn.execute("INSERT INTO users (id, username, email, password_hash, full_name) VALUES (1, 'u', 'u@x', 'h', 'U')")
+        conn.execute("INSERT INTO schedules (id, user_id, subject, topic_name, scheduled_date, estimated_hours) VALUES (7, 1, 'Math', 'Limits', '2026-03-10', 2)")
+        conn.commit()
+
+        errors = []
+        start = threading.Barrier(THREADS)
+
+        def worker():
+            with app.test_client() as client:
+                with client.session_transaction() as sess:
+                    sess['user_id'] = 1
+                start.wait()
+                response = client.post('/api/complete_schedule/7')
+                if response.status_code != 200:
+                    errors.append(response.get_json())
+            database.pool.close_all()
+
+        threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        minutes = conn.execute('SELECT SUM(minutes) FROM daily_activity WHERE user_id = 1').fetchone()[0]
+        assert not errors, errors[:3]
+        assert minutes == 120, minutes
+        print(f"  ✅ {THREADS} concurrent completions, 120 minutes recorded once\n")
+    finally:
+        app.config['DATABASE'] = original_db
+
+if __name__ == '__main__':
+    test_concurrent_submissions()
+    test_concurrent_schedule_completion()
+    print("✅ TEST PASSED")
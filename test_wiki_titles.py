@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test script for batched Wikipedia title resolution against a stub MediaWiki API
+"""
+
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+sys.path.insert(0, '.')
+
+import wiki_titles
+
+# title -> page properties understood by the stub
+WIKI = {
+    'Photosynthesis': {},
+    'Python': {'disambiguation': True, 'links': ['Python (programming language)', 'Pythonidae']},
+    'Python (programming language)': {},
+    'Pythonidae': {},
+    'Mercury': {'disambiguation': True, 'links': ['Mercury (planet)', 'Mercury (element)', 'Freddie Mercury', 'Mercury (disambiguation)']},
+    'Mercury (planet)': {},
+    'Mercury (element)': {},
+    'Freddie Mercury': {},
+    'Mercury (disambiguation)': {'disambiguation': True},
+    'Kepler': {'disambiguation': True, 'links': ['Johannes Kepler', 'Kepler space telescope']},
+    'Johannes Kepler': {},
+    'Kepler space telescope': {},
+}
+REDIRECTS = {'Python (computing)': 'Python (programming language)', 'Photo synthesis': 'Photosynthesis'}
+
+class MediaWikiStub(BaseHTTPRequestHandler):
+    """Answers action=query the way MediaWiki does with formatversion=2"""
+    calls = []
+
+    def do_GET(self):
+        params = {key: values[0] for key, values in parse_qs(urlsplit(self.path).query).items()}
+        MediaWikiStub.calls.append(params)
+        titles = params['titles'].split('|')
+
+        if params.get('generator') == 'links':
+            titles = WIKI.get(titles[0], {}).get('links', [])
+            result = {'pages': [self.page(title) for title in titles]}
+        else:
+            normalized = [{'from': t, 'to': t[0].upper() + t[1:]} for t in titles if t[0].islower()]
+            names = [t[0].upper() + t[1:] for t in titles]
+            redirects = [{'from': t, 'to': REDIRECTS[t]} for t in names if t in REDIRECTS]
+            targets = dict.fromkeys(REDIRECTS.get(t, t) for t in names)
+            result = {'normalized': normalized, 'redirects': redirects, 'pages': [self.page(t) for t in targets]}
+
+        body = json.dumps({'batchcomplete': True, 'query': result}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    @staticmethod
+    def page(title):
+        if title not in WIKI:
+            return {'ns': 0, 'title': title, 'missing': True}
+        page = {'ns': 0, 'title': title, 'pageid': abs(hash(title)) % 100000}
+        if WIKI[title].get('disambiguation'):
+            page['pageprops'] = {'disambiguation': ''}
+        return page
+
+    def log_message(self, *args):
+        pass
+
+def start_stub():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MediaWikiStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    MediaWikiStub.calls.clear()
+    resolver = wiki_titles.TitleResolver(api_url=f"http://127.0.0.1:{server.server_address[1]}/{{language}}/api.php")
+    return server, resolver
+
+def test_candidates():
+    """Candidate titles keep priority order and drop duplicates"""
+    print("🧪 Testing candidate titles...")
+
+    assert wiki_titles.candidate_titles('machine  learning') == [
+        'machine learning', 'Machine Learning', 'machine learning (concept)',
+        'machine learning (technology)', 'machine learning (computing)']
+    assert wiki_titles.candidate_titles('DNA')[:2] == ['DNA', 'Dna']
+    print("  ✅ 5 candidates\n")
+
+def test_single_request_with_normalization_and_redirects():
+    """All candidates go in one request; lower-case and redirected titles resolve"""
+    print("🧪 Testing batched lookup...")
+
+    server, resolver = start_stub()
+    try:
+        assert resolver.resolve('photosynthesis') == 'Photosynthesis'
+        assert resolver.resolve('photo synthesis') == 'Photosynthesis'
+        # "Python" is a disambiguation page, "python (computing)" redirects to the article
+        assert resolver.resolve('python') == 'Python (programming language)'
+        assert len(MediaWikiStub.calls) == 3, MediaWikiStub.calls
+        assert len(MediaWikiStub.calls[0]['titles'].split('|')) == 5
+    finally:
+        server.shutdown()
+    print("  ✅ One request per query\n")
+
+def test_disambiguation_followed():
+    """If only a disambiguation page matches, a link is taken only when it is unambiguous"""
+    print("🧪 Testing disambiguation...")
+
+    server, resolver = start_stub()
+    try:
+        assert resolver.resolve('Kepler') == 'Kepler space telescope'
+        # Planet or element is a guess, so the disambiguation page is kept
+        assert resolver.resolve('Mercury') == 'Mercury'
+        assert [call.get('generator') for call in MediaWikiStub.calls] == [None, 'links', None, 'links']
+    finally:
+        server.shutdown()
+    print("  ✅ Kepler -> Kepler space telescope, Mercury left ambiguous\n")
+
+def test_cache():
+    """Hits and misses are cached per language and exact (whitespace-collapsed) query"""
+    print("🧪 Testing title cache...")
+
+    server, resolver = start_stub()
+    try:
+        assert resolver.resolve('Photosynthesis') == 'Photosynthesis'
+        assert resolver.resolve('  Photosynthesis ') == 'Photosynthesis'
+        assert resolver.resolve('Quantum foam') is None
+        assert resolver.resolve('Quantum  foam') is None
+        assert resolver.resolve('Photosynthesis', language='simple') == 'Photosynthesis'
+        assert len(MediaWikiStub.calls) == 3
+        assert resolver.stats()['hits'] == 2 and resolver.stats()['requests'] == 3
+
+        # Case changes the candidates, so it is a separate entry
+        assert resolver.resolve('PHOTOSYNTHESIS') == 'Photosynthesis'
+        assert len(MediaWikiStub.calls) == 4
+    finally:
+        server.shutdown()
+    print("  ✅ Repeat lookups served from cache\n")
+
+def main():
+    """Run all tests"""
+    print("\n" + "="*60)
+    print("🚀 WIKIPEDIA TITLE RESOLVER TEST SUITE")
+    print("="*60 + "\n")
+
+    try:
+        test_candidates()
+        test_single_request_with_normalization_and_redirects()
+        test_disambiguation_followed()
+        test_cache()
+
+        print("="*60)
+        print("✅ ALL TESTS PASSED!")
+        print("="*60 + "\n")
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}\n")
+        return 1
+
+if __name__ == '__main__':
+    exit(main())
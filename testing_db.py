@@ -0,0 +1,63 @@
+"""
+Temporary databases for the test scripts
+
+Each database gets its own temporary directory. Directories made here, and the
+connections opened here, are closed and removed when the process exits.
+"""
+import atexit
+import os
+import shutil
+import tempfile
+import database
+import migrations
+
+DB_NAME = 'test_studypal.db'
+
+_dirs = []
+_conns = []
+
+
+def temp_dir():
+    """A new empty directory, removed at exit"""
+    path = tempfile.mkdtemp(prefix='studypal-test-')
+    _dirs.append(path)
+    return path
+
+
+def db_path():
+    """Path for a database that does not exist yet"""
+    return os.path.join(temp_dir(), DB_NAME)
+
+
+def make_db():
+    """Path of a new database with every migration applied"""
+    path = db_path()
+    conn = database.connect(path)
+    try:
+        migrations.migrate(conn)
+    finally:
+        conn.close()
+    return path
+
+
+def make_conn():
+    """Open connection to a new, migrated database; closed at exit"""
+    conn = database.connect(db_path())
+    _conns.append(conn)
+    migrations.migrate(conn)
+    return conn
+
+
+@atexit.register
+def cleanup():
+    for conn in _conns:
+        try:
+            conn.close()
+        except Exception:
+            pass
+    _conns.clear()
+    database.pool.close_all()
+    database.side_pool.close_all()
+    for path in _dirs:
+        shutil.rmtree(path, ignore_errors=True)
+    _dirs.clear()
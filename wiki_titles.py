@@ -0,0 +1,120 @@
+"""
+Batched Wikipedia title resolution for the content fetchers
+
+fetch_from_wikipedia used to probe "query", "Query", "query (concept)" and so on
+one page at a time, paying a round trip per miss. TitleResolver sends every
+candidate in one multi-title MediaWiki query and reads the answer locally:
+- normalization (first-letter case, underscores)
+- redirects
+- missing pages
+- disambiguation pages, via pageprops
+
+The first candidate that lands on a real article wins. If the only hits are
+disambiguation pages, one follow-up request lists that page's links; a link is
+only taken when it is unambiguous (a preferred suffix, or the single article
+named after the query). Otherwise the disambiguation page itself is returned.
+
+Results, including misses, are cached per (language, query), so repeat
+searches cost no requests at all. The key only collapses whitespace: candidate
+titles depend on the query's case, so "dna" and "DNA" are resolved separately.
+"""
+import threading
+import http_session
+from cache import TTLCache
+
+API_URL = 'https://{language}.wikipedia.org/w/api.php'
+SUFFIXES = ('concept', 'technology', 'computing')
+CACHE_TTL_SECONDS = 24 * 60 * 60
+CACHE_MAX_ENTRIES = 5000
+MISSING = ''                 # cached "no article" marker (TTLCache.get returns None when absent)
+
+
+def candidate_titles(query, suffixes=SUFFIXES):
+    """Titles to try for query, in priority order and without duplicates"""
+    query = ' '.join(query.split())
+    titles = [query, query.title()] + [f"{query} ({suffix})" for suffix in suffixes]
+    return list(dict.fromkeys(titles))
+
+
+class TitleResolver:
+    """Maps free-text queries to canonical article titles with one API call per miss"""
+
+    def __init__(self, api_url=API_URL, suffixes=SUFFIXES, cache=None):
+        self.api_url = api_url
+        self.suffixes = suffixes
+        self.cache = cache if cache is not None else TTLCache(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS)
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def _query(self, language, **params):
+        with self._lock:
+            self.requests += 1
+        params.update(action='query', format='json', formatversion=2, redirects=1,
+                      prop='pageprops', ppprop='disambiguation')
+        response = http_session.get(self.api_url.format(language=language), params=params)
+        response.raise_for_status()
+        return response.json().get('query', {})
+
+    def lookup(self, titles, language='en'):
+        """
+        One request for all titles.
+        Returns {title: (canonical title, is_disambiguation)}, with None for titles that do not exist.
+        """
+        data = self._query(language, titles='|'.join(titles))
+        normalized = {item['from']: item['to'] for item in data.get('normalized', [])}
+        redirects = {item['from']: item['to'] for item in data.get('redirects', [])}
+        pages = {page['title']: page for page in data.get('pages', [])}
+
+        found = {}
+        for title in titles:
+            target = normalized.get(title, title)
+            seen = set()
+            while target in redirects and target not in seen:
+                seen.add(target)
+                target = redirects[target]
+            page = pages.get(target)
+            if page is None or page.get('missing') or page.get('invalid'):
+                found[title] = None
+            else:
+                found[title] = (page['title'], 'disambiguation' in page.get('pageprops', {}))
+        return found
+
+    def follow_disambiguation(self, title, query, language='en'):
+        """The article a disambiguation page unambiguously points query at, or None"""
+        data = self._query(language, generator='links', titles=title, gplnamespace=0, gpllimit='max')
+        prefix = ' '.join(query.lower().split())
+        articles = [page['title'] for page in data.get('pages', [])
+                    if not page.get('missing') and 'disambiguation' not in page.get('pageprops', {})
+                    and page['title'].lower().startswith(prefix)]
+        for suffix in self.suffixes:
+            for article in articles:
+                if article.lower() == f"{prefix} ({suffix})":
+                    return article
+        # Several candidates (Mercury: planet, element, ...) are a guess; leave it to the page
+        return articles[0] if len(articles) == 1 else None
+
+    def resolve(self, query, language='en'):
+        """Canonical article title for query, or None if Wikipedia has no match"""
+        key = (language, ' '.join(query.split()))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached or None
+
+        candidates = candidate_titles(query, self.suffixes)
+        found = self.lookup(candidates, language)
+        hits = [found[title] for title in candidates if found[title] is not None]
+        title = next((canonical for canonical, disambiguation in hits if not disambiguation), None)
+        if title is None and hits:
+            disambiguation_page = hits[0][0]
+            title = self.follow_disambiguation(disambiguation_page, query, language) or disambiguation_page
+
+        self.cache.set(key, title or MISSING)
+        return title
+
+    def stats(self):
+        with self._lock:
+            requests = self.requests
+        return dict(self.cache.stats(), requests=requests)
+
+
+resolver = TitleResolver()